@@ -0,0 +1,221 @@
+"""
+Product vocabulary for generated catalogues, built from the item photos in images/.
+
+Every file in images/ is one kind of item, organic_chemistry_textbook.jpg is an organic chemistry
+textbook. A product picks an item, and its title, description, price and category tags are composed
+from that item with a few templates, so search terms match realistic shares of the catalogue:
+"textbook" most of it, "linguistics" a few percent, a course code like "CHEM 2101" only a handful.
+Everything is built column-wise with NumPy like the rest of generate_temp_users.py.
+"""
+import json
+import os
+
+import numpy as np
+
+import image_pipeline
+
+
+# file names that do not read as an item name on their own
+NAMES = {
+    "10_vintage_textbook": "Vintage Textbook Set of 10",
+    "24_inch_monitor": "24\" Monitor",
+    "books-flat-slide-21TH-articleLarge": "Novel Bundle",
+    "codenames": "Codenames Board Game",
+    "criminology_css_textbook": "Criminology Textbook",
+    "hoodie_mru": "MRU Hoodie",
+    "introducing_linguistics": "Introducing Linguistics Textbook",
+    "linear_algebra_intro_textbook": "Introduction to Linear Algebra Textbook",
+    "std_level_physics_textbook": "Standard Level Physics Textbook",
+    "used_hp_laptop_charger": "HP Laptop Charger",
+    "wireless_mouse_logi": "Logitech Wireless Mouse",
+}
+
+# words spelled differently in a title than in a file name
+WORDS = {
+    "cs": "Computer Science", "comp": "Computer", "dev": "Development", "intro": "Introduction to", "to": "",
+    "stats": "Statistics", "prob": "Probability", "grammer": "Grammar", "textbooks": "Textbook",
+    "ps4": "PS4", "rgb": "RGB", "ikea": "IKEA", "8th": "", "economic": "Economics", "2": "II",
+}
+
+# (name, description, words of an item name that put it in the category)
+CATEGORIES = [
+    ("Textbooks", "Course textbooks and readers", {"textbook", "linguistics"}),
+    ("Mathematics", "Math, calculus, algebra and statistics", {"math", "mathematics", "calculus", "algebra",
+                                                                "statistics", "discrete", "probability"}),
+    ("Sciences", "Biology, chemistry and physics", {"biology", "chemistry", "physics", "science", "engineering"}),
+    ("Computer Science", "Programming, databases and computing", {"computer", "java", "python", "database",
+                                                                  "data", "programming"}),
+    ("Business & Economics", "Business, accounting, economics and marketing", {"business", "accounting",
+                                                                               "economics", "microeconomics",
+                                                                               "marketing", "financial"}),
+    ("Arts & Humanities", "History, languages, philosophy and social sciences", {
+        "history", "sociology", "psychology", "philosophy", "linguistics", "poetry", "english", "french",
+        "criminology", "ethics", "semantics", "grammar"}),
+    ("Electronics", "Computer accessories, audio and gaming", {"monitor", "controller", "speaker", "keyboard",
+                                                               "mouse", "charger", "laptop"}),
+    ("School Supplies", "Binders, notebooks, stationery and bags", {"binder", "highlighter", "notebook",
+                                                                    "backpack"}),
+    ("Clothing", "MRU apparel and clothing", {"hoodie"}),
+    ("Home & Furniture", "Furniture for residence and apartments", {"chair"}),
+    ("Games", "Board games and video games", {"codenames", "controller", "game"}),
+    ("Sports & Fitness", "Workout and sports equipment", {"resistance", "bands"}),
+    ("Pets", "Pet supplies", {"leash"}),
+    ("Automotive", "Car parts and accessories", {"windshield", "wipers"}),
+    ("Books", "Novels and other books", {"novel", "vintage"}),
+]
+
+# the course code a textbook was used for, by the first matching word of its name
+COURSES = {
+    "calculus": "MATH", "algebra": "MATH", "discrete": "MATH", "math": "MATH", "mathematics": "MATH",
+    "statistics": "STAT", "biology": "BIOL", "chemistry": "CHEM", "physics": "PHYS", "engineering": "ENGR",
+    "computer": "COMP", "java": "COMP", "python": "COMP", "database": "COMP", "data": "COMP",
+    "accounting": "ACCT", "business": "BUSN", "economics": "ECON", "microeconomics": "ECON", "marketing": "MKTG",
+    "history": "HIST", "sociology": "SOCI", "psychology": "PSYC", "philosophy": "PHIL", "linguistics": "LING",
+    "semantics": "LING", "english": "ENGL", "poetry": "ENGL", "french": "FREN", "criminology": "CRJS",
+    "ethics": "PHIL",
+}
+
+# price range of an item, by the first category of it listed here
+PRICES = {
+    "Textbooks": (15, 160), "Electronics": (10, 220), "Home & Furniture": (20, 120), "Clothing": (15, 60),
+    "Games": (10, 50), "Books": (5, 40),
+}
+DEFAULT_PRICE = (3, 40)
+
+# section numbers of the courses, so a course code search matches a few products per item
+COURSE_NUMBERS = ["1101", "1102", "1203", "2101", "2203", "2501", "3309", "3605", "4401", "4505"]
+CONDITIONS = ["", "Used ", "Like New ", "Gently Used ", "Brand New ", "Barely Used "]
+TEXTBOOK_SUFFIXES = ["", " (Course Textbook)", " with Study Notes", " - No Highlighting"] + [
+    f", {n}{'nd' if n == 2 else 'rd' if n == 3 else 'th'} Edition" for n in range(2, 13)]
+ITEM_SUFFIXES = ["", " - Great Condition", " (Barely Used)", " for Sale", " - Works Perfectly"]
+STATE_SENTENCES = [
+    "In great condition, no rips or stains.",
+    "Some wear on the cover but everything inside is clean.",
+    "Still in the original packaging.",
+    "Lightly used, a few marks here and there.",
+    "Used for one semester, well taken care of.",
+    "Good shape overall, priced to sell.",
+]
+ITEM_SENTENCES = [
+    "Works perfectly, selling because I upgraded.",
+    "Moving out of residence and need it gone.",
+    "Comes from a smoke and pet free home.",
+    "Bought it this year and barely used it.",
+    "Price is a little negotiable.",
+]
+PICKUP_SENTENCES = [
+    "Pick up at the library or the EL building.",
+    "Can meet on campus any weekday.",
+    "Pick up near Lincoln Park, or I can bring it to class.",
+    "Message me to set up a meetup at the Wyckham House.",
+    "Available for pickup after 5pm.",
+]
+
+
+def item_title(stem):
+    if stem in NAMES:
+        return NAMES[stem]
+    words = (WORDS.get(word, word.capitalize()) for word in stem.split("_"))
+    return " ".join(word for word in words if word)
+
+
+def build_items(directory=None):
+    """One entry per image: {file, title, textbook, categories (indexes into CATEGORIES), course, price}."""
+    directory = directory or image_pipeline.SOURCE_DIR
+    items = []
+    for name in sorted(os.listdir(directory)):
+        stem, extension = os.path.splitext(name)
+        if extension.lower() not in (".jpg", ".jpeg", ".png"):
+            continue
+        title = item_title(stem)
+        words = {word.strip('"').lower() for word in title.split()}
+        categories = [index for index, (_, _, keywords) in enumerate(CATEGORIES) if words & keywords]
+        names = [CATEGORIES[index][0] for index in categories]
+        price = next((PRICES[name] for name in names if name in PRICES), DEFAULT_PRICE)
+        course = next((COURSES[word] for word in title.lower().split() if word in COURSES), None)
+        items.append({"file": name, "title": title, "textbook": "Textbooks" in names, "categories": categories,
+                      "course": course, "price": price})
+    return items
+
+
+def variants(first, second):
+    """[[a + b for b in second] for a in first] as one flat array, indexed by i * len(second) + j."""
+    return np.array([a + b for a in first for b in second], dtype=object)
+
+
+def title_variants(item):
+    suffixes = TEXTBOOK_SUFFIXES if item["textbook"] else ITEM_SUFFIXES
+    # every item gets the same number of variants, so a variant is found by arithmetic
+    return [item["title"] + suffixes[i % len(suffixes)] for i in range(SUFFIXES)]
+
+
+def usage_variants(item):
+    if item["course"]:
+        sentences = [f"Used it for {item['course']} {number} last semester." for number in COURSE_NUMBERS]
+    elif item["textbook"]:
+        sentences = ["Required reading for a first year course."]
+    else:
+        sentences = ITEM_SENTENCES
+    return [sentences[i % len(sentences)] + " " + pickup for i in range(USAGES) for pickup in PICKUP_SENTENCES]
+
+
+SUFFIXES = max(len(TEXTBOOK_SUFFIXES), len(ITEM_SUFFIXES))
+USAGES = len(COURSE_NUMBERS)
+ITEMS = build_items()
+PRICE_LOW = np.array([item["price"][0] for item in ITEMS], dtype=np.float64)
+PRICE_HIGH = np.array([item["price"][1] for item in ITEMS], dtype=np.float64)
+# the app reads image.images and serves the names from the product-images bucket, the variants are
+# rendered by image_pipeline.py; catalogue grids use the thumbnails
+IMAGES = np.array([json.dumps({
+    "images": [image_pipeline.variant_name(item["file"], "full", "webp")],
+    "thumbnails": [image_pipeline.variant_name(item["file"], "thumb", "webp")],
+}) for item in ITEMS], dtype=object)
+# titles and descriptions are picked from these by index: a few thousand strings built once instead of
+# millions of per-row concatenations
+TITLE_TABLE = variants(CONDITIONS, [title for item in ITEMS for title in title_variants(item)])
+DESCRIPTION_TABLE = variants([sentence + " " for sentence in STATE_SENTENCES],
+                             [usage for item in ITEMS for usage in usage_variants(item)])
+
+
+def category_names(ids):
+    """Names and descriptions of the category tags `ids`, numbered once the real ones run out."""
+    names = np.array([name for name, _, _ in CATEGORIES])[ids % len(CATEGORIES)]
+    descriptions = np.array([description for _, description, _ in CATEGORIES])[ids % len(CATEGORIES)]
+    repeat = ids // len(CATEGORIES)
+    names = np.where(repeat > 0, np.char.add(np.char.add(names, " "), (repeat + 1).astype(str)), names)
+    return names, descriptions
+
+
+def product_items(rng, products):
+    """The item of every product, drawn up front so Category_Assigned_Products can follow it."""
+    return rng.integers(0, len(ITEMS), size=products).astype(np.int16)
+
+
+def category_cells(items, categories, limit, rng):
+    """(category_id * products + product_id) of every product's category tags, at most `limit` of them."""
+    per_item = [np.array([c for c in item["categories"] if c < categories], dtype=np.int64) for item in ITEMS]
+    counts = np.array([len(cats) for cats in per_item])[items]
+    offsets = np.concatenate([[0], np.cumsum([len(cats) for cats in per_item])])
+    flat = np.concatenate(per_item)
+    products = np.repeat(np.arange(len(items)), counts)
+    # position of each row within its product's categories
+    within = np.arange(len(products)) - np.repeat(np.cumsum(counts) - counts, counts)
+    cells = flat[offsets[items[products]] + within] * len(items) + products
+    if len(cells) > limit:
+        cells = cells[np.sort(rng.choice(len(cells), size=limit, replace=False))]
+    return cells
+
+
+def product_text(items, rng):
+    """(title, description, price) columns for products of the given items."""
+    rows = len(items)
+    items = items.astype(np.int64)
+    title = TITLE_TABLE[(rng.integers(0, len(CONDITIONS), rows) * len(ITEMS) + items) * SUFFIXES
+                        + rng.integers(0, SUFFIXES, rows)]
+    usage = (items * USAGES + rng.integers(0, USAGES, rows)) * len(PICKUP_SENTENCES) \
+        + rng.integers(0, len(PICKUP_SENTENCES), rows)
+    description = DESCRIPTION_TABLE[rng.integers(0, len(STATE_SENTENCES), rows) * len(ITEMS) * USAGES
+                                    * len(PICKUP_SENTENCES) + usage]
+    low, high = PRICE_LOW[items], PRICE_HIGH[items]
+    price = np.round(low + rng.random(rows) * (high - low)) - 0.01
+    return title, description, price
@@ -0,0 +1,102 @@
+"""
+State manifest of a dataset that generate_temp_users.py grows in batches with --state.
+
+A plain run numbers every table from 0, so the rows of a second run collide with the rows already
+loaded. With --state, the first run records what it generated, and every later run appends a batch:
+users, products, chats, messages and the rest numbered after the existing rows, with foreign keys
+drawn over the existing and the new rows. Category_Tags is not grown, the catalogue categories are
+all there after the first batch.
+
+The manifest is a small JSON file with the seed, the rows of every table, which are also the next id of
+the tables the generator numbers, and one entry per batch. The keys a later batch needs are kept next
+to it in <manifest>.<batches>.npz: the packed supabase_id of every user, and the sorted pair ranks of
+Chats, Reports and User_Interactions, so new pairs are drawn around the existing ones, and per chat its
+two users, its message count and the earliest time of its next message, so a later batch's messages
+continue the existing chats as well as starting new ones. Batch b draws
+from streams of the seed of its own (see table_rng() in generate_temp_users.py), so the seed and the
+batch number are the whole RNG state: a dataset grown with the same batches is the same dataset.
+
+The manifest is only replaced once a batch was written or loaded, after its key file, so an
+interrupted run leaves the previous state in place.
+
+Usage:
+    python generate_temp_users.py --rows 100000 --seed 1 --load postgresql://localhost/postgres --init-schema --state dataset.json
+    python generate_temp_users.py --rows 1000 --history-days 1 --load postgresql://localhost/postgres --state dataset.json
+"""
+from datetime import datetime, timezone
+import json
+import os
+
+import numpy as np
+
+# keys of generate_keys() holding the pairs of a table that have to stay distinct across batches
+PAIR_KEYS = {"chats": "Chats", "reports": "Reports", "interactions": "User_Interactions"}
+# per chat id: its users, the messages it has and the earliest created_at of its next message (epoch µs)
+CHAT_KEYS = ["first", "second", "messages", "next"]
+
+
+def pair_ranks(first, second):
+    """Rank of every unordered pair, the inverse of unrank_pairs() in generate_temp_users.py."""
+    low, high = np.minimum(first, second).astype(np.int64), np.maximum(first, second).astype(np.int64)
+    return high * (high - 1) // 2 + low
+
+
+def keys_path(path, batches):
+    return f"{os.path.splitext(path)[0]}.{batches}.npz"
+
+
+def read_state(path):
+    """The manifest at `path` with its keys loaded, None when there is no dataset yet."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        state = json.load(f)
+    with np.load(os.path.join(os.path.dirname(os.path.abspath(path)), state["keys"])) as keys:
+        state["users"] = keys["users"]
+        state["pairs"] = {name: keys[name] for name in PAIR_KEYS}
+        state["chats"] = {name: keys["chat_" + name] for name in CHAT_KEYS}
+    return state
+
+
+def grown(state, seed, keys, added):
+    """The state after the batch of `keys` was written or loaded, `added` is {table: rows}."""
+    state = state or {"seed": seed, "next_batch": 0, "rows": {}, "batches": [], "pairs": {}}
+    rows = dict(state["rows"])
+    for table, count in added.items():
+        rows[table] = rows.get(table, 0) + count
+    pairs = {}
+    for name, table in PAIR_KEYS.items():
+        earlier = state["pairs"].get(name, np.empty(0, np.int64))
+        pairs[name] = np.union1d(earlier, pair_ranks(*keys[name])) if added.get(table) else earlier
+    first, second = keys["chat_users"]
+    messages = keys["conversation_positions"] + keys["conversation_lengths"]
+    batch = {"batch": state["next_batch"], "created_at": datetime.now(timezone.utc).isoformat(),
+             "now": keys["now"].isoformat(), "rows": added}
+    return {
+        "seed": state["seed"],
+        "next_batch": state["next_batch"] + 1,
+        "rows": rows,
+        "batches": state["batches"] + [batch],
+        "users": keys["registry"].packed_uuids["User_Information"],
+        "pairs": pairs,
+        "chats": {"first": first, "second": second, "messages": messages,
+                  "next": keys["conversation_next"].astype(np.int64)},
+    }
+
+
+def write_state(path, state):
+    """Writes the key file of `state`, then swaps the manifest over to it and removes the previous key file."""
+    keys_file = keys_path(path, state["next_batch"])
+    with open(keys_file + ".tmp", "wb") as f:
+        np.savez(f, users=state["users"], **state["pairs"],
+                 **{"chat_" + name: values for name, values in state["chats"].items()})
+    os.replace(keys_file + ".tmp", keys_file)
+
+    manifest = {name: value for name, value in state.items() if name not in ("users", "pairs", "chats")}
+    manifest["keys"] = os.path.basename(keys_file)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + ".tmp", path)
+    previous = keys_path(path, state["next_batch"] - 1)
+    if os.path.exists(previous):
+        os.remove(previous)
@@ -1,556 +1,1060 @@
+"""
+Generates seed data for the mru_dev schema as one CSV, Arrow or Parquet file per table.
+
+Every table is built column by column with NumPy, so a million-row table costs a
+handful of array operations instead of a million Python list appends. Tables are
+generated and appended to their CSV in fixed-size chunks, so peak memory does not
+grow with the number of rows. Every table and every chunk draws from its own stream of
+--seed, so chunks can be built by a process pool and the output is still identical.
+
+Usage:
+    python generate_temp_users.py --rows 20
+    python generate_temp_users.py --rows 1000 --scale Messages=1000000 --scale Product_Information=100000
+    python generate_temp_users.py --rows 100 --summary
+    python generate_temp_users.py --rows 100000 --scale Messages=10000000 --seed 42 --workers 8
+    python generate_temp_users.py --rows 10000000 --scale Messages=1000 --popularity-skew 1.1
+    python generate_temp_users.py --rows 10000 --load postgresql://localhost/postgres --defer-indexes
+    python generate_temp_users.py --rows 1000000 --format arrow --out-dir data
+    python generate_temp_users.py --load postgresql://localhost/postgres --from-dir data
+    python generate_temp_users.py --rows 100000 --seed 1 --profile --profile-compare generator_profile.json
+    python generate_temp_users.py --rows 1000 --history-days 1 --load postgresql://localhost/postgres --state dataset.json
+"""
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-import random
-import csv
-import pandas as pd
+import argparse
+import itertools
+import json
 import os
-import uuid
 
-# import numpy as np
+import numpy as np
+import pandas as pd
+
+from key_registry import KeyRegistry, pack_uuids, random_uuids
+import catalogue
+import dataset_state
+import generator_profile
+import seed_loader
+import table_io
+import validate_tables
 
 now = datetime.now()
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
 
-User_Information = []
-Product_Information = []
-Shopping_Carts = []
-Chats = []
-Messages = []
-Category_Assigned_Products = []
-Category_Tags = []
-Reports = []
-Reviews = []
-User_Interactions = []
-
-Tables = {
-    "User_Information": User_Information, 
-    "Product_Information": Product_Information,
-    "Shopping_Carts": Shopping_Carts, 
-    "Chats": Chats,
-    "Messages": Messages, 
-    "Category_Assigned_Products": Category_Assigned_Products, 
-    "Category_Tags": Category_Tags,
-    "Reports": Reports,
-    "Reviews": Reviews,
-    "User_Interactions": User_Interactions
-    
-}
+TABLE_NAMES = [
+    "User_Information",
+    "Product_Information",
+    "Shopping_Cart",
+    "Chats",
+    "Messages",
+    "Category_Assigned_Products",
+    "Category_Tags",
+    "Reports",
+    "Reviews",
+    "User_Interactions",
+    # appended, so the streams of the tables before it stay the same
+    "Shopping_Cart_Products",
+]
+
+Tables = {}
 
-num_users_low = 0
-num_users_high = 100
 rowsToGenerate = 20
+CHUNK_SIZE = 100_000
+OUTPUT_DIR = "./Table csv's"
+
+# shape of the Messages table, see conversation_lengths()
+MESSAGE_DISTRIBUTIONS = ["zipf", "lognormal", "uniform"]
+MESSAGE_SKEW = {"zipf": 2.0, "lognormal": 1.5, "uniform": None}
+MESSAGE_GAP_US = 15 * 60 * 1_000_000
+# days the chats' last messages are spread over, about one semester
+HISTORY_DAYS = 120
+# spawn key of the stream that shuffles popularity ranks, far above any real chunk index
+POPULARITY_SHARD = 2**32 - 1
+# spawn key of the stream that picks every product's catalogue item
+CATALOGUE_SHARD = 2**32 - 2
+# prefix of the spawn keys of appended batches, see table_rng()
+APPEND_SHARD = 2**32 - 3
+# listings that were marked as sold
+SOLD_SHARE = 0.1
 
 uuidList = ["cdacee43-3b87-4dc2-be79-66e564289a58","21e777fb-e087-4ece-9c67-923cc1fa893b","f5814b43-6ab3-46dc-a240-22c9be3c7c3d","452912f1-a7c9-4949-b694-9433ac4fdd87","148b8e87-c66e-4533-8ef5-2955304cd907","d6d070c1-44c1-4e43-b8f3-d70412426881","51f28079-686d-460c-aaf7-143baabe97cb","140d719a-f2b9-48d6-8b84-7521a7b607aa","6e0b467c-f801-457d-afbd-474eb24c154d","d2110d57-8220-4ae8-a2bd-f4deb3d94d22","cd85a7cb-84d3-4923-8f5e-5093141543b6","040b853a-0608-4bf1-bdd0-4ceec9434148","3095fdb4-2b17-42d6-8b6b-d3cbe8e6d008","42ad416a-d94a-4bf4-b554-f0a05c803271","f9f4fde1-1d17-4a4d-9f59-49db78c53caa","2e63e940-8a67-4bd3-bfe5-87c0e4b3675e","40b52411-17b5-424a-9ae1-5cfc5ee9ee1a","22df3768-72b6-4eb6-9620-bcc66ba8f42e","3f954a41-e9bc-49a7-85df-48949f0e57cc","745aaad2-0b0d-4e80-a87a-41b37f9a8fd5","488f83ee-d25a-4790-a90a-9b2730ebcfc6","2412984b-ce65-46f7-9721-43e5fc36a463","8e479e83-96da-4047-8fab-d602332fbea0","e0fc3ba0-4600-48c2-8605-d0529dbca485","a3277279-f8ef-4fe2-ab6d-b211473d2521","1cd2bb2e-b086-4497-ab84-05dea6175bee","fc00518a-413d-48b3-afd6-712698634425","a4d7fc88-2d53-4f9c-8d55-e40dd226f87c","f1ef8f03-ecea-4880-a472-cd8ee21917a6","2a922d23-11d4-47c8-9195-8de478f90ec8","00c3ce80-ab1e-4cf1-8279-90e2763fe866","6720b1d0-5aca-41b4-b6e8-c7cf250b70cb","2f46f550-7a33-424d-a443-8ebc52b554a6","3e070e42-b49a-4867-b7d7-e386817e2b30","b295a9fb-3000-44a7-80ed-017c9a169c80","ab7825d3-9f6c-4858-9568-6d41a1deac65","9e8fc41d-cdbd-4e0f-b886-a6b7bf188991","309fe5f9-f514-4282-a79f-967107ef3fd5","61459a49-fbee-473e-a874-179cbd0fcc23","5789cd98-a26d-47fc-844e-f00198f4c4b9","085e1d4e-3ef8-4844-ae4f-2e2e06756fe6","2c4ccc3d-9bcb-4840-a490-d825ce29b3d9","7c0986b6-1bc6-4bd1-a552-6ee1ffe0ae99","4df743b9-9046-405f-b4bb-34a40594a3cc","0056d111-3e4a-45e0-a94e-a06dae8e496e","2f0e7139-ed53-4c7e-aebc-6782a783594a","8aa4c293-daf1-4f10-abc6-71cf737fade6","219b4597-018a-4021-bc7d-6ca0c8ecc9e6","15dced78-9cea-4756-bb1e-21d8ecefb140","e56d13b5-6452-40d8-a6f6-2b0fa4825d16","1b9dcef0-91cb-467c-895c-ab516644781a","971de532-5a59-4606-bdf5-305107aa9006","53cd9db5-8de8-4aac-84f4-ff00a1d5536b","b0e054bc-3187-4299-acb2-1bdd9d2f0194","0b3c406c-09fd-4a2d-89b0-7c975d2e8387","e5e1c870-0eb0-4987-9330-4eb50d5a0b7b","3789101c-594c-4712-834a-f8697b43e626","c1b4f945-152f-4b77-ba6f-f6ab3145b6bc","c575c387-cfc5-41c1-8491-f34548abd940","909de392-db84-47d3-b514-aea5d7536b8a","8badb376-56de-437c-8a60-36de7f6310cf","a88c008c-7c34-4964-8085-f85a1c8be1f3","cb0762c4-4a99-4899-bd97-1c0dbaa1a21c","e9292654-8572-4ca7-9113-6339b2f81d0e","94946639-221f-4eac-9427-df2f5577506d","2715fd23-a32a-4263-9dfa-c255aeadb13b","00fcb8de-51dc-4571-9c5e-1c9e8160bc16","08ec4b3d-10c2-4309-86cb-e99a09852f11","ff37366d-a26a-4cad-93da-fce6eb31786f","590be0c8-636c-4770-adcd-542bcd361169","19a4fa03-babe-43a5-801d-e96c26969f09","9b9f65c5-af55-4d76-a702-7d32db3c3389","ad64c25b-32ca-403b-b6cb-b0e198ced6ee","f09cf58f-557c-43d2-bfa7-59c9051a601e","ed1df011-e7c8-4d03-9cc6-500190ca3fcb","348a135b-4292-4f6f-82d1-888f83b92c71","4d93da05-c864-4f8d-9ccf-2303c4b0e010","8b8669f3-3a7d-4883-9d68-671ceb94362b","9ba72e4e-744f-4256-94c9-26dd236d2ca6","a9de3856-aea8-4a3f-a413-4d1d9437232f","d60a5e2e-dc92-4588-bcf0-4075fe95beb3","e9b8758b-09f2-4301-ab2c-787d8f06e78c","8516197c-ebf4-4d6a-a29b-0a2d80b424f1","0172f1cd-fd6c-47a5-84eb-51db3ad0b191","91990c80-43ca-4010-8b93-5052fd9a4c1f","e6b82deb-3c85-4ba5-9df2-7289cc8f9520","0b6703ac-fdde-4e46-ab56-93f0a65bd6a5","c77dc88e-0a8b-43d1-b538-c919ca526ac9","84348c72-55fd-433c-a8bb-7581693cac60","752d07cb-76e8-49c3-960b-f295acadb9ac","854e3647-f1e4-4d63-9b25-0aa9a96c2f86","94dbdff9-e1c5-4711-9d59-9a6c78e7b190","64680efe-a418-4a4c-98d3-8985d9f486d3","de27c9c9-8ab0-4063-8ca4-62a2d995c2eb","41c11c2a-5576-422f-b14a-29442284a701","1798e439-9d9a-4abd-a434-e6339a6b52e1","f6b3efc2-8793-441c-9a45-0e3cd66e7f18","c3c7e9a8-abb4-430b-8e9f-3beb1723546d","3282cdb4-586d-4bce-a56d-1ab3f0ed760f","242b35f7-2562-4b59-a406-a04b10297bb2","f631cc91-215f-4f44-b12a-19a23951a1a2","f0464b1c-cf83-44bf-a321-786875407244"]
-productList = []
-chatList = []
-categoryList = []
-
-for i in range(rowsToGenerate):
-    uuidList.append(str(uuid.uuid4()))
-    
-def generate_distinct_uuid():
-    uuid1 = uuidList[random.randint(num_users_low, num_users_high)]
-    uuid2 = uuidList[random.randint(num_users_low, num_users_high)]
-    while(uuid1 == uuid2):
-        uuid1 = uuidList[random.randint(num_users_low, num_users_high)]
-        uuid2 = uuidList[random.randint(num_users_low, num_users_high)]
-    return uuid1, uuid2
-
-def generate_distinct():
-    num1 = random.randint(num_users_low, num_users_high)
-    num2 = random.randint(num_users_low, num_users_high)
-    while(num1 == num2):
-        num1 = random.randint(num_users_low, num_users_high)
-        num2 = random.randint(num_users_low, num_users_high)
-    return num1, num2
-
-def generateUserData():
-    User_Information.append(['id', 'supabase_id', 'first_name', 'last_name', 'email', 'user_name', 'deleted_on', 'is_deleted', 'is_flagged', 'flagged_type', 'created_at'])
-    for i in range(rowsToGenerate):
-        user = [
-        i,
-        uuidList[i],
-        f"FirstName{i}",
-        f"LastName{i}",
-        # f"{random}{random.randint(100, 999)}@mtroyal.ca",
-        f"TestUser{i}@mtroyal.ca",
-        f"username{i}",
-        None,
-        False,
-        False,
-        None,
-        now.strftime("%Y-%m-%dT%H:%M:%S.%fZ")]
-        User_Information.append(user)
-        
-def generateProductData():
-    Product_Information.append(['id', 'user_id', 'title', 'description', 'image', 'price', 'stock_count', 'created_at'])
-    for i in range(rowsToGenerate):
-        product = [
-        i,
-        uuidList[random.randint(num_users_low, num_users_high)],
-        f"productName{i}",
-        "This product has no description",
-        False,
-        f"{i}.{99}",
-        random.randint(1, 10),
-        now.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
-        ]
-        Product_Information.append(product)
-        
-def generateShoppingCartData():
-    Shopping_Carts.append(['id', 'user_id', 'product_id', 'created_at'])
-    for i in range(rowsToGenerate):
-        cart = [
-        i,
-        uuidList[random.randint(num_users_low, num_users_high)],
-        productList[random.randint(num_users_low, num_users_high)],
-        now.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
-        ]
-        Shopping_Carts.append(cart)
- 
-def generateChatData():
-    Chats.append(['user_id_1', 'user_id_2'])
-    seen = set()
-    for i in range(rowsToGenerate):
-        uuid1, uuid2 = generate_distinct_uuid()
-        chat = tuple(sorted([uuid1, uuid2]))
-        while(chat in seen):
-            uuid1, uuid2 = generate_distinct_uuid()
-            chat = tuple(sorted([uuid1, uuid2]))
-        seen.add(chat)
-        Chats.append(chat)
-        
-def genMessage(message_type):
-    hour = random.randint(1, 12)
-    meridiem = random.choice(['am', 'pm'])
-    
-    message_map = {
-        'greeting_sender': greeting_sender, 
-        'greeting_responses': greeting_responses, 
-        'availability_sender': availability_sender, 
-        'availability_responses': availability_responses, 
-        'negotiation_sender': negotiation_sender, 
-        'negotiation_responses': negotiation_responses, 
-        'meetup_sender': meetup_sender, 
-        'meetup_responses': meetup_responses, 
-        'closing_sender': closing_sender, 
-        'closing_responses': closing_responses,
+
+message_list = [
+    # Greetings
+    "Hi",
+    "Hello!",
+    "Hey there!",
+    "Hi, is this still available?",
+    "Yo, you still selling this?",
+    "Hey, I’m interested in this item.",
+    "Hey! Just saw your post about this.",
+    "Hi! Is this the same one you used for class last semester?",
+    "Hey, I saw your post — looks like something I need!",
+    "Yooo, I've been looking for this, is this still availible?",
+
+    # Availability & condition
+    "Is this product still available?",
+    "Do you still have this?",
+    "How old is this item?",
+    "Is it in good condition?",
+    "Any scratches or damages?",
+    "Do you have any extras of this?",
+    "Has this been used much?",
+    "Just making sure this still works, right?",
+    "Does it come with the original packaging?",
+    "Is the access code still valid?",
+
+    # Negotiation / price discussion
+    "Could you do $5 cheaper?",
+    "Would you take $20 for it?",
+    "Is the price negotiable?",
+    "Can you lower the price a bit?",
+    "Would you accept a trade?",
+    "I’m on a tight budget, could you go any lower?",
+    "Would you take coffee instead of cash? 😂",
+    "If I pick it up today, could you do $10 off?",
+    "Could you hold it for me until tomorrow?",
+    "Any student discount? 😅",
+
+    # Seller responses
+    "Yeah, it’s still available!",
+    "Sure, I can do $5 off.",
+    "Sorry, someone else messaged me first.",
+    "It’s yours if you can pick it up today.",
+    "I can’t really go lower, sorry.",
+    "Sure, I’ll hold it for you.",
+    "Yep, still good as new.",
+    "Thanks for your interest!",
+    "I just sold it earlier, sorry!",
+    "No problem, I’ll keep you posted if it doesn’t sell.",
+
+    # Meetup coordination
+    "Where should we meet up?",
+    "Does {hour}{meridiem} work for you?",
+    "What times are you free to meet up?",
+    "Are you on campus today?",
+    "Could we meet at the library?",
+    "Can we meet near the student center?",
+    "I can meet after class around 3pm, does that work?",
+    "I’m free around {hour}{meridiem}, would that work for you?",
+    "Let’s meet by the cafeteria entrance.",
+    "I’ll be in the parking lot near Building B.",
+    "I’m wearing a red hoodie so you can spot me.",
+
+    # Running Late
+    "Sorry, I'm running a bit late, I'll be there soon",
+    "Hey, I'm actually not gonna make it today, can we organize for another time?",
+    "Can we rescheduale?",
+    "Stuck in traffic, give me 10 mins!",
+    "Class ran over time, sorry!",
+    "Could we meet later tonight instead?",
+    "Can we push it to tomorrow?",
+    "Just realized I left it at home, sorry about that.",
+
+    # Ghosted / follow-ups
+    "Just following up, is this still available?",
+    "Hey, just checking in — haven’t heard back.",
+    "Are you still interested?",
+    "Let me know if you changed your mind.",
+    "Still want this?",
+    "Did you end up selling it?",
+    "You there?",
+    "Guess I’ll take that as a no 😂",
+
+    # Confirmations & polite messages
+    "Sounds good, see you then!",
+    "Thanks!",
+    "Cool, I’ll be there.",
+    "Let me know when you’re on your way.",
+    "Can you send a quick confirmation before you leave?",
+    "I’m here, where are you?",
+    "Running a few minutes late, sorry!",
+    "No worries, take your time.",
+    "Got it, thanks!",
+    "Awesome, appreciate it.",
+
+    # Product-specific
+    "Is this the 8th edition textbook?",
+    "Does it include the access code?",
+    "Is this for PSYC 1101?",
+    "Does it come with the charger?",
+    "Are all the pages intact?",
+    "Can you send a picture of the inside?",
+    "Is this still sealed?",
+    "Are you firm on the price?",
+    "Does it come with the manual?",
+    "Do you still have the receipt?",
+
+    # Misc small talk / student chatter
+    "Sorry, just saw your message.",
+    "Thanks for holding it for me!",
+    "I can grab it after my lecture.",
+    "Appreciate it, I’ve been looking for this all week.",
+    "Sweet, that works perfectly.",
+    "No worries if it’s already sold.",
+    "Cool, I’ll message you when I’m heading out.",
+    "Thanks again!",
+    "How’s your semester going so far?",
+    "Ugh, midterms are killing me.",
+    "Do you have the same prof for this course?",
+    "I used this book last term — total lifesaver.",
+    "This class was brutal lol.",
+    "Good luck with finals!",
+    "You a CS major too?",
+    "Man, I wish I’d found this earlier.",
+
+    # Complaints / issues
+    "Hey, there are pages missing from this book.",
+    "This doesn’t look like the photo you posted.",
+    "It’s not turning on — did it work when you sold it?",
+    "The cover’s pretty damaged, just FYI.",
+    "This wasn’t mentioned in the description.",
+    "Hey, I think you gave me the wrong charger.",
+    "Can we work something out? It’s kind of broken.",
+    "I’m a bit disappointed, not as described.",
+    "It smells a bit weird, just saying.",
+    "Hey, next time please mention the condition properly.",
+    "You didn’t show up yesterday, what happened?",
+    "I waited 20 minutes and you never came.",
+    "Not cool, man. You could’ve just said you sold it.",
+    "Hey, can I get a refund or something?",
+
+    # Lighthearted / random chatter
+    "Lol I totally forgot about this class.",
+    "I only passed because of this book 😂",
+    "Haha yeah, I’ve been meaning to sell this forever.",
+    "I used to love this course until midterms happened.",
+    "Thanks again, you’re a lifesaver!",
+    "Bro this deal was too good to pass up.",
+    "My roommate told me to grab this before it’s gone.",
+    "Finally got rid of that heavy textbook 😂",
+    "Good doing business with you!",
+    "Have a good one!"
+]
+
+report_desc = [
+    "They killed my dog",
+    "This person scammed me, please ban them",
+    "They wrote obscenities towards me in the chat",
+    "Reporting this person for spamming the chat",
+    "This person is mean and keeps bothering me, please ban them",
+    "They are being racist",
+    "I think this person is a bot account, please investigate",
+    "They keep posting links to crypto sites",
+    "They sent me unsolicited images",
+    "This user is harassing me repeatedly",
+    "They are impersonating someone else",
+    "Sharing inappropriate content in the forum",
+    "They are threatening other users",
+    "Posting personal information without consent",
+    "Spamming repeated messages in the chat",
+    "Attempting to trick me into a scam",
+    "They are making offensive jokes and comments",
+    "Using the platform to solicit money fraudulently",
+    "Sending abusive language via private messages",
+    "This account seems fake, suspicious behavior",
+    "Repeatedly violating the community guidelines",
+    "They are trolling and disrupting conversations",
+    "Posting misleading product reviews",
+    "This person is trying to phish other users",
+    "Using multiple accounts to harass people",
+    "Encouraging illegal activity or dangerous behavior"
+]
+
+negative_review = [
+    "This guy smells like feet",
+    "This person scammed me! Don't buy!",
+    "They doesn't respond to messages...",
+    "I know this guy in person, avoid at all cost",
+    "Package arrived broken and seller refused refund",
+    "Terrible communication, would not recommend",
+    "Product was completely different from the description",
+    "Slow shipping and poor customer service",
+    "Received the wrong item twice, very frustrating",
+    "Seller tried to overcharge me, dishonest behavior"
+]
+
+positive_review = [
+    "Quick delivery, secure packaging, and excellent quality matching the website description",
+    "Very nice to talk to. Delivered package on time.",
+    "I just think their eyes are dreamy",
+    "Good",
+    "Item exactly as described, highly recommend",
+    "Friendly seller and smooth transaction",
+    "Exceeded my expectations, excellent quality",
+    "Super fast shipping, very reliable",
+    "Amazing experience, would buy again",
+    "Responsive and helpful, highly satisfied"
+]
+
+medium_review = [
+    "Package arrived later than expected, but product is fine",
+    "Item quality is okay, nothing special",
+    "Communication was average, took a while to reply",
+    "Not bad, but could be better",
+    "The product works, but not as described in detail",
+    "Shipping took longer than usual",
+    "Packaging was adequate, not impressive",
+    "In person hand off was fine, product is acceptable",
+    "Average experience, neither good nor bad",
+    "Got the textbook I wanted, but setting up a pickup time was difficult"
+]
+
+
+# Staged phrase pools, every conversation walks through them in order, alternating sender and responder
+greeting_sender = [
+    "Hello!",
+    "Hi there!",
+    "Hey, how’s it going?",
+    "Hi, I saw your post about the item.",
+    "Hey! I’m interested in something you’re selling."
+]
+
+greeting_responses = [
+    "Hi! How can I help you?",
+    "Hey! Yes, what’s up?",
+    "Hi there, which item are you looking at?",
+    "Hello! Thanks for reaching out.",
+    "Hey, good to hear from you!"
+]
+
+availability_sender = [
+    "Is this product still available?",
+    "Do you still have this for sale?",
+    "Are you still selling this item?",
+    "Hey, just checking if this is still up for grabs.",
+    "Do you happen to have any extras of this?"
+]
+
+availability_responses = [
+    "Yes, it’s still available!",
+    "I’ve got one left!",
+    "Sorry, it just sold earlier today.",
+    "Yeah, it’s still up for sale.",
+    "I only have one more available."
+]
+
+negotiation_sender = [
+    "I’m really interested, but could you do a bit cheaper?",
+    "Would you take $5 less?",
+    "Could you do $10 off if I pick it up today?",
+    "Is the price negotiable?",
+    "That’s a bit expensive for me, can we work something out?"
+]
+
+negotiation_responses = [
+    "Hmm, I can do a small discount, maybe $5 off.",
+    "Sorry, the price is firm.",
+    "If you pick it up today, I can lower it a little.",
+    "Let’s say $5 less — deal?",
+    "I’ve already dropped the price quite a bit, sorry!"
+]
+
+meetup_sender = [
+    "Where should we meet up?",
+    "What times are you free to meet?",
+    "Can we meet on campus?",
+    "Would tomorrow afternoon work?",
+    "Does {hour}{meridiem} work for you?",
+]
+
+meetup_responses = [
+    "I can meet near the library.",
+    "Let’s do outside the student center?",
+    "I’m free after 3pm today.",
+    "Tomorrow works great, what time?",
+    "{hour}{meridiem} sounds good to me!",
+]
+
+closing_sender = [
+    "Perfect, see you then!",
+    "Thanks so much!",
+    "Sounds good, I’ll message when I’m there.",
+    "Alright, I’ll bring cash.",
+    "Appreciate it!"
+]
+
+closing_responses = [
+    "See you soon!",
+    "No problem, thanks!",
+    "Okay, looking forward to it.",
+    "Awesome, have a good one!",
+    "Great, thanks again!"
+]
+
+message_map = {
+    'greeting_sender': greeting_sender,
+    'greeting_responses': greeting_responses,
+    'availability_sender': availability_sender,
+    'availability_responses': availability_responses,
+    'negotiation_sender': negotiation_sender,
+    'negotiation_responses': negotiation_responses,
+    'meetup_sender': meetup_sender,
+    'meetup_responses': meetup_responses,
+    'closing_sender': closing_sender,
+    'closing_responses': closing_responses,
+}
+
+conversation_stages = list(message_map)
+
+
+def timestamp_column(keys, rows):
+    # one strftime per chunk instead of one per row
+    return np.full(rows, keys["now"].strftime(TIMESTAMP_FORMAT))
+
+
+def numbered(prefix, ids, suffix=""):
+    return np.char.add(np.char.add(prefix, ids.astype(str)), suffix)
+
+
+def chunk_bounds(rows, chunk_size):
+    for start in range(0, rows, chunk_size):
+        yield start, min(start + chunk_size, rows)
+
+
+def table_rng(seed, table, shard=None, batch=0):
+    # every table, and every shard of a table, gets its own independent stream of the run seed,
+    # so the output only depends on --seed and --chunk-size, never on scheduling
+    spawn_key = (TABLE_NAMES.index(table),) if shard is None else (TABLE_NAMES.index(table), shard)
+    if batch:
+        # batches appended with --state get streams of their own, batch 0 keeps the streams of a plain run
+        spawn_key = (APPEND_SHARD, batch) + spawn_key
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=spawn_key))
+
+
+def row_ids(keys, table, start, stop):
+    # ids continue after the rows of earlier batches
+    return keys["offsets"][table] + np.arange(start, stop)
+
+
+def user_ids(rows, rng, first=0):
+    # the hard-coded accounts first, then random ones, all packed as 16 bytes per user
+    known = pack_uuids(uuidList[first:first + rows])
+    if rows <= len(known):
+        return known
+    return np.concatenate([known, random_uuids(rng, rows - len(known))])
+
+
+def unrank_pairs(ranks):
+    # rank r <-> pair (i, j) with i < j, enumerated as (0,1), (0,2), (1,2), (0,3), ... so r = j(j-1)/2 + i
+    j = ((1 + np.sqrt(1 + 8 * ranks.astype(np.float64))) // 2).astype(np.int64)
+    # float sqrt can land one off near the boundary of a run, nudge j back into place
+    j -= j * (j - 1) // 2 > ranks
+    j += (j + 1) * j // 2 <= ranks
+    return ranks - j * (j - 1) // 2, j
+
+
+def distinct_pairs(rng, population, rows, taken=None):
+    """Draws `rows` distinct unordered pairs of different users in O(rows).
+
+    Pair ranks are sampled without replacement and unranked, so there is no rejection loop that
+    slows down as the table approaches every possible pair. Each pair is randomly oriented.
+    `taken` is the sorted ranks of pairs an earlier batch drew, which are skipped.
+    """
+    taken = np.empty(0, np.int64) if taken is None else taken
+    possible = population * (population - 1) // 2 - len(taken)
+    if rows > possible:
+        raise ValueError(f"cannot draw {rows} distinct pairs from {population} users ({possible} left)")
+    ranks = rng.choice(possible, size=rows, replace=False)
+    if len(taken):
+        # the k-th free rank is k plus the number of taken ranks at or below it
+        ranks = ranks + np.searchsorted(taken - np.arange(len(taken)), ranks, side="right")
+    low, high = unrank_pairs(ranks)
+    swap = rng.random(rows) < 0.5
+    return np.where(swap, high, low), np.where(swap, low, high)
+
+
+def cart_cells(rng, registry, carts, rows):
+    """(cart * products + product) of `rows` distinct cart items, products drawn by their popularity."""
+    products = registry.count("Product_Information")
+    if rows > carts * products:
+        raise ValueError(f"cannot put {rows} distinct products into {carts} carts of {products} products")
+    cells = np.empty(0, np.int64)
+    # duplicates are rare unless the carts are nearly full, so redraw just those
+    while len(cells) < rows:
+        missing = rows - len(cells)
+        drawn = rng.integers(0, carts, missing) * products + registry.sample("Product_Information", rng, missing)
+        cells = np.concatenate([cells, drawn])
+        _, first = np.unique(cells, return_index=True)
+        cells = cells[np.sort(first)]
+    return cells
+
+
+def conversation_lengths(rng, chats, messages, distribution, skew):
+    """Splits `messages` over `chats` with heavy-tailed weights: a few very long chats, many short ones."""
+    if messages and not chats:
+        raise ValueError("Messages need at least one chat")
+    if distribution == "zipf":
+        weights = rng.zipf(skew, chats).astype(np.float64)
+    elif distribution == "lognormal":
+        weights = rng.lognormal(0.0, skew, chats)
+    else:
+        weights = np.ones(chats)
+    # every chat gets one message when there are enough, the rest follows the weights
+    base = 1 if messages >= chats else 0
+    spread = messages - base * chats
+    share = spread * weights / weights.sum()
+    lengths = np.floor(share).astype(np.int64)
+    leftover = int(spread - lengths.sum())
+    if leftover:
+        lengths[np.argpartition(share - lengths, -leftover)[-leftover:]] += 1
+    return lengths + base
+
+
+def conversation_timeline(rng, lengths, created_at, history_days=HISTORY_DAYS):
+    # a chat opens early enough that its last message, one gap apart from the previous, is in the past
+    history = rng.integers(0, history_days * 86_400_000_000, size=len(lengths))
+    return np.datetime64(created_at, "us") - (lengths * MESSAGE_GAP_US + history).astype("timedelta64[us]")
+
+
+def key_registry(seed, scale, popularity_skew=0.0, base=None):
+    """Keys of the rows of `scale`, after the keys of the earlier batches in `base` (see dataset_state.py)."""
+    batch, existing = (base["next_batch"], base["rows"]) if base else (0, {})
+    registry = KeyRegistry()
+    users = user_ids(scale["User_Information"], table_rng(seed, "User_Information", batch=batch),
+                     existing.get("User_Information", 0))
+    registry.add_uuids("User_Information", np.concatenate([base["users"], users]) if base else users)
+    for table in ("Category_Tags", "Product_Information", "Chats"):
+        registry.add_ids(table, np.arange(existing.get(table, 0) + scale[table]))
+    # popular sellers list and are reviewed more, popular products are added to more carts
+    for table in ("User_Information", "Product_Information"):
+        registry.set_popularity(table, table_rng(seed, table, POPULARITY_SHARD, batch), popularity_skew)
+    return registry
+
+
+def generate_keys(seed, scale, created_at=None, message_shape=("zipf", None), popularity_skew=0.0,
+                  history_days=HISTORY_DAYS, base=None):
+    # keys shared between tables or unique across a whole table are drawn up front,
+    # everything else is drawn per chunk. With a `base` state the new rows are appended to
+    # its rows, and foreign keys and pairs are drawn over the existing and the new rows.
+    created_at = created_at or now
+    batch = base["next_batch"] if base else 0
+    pairs = base["pairs"] if base else {}
+    registry = key_registry(seed, scale, popularity_skew, base)
+    users = registry.count("User_Information")
+    items = catalogue.product_items(table_rng(seed, "Product_Information", CATALOGUE_SHARD, batch),
+                                    scale["Product_Information"])
+    distribution, skew = message_shape
+    message_rng = table_rng(seed, "Messages", batch=batch)
+    # messages are spread over the chats of earlier batches too, which continue where they stopped
+    earlier = base["chats"] if base else {name: np.empty(0, np.int64) for name in dataset_state.CHAT_KEYS}
+    existing = len(earlier["messages"])
+    lengths = conversation_lengths(message_rng, existing + scale["Chats"], scale["Messages"], distribution,
+                                   skew or MESSAGE_SKEW[distribution])
+    chats = distinct_pairs(table_rng(seed, "Chats", batch=batch), users, scale["Chats"], pairs.get("chats"))
+    starts = conversation_timeline(message_rng, lengths, created_at, history_days)
+    positions = np.concatenate([earlier["messages"], np.zeros(scale["Chats"], np.int64)])
+    # an earlier chat's next message comes after its last one, its positions carry on from there
+    resumed = np.maximum(starts[:existing], earlier["next"].astype("datetime64[us]"))
+    starts[:existing] = resumed - (positions[:existing] * MESSAGE_GAP_US).astype("timedelta64[us]")
+    return {
+        "scale": scale,
+        "batch": batch,
+        "offsets": {name: base["rows"].get(name, 0) if base else 0 for name in TABLE_NAMES},
+        "now": created_at,
+        "history_days": history_days,
+        "registry": registry,
+        "chats": chats,
+        # the following are indexed by chat id, over the earlier and the new chats
+        "chat_users": (np.concatenate([earlier["first"], chats[0]]), np.concatenate([earlier["second"], chats[1]])),
+        "conversation_lengths": lengths,
+        "conversation_ends": np.cumsum(lengths),
+        "conversation_positions": positions,
+        "conversation_starts": starts,
+        # every message is sent within one gap of its position, so the next one of the chat can follow from here
+        "conversation_next": starts + ((positions + lengths) * MESSAGE_GAP_US).astype("timedelta64[us]"),
+        "reports": distinct_pairs(table_rng(seed, "Reports", batch=batch), users, scale["Reports"],
+                                  pairs.get("reports")),
+        "interactions": distinct_pairs(table_rng(seed, "User_Interactions", batch=batch), users,
+                                       scale["User_Interactions"], pairs.get("interactions")),
+        "product_items": items,
+        # products are tagged with the categories of their item, (category_id, product_id) stays unique
+        "category_cells": catalogue.category_cells(items, registry.count("Category_Tags"),
+                                                   scale["Category_Assigned_Products"],
+                                                   table_rng(seed, "Category_Assigned_Products", batch=batch)),
+        # items go into the carts of this batch, so they never collide with the items of earlier batches
+        "cart_cells": cart_cells(table_rng(seed, "Shopping_Cart_Products", batch=batch), registry,
+                                 scale["Shopping_Cart"], scale["Shopping_Cart_Products"]),
     }
-    
-    greeting_sender = [
-        "Hello!",
-        "Hi there!",
-        "Hey, how’s it going?",
-        "Hi, I saw your post about the item.",
-        "Hey! I’m interested in something you’re selling."
-    ]
-
-    greeting_responses = [
-        "Hi! How can I help you?",
-        "Hey! Yes, what’s up?",
-        "Hi there, which item are you looking at?",
-        "Hello! Thanks for reaching out.",
-        "Hey, good to hear from you!"
-    ]
-    
-    availability_sender = [
-        "Is this product still available?",
-        "Do you still have this for sale?",
-        "Are you still selling this item?",
-        "Hey, just checking if this is still up for grabs.",
-        "Do you happen to have any extras of this?"
-    ]
-
-    availability_responses = [
-        "Yes, it’s still available!",
-        "I’ve got one left!",
-        "Sorry, it just sold earlier today.",
-        "Yeah, it’s still up for sale.",
-        "I only have one more available."
-    ]
-
-    negotiation_sender = [
-        "I’m really interested, but could you do a bit cheaper?",
-        "Would you take $5 less?",
-        "Could you do $10 off if I pick it up today?",
-        "Is the price negotiable?",
-        "That’s a bit expensive for me, can we work something out?"
-    ]
-
-    negotiation_responses = [
-        "Hmm, I can do a small discount, maybe $5 off.",
-        "Sorry, the price is firm.",
-        "If you pick it up today, I can lower it a little.",
-        "Let’s say $5 less — deal?",
-        "I’ve already dropped the price quite a bit, sorry!"
-    ]
-
-    meetup_sender = [
-        "Where should we meet up?",
-        "What times are you free to meet?",
-        "Can we meet on campus?",
-        "Would tomorrow afternoon work?",
-        f"Does {hour}{meridiem} work for you?",
-    ]
-
-    meetup_responses = [
-        "I can meet near the library.",
-        "Let’s do outside the student center?",
-        "I’m free after 3pm today.",
-        "Tomorrow works great, what time?",
-        f"{hour}{meridiem} sounds good to me!",
-    ]
-
-    closing_sender = [
-        "Perfect, see you then!",
-        "Thanks so much!",
-        "Sounds good, I’ll message when I’m there.",
-        "Alright, I’ll bring cash.",
-        "Appreciate it!"
-    ]
-
-    closing_responses = [
-        "See you soon!",
-        "No problem, thanks!",
-        "Okay, looking forward to it.",
-        "Awesome, have a good one!",
-        "Great, thanks again!"
-    ]
-    
-    return message_map(message_type)
-    
-def generateMessagesData():
-    Messages.append(['chat_id', 'sender_id', 'logged_message', 'created_at'])
-    hour = random.randint(1, 12)
-    meridiem = random.choice(['am', 'pm'])
-
-    messages = [
-        # Greetings
-        "Hi",
-        "Hello!",
-        "Hey there!",
-        "Hi, is this still available?",
-        "Yo, you still selling this?",
-        "Hey, I’m interested in this item.",
-        "Hey! Just saw your post about this.",
-        "Hi! Is this the same one you used for class last semester?",
-        "Hey, I saw your post — looks like something I need!",
-        "Yooo, I've been looking for this, is this still availible?",
-
-        # Availability & condition
-        "Is this product still available?",
-        "Do you still have this?",
-        "How old is this item?",
-        "Is it in good condition?",
-        "Any scratches or damages?",
-        "Do you have any extras of this?",
-        "Has this been used much?",
-        "Just making sure this still works, right?",
-        "Does it come with the original packaging?",
-        "Is the access code still valid?",
-
-        # Negotiation / price discussion
-        "Could you do $5 cheaper?",
-        "Would you take $20 for it?",
-        "Is the price negotiable?",
-        "Can you lower the price a bit?",
-        "Would you accept a trade?",
-        "I’m on a tight budget, could you go any lower?",
-        "Would you take coffee instead of cash? 😂",
-        "If I pick it up today, could you do $10 off?",
-        "Could you hold it for me until tomorrow?",
-        "Any student discount? 😅",
-
-        # Seller responses
-        "Yeah, it’s still available!",
-        "Sure, I can do $5 off.",
-        "Sorry, someone else messaged me first.",
-        "It’s yours if you can pick it up today.",
-        "I can’t really go lower, sorry.",
-        "Sure, I’ll hold it for you.",
-        "Yep, still good as new.",
-        "Thanks for your interest!",
-        "I just sold it earlier, sorry!",
-        "No problem, I’ll keep you posted if it doesn’t sell.",
-
-        # Meetup coordination
-        "Where should we meet up?",
-        f"Does {hour}{meridiem} work for you?",
-        "What times are you free to meet up?",
-        "Are you on campus today?",
-        "Could we meet at the library?",
-        "Can we meet near the student center?",
-        "I can meet after class around 3pm, does that work?",
-        f"I’m free around {hour}{meridiem}, would that work for you?",
-        "Let’s meet by the cafeteria entrance.",
-        "I’ll be in the parking lot near Building B.",
-        "I’m wearing a red hoodie so you can spot me.",
-
-        # Running Late
-        "Sorry, I'm running a bit late, I'll be there soon",
-        "Hey, I'm actually not gonna make it today, can we organize for another time?",
-        "Can we rescheduale?",
-        "Stuck in traffic, give me 10 mins!",
-        "Class ran over time, sorry!",
-        "Could we meet later tonight instead?",
-        "Can we push it to tomorrow?",
-        "Just realized I left it at home, sorry about that.",
-
-        # Ghosted / follow-ups
-        "Just following up, is this still available?",
-        "Hey, just checking in — haven’t heard back.",
-        "Are you still interested?",
-        "Let me know if you changed your mind.",
-        "Still want this?",
-        "Did you end up selling it?",
-        "You there?",
-        "Guess I’ll take that as a no 😂",
-
-        # Confirmations & polite messages
-        "Sounds good, see you then!",
-        "Thanks!",
-        "Cool, I’ll be there.",
-        "Let me know when you’re on your way.",
-        "Can you send a quick confirmation before you leave?",
-        "I’m here, where are you?",
-        "Running a few minutes late, sorry!",
-        "No worries, take your time.",
-        "Got it, thanks!",
-        "Awesome, appreciate it.",
-
-        # Product-specific
-        "Is this the 8th edition textbook?",
-        "Does it include the access code?",
-        "Is this for PSYC 1101?",
-        "Does it come with the charger?",
-        "Are all the pages intact?",
-        "Can you send a picture of the inside?",
-        "Is this still sealed?",
-        "Are you firm on the price?",
-        "Does it come with the manual?",
-        "Do you still have the receipt?",
-
-        # Misc small talk / student chatter
-        "Sorry, just saw your message.",
-        "Thanks for holding it for me!",
-        "I can grab it after my lecture.",
-        "Appreciate it, I’ve been looking for this all week.",
-        "Sweet, that works perfectly.",
-        "No worries if it’s already sold.",
-        "Cool, I’ll message you when I’m heading out.",
-        "Thanks again!",
-        "How’s your semester going so far?",
-        "Ugh, midterms are killing me.",
-        "Do you have the same prof for this course?",
-        "I used this book last term — total lifesaver.",
-        "This class was brutal lol.",
-        "Good luck with finals!",
-        "You a CS major too?",
-        "Man, I wish I’d found this earlier.",
-
-        # Complaints / issues
-        "Hey, there are pages missing from this book.",
-        "This doesn’t look like the photo you posted.",
-        "It’s not turning on — did it work when you sold it?",
-        "The cover’s pretty damaged, just FYI.",
-        "This wasn’t mentioned in the description.",
-        "Hey, I think you gave me the wrong charger.",
-        "Can we work something out? It’s kind of broken.",
-        "I’m a bit disappointed, not as described.",
-        "It smells a bit weird, just saying.",
-        "Hey, next time please mention the condition properly.",
-        "You didn’t show up yesterday, what happened?",
-        "I waited 20 minutes and you never came.",
-        "Not cool, man. You could’ve just said you sold it.",
-        "Hey, can I get a refund or something?",
-
-        # Lighthearted / random chatter
-        "Lol I totally forgot about this class.",
-        "I only passed because of this book 😂",
-        "Haha yeah, I’ve been meaning to sell this forever.",
-        "I used to love this course until midterms happened.",
-        "Thanks again, you’re a lifesaver!",
-        "Bro this deal was too good to pass up.",
-        "My roommate told me to grab this before it’s gone.",
-        "Finally got rid of that heavy textbook 😂",
-        "Good doing business with you!",
-        "Have a good one!"
-    ]
-    
-    for i in range(rowsToGenerate):
-        # get chat id
-        # get user_id_1
-        # get user_id_2
-        
-        
-        random.choice(genMessage('greeting_sender')),
-        random.choice(genMessage('greeting_responses')),
-        random.choice(genMessage('availability_sender')),
-        random.choice(genMessage('availability_responses')),
-        random.choice(genMessage('negotiation_sender')),
-        random.choice(genMessage('negotiation_responses')),
-        random.choice(genMessage('meetup_sender')),
-        random.choice(genMessage('meetup_responses') ),
-        random.choice(genMessage('closing_sender')),
-        random.choice(genMessage('closing_responses'))
-        
-        message = [
-        random.randint(1, 100),
-        chatList[random.randint(num_users_low, num_users_high)],
-        uuidList[random.randint(num_users_low, num_users_high)],
-        random.choice(messages),
-        ]
-        Messages.append(message)
-
-def generateCategoryAssignedProductsData():
-    Category_Assigned_Products.append(['category_id', 'product_id', 'created_at'])
-    for i in range(rowsToGenerate):
-        catAP = [
-        categoryList[random.randint(num_users_low, num_users_high)],
-        productList[random.randint(num_users_low, num_users_high)],
-        now.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
-        ]
-        Category_Assigned_Products.append(catAP)
-        
-def generateCategoryTagsData():
-    Category_Tags.append(['id', 'name', 'description', 'created_at'])
-    for i in range(rowsToGenerate):
-        catTag = [
-        i,
-        f"Category{i}",
-        "This category has no description",
-        now.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
-        ]
-        Category_Tags.append(catTag)
-        
-def generateReportsData():
-    Reports.append(['created_by_id', 'created_on_id', 'description'])
-    seen = set()
-    report_desc = [
-        "They killed my dog",
-        "This person scammed me, please ban them",
-        "They wrote obscenities towards me in the chat",
-        "Reporting this person for spamming the chat",
-        "This person is mean and keeps bothering me, please ban them",
-        "They are being racist",
-        "I think this person is a bot account, please investigate",
-        "They keep posting links to crypto sites",
-        "They sent me unsolicited images",
-        "This user is harassing me repeatedly",
-        "They are impersonating someone else",
-        "Sharing inappropriate content in the forum",
-        "They are threatening other users",
-        "Posting personal information without consent",
-        "Spamming repeated messages in the chat",
-        "Attempting to trick me into a scam",
-        "They are making offensive jokes and comments",
-        "Using the platform to solicit money fraudulently",
-        "Sending abusive language via private messages",
-        "This account seems fake, suspicious behavior",
-        "Repeatedly violating the community guidelines",
-        "They are trolling and disrupting conversations",
-        "Posting misleading product reviews",
-        "This person is trying to phish other users",
-        "Using multiple accounts to harass people",
-        "Encouraging illegal activity or dangerous behavior"
-    ]
-    for i in range(rowsToGenerate):
-        uuid1, uuid2 = generate_distinct_uuid()
-        pair = tuple(sorted([uuid1, uuid2]))
-        while(pair in seen):
-            uuid1, uuid2 = generate_distinct_uuid()
-            pair = tuple(sorted([uuid1, uuid2]))
-        report = (pair[0], pair[1], random.choice(report_desc))
-        seen.add(report)
-        Reports.append(report)
-
-def generateReviewsData():
-    Reviews.append(['created_by_id', 'created_on_id','rating', 'description'])
-    negative_review = [
-        "This guy smells like feet",
-        "This person scammed me! Don't buy!",
-        "They doesn't respond to messages...",
-        "I know this guy in person, avoid at all cost",
-        "Package arrived broken and seller refused refund",
-        "Terrible communication, would not recommend",
-        "Product was completely different from the description",
-        "Slow shipping and poor customer service",
-        "Received the wrong item twice, very frustrating",
-        "Seller tried to overcharge me, dishonest behavior"
-    ]
-
-    positive_review = [
-        "Quick delivery, secure packaging, and excellent quality matching the website description",
-        "Very nice to talk to. Delivered package on time.",
-        "I just think their eyes are dreamy",
-        "Good",
-        "Item exactly as described, highly recommend",
-        "Friendly seller and smooth transaction",
-        "Exceeded my expectations, excellent quality",
-        "Super fast shipping, very reliable",
-        "Amazing experience, would buy again",
-        "Responsive and helpful, highly satisfied"
-    ]
-
-    medium_review = [
-        "Package arrived later than expected, but product is fine",
-        "Item quality is okay, nothing special",
-        "Communication was average, took a while to reply",
-        "Not bad, but could be better",
-        "The product works, but not as described in detail",
-        "Shipping took longer than usual",
-        "Packaging was adequate, not impressive",
-        "In person hand off was fine, product is acceptable",
-        "Average experience, neither good nor bad",
-        "Got the textbook I wanted, but setting up a pickup time was difficult"
-    ]
-
-    for i in range(rowsToGenerate):
-        uuid1, uuid2 = generate_distinct_uuid()
-        rating = random.randint(1, 10)/2
-        if(rating > 3.5): desc = random.choice(positive_review)
-        elif (rating <= 3.5 and rating >= 1.5): desc = random.choice(medium_review)
-        else: desc = random.choice(negative_review)
-        review = [
-            uuid1,
-            uuid2,
-            # productList[random.randint(num_users_low, num_users_high)],
-            rating,
-            desc
-        ]
-        Reviews.append(review)
-    
-def genRand():
-    return random.random() < 0.25
-               
-def generateUserInteractionsData():
-    User_Interactions.append(['user_id_1', 'user_id_2', 'user_1_is_blocked', 'user_2_is_blocked', 'user_1_is_muted', 'user_2_is_muted'])
-    seen = set()
-    for i in range(rowsToGenerate):
-        uuid1, uuid2 = generate_distinct_uuid()
-        pair = tuple(sorted([uuid1, uuid2]))
-        while(pair in seen):
-            uuid1, uuid2 = generate_distinct_uuid()
-            pair = tuple(sorted([uuid1, uuid2]))
-        ui = (pair[0], pair[1], genRand(), genRand(), genRand(), genRand())
-        while(ui[2] == False and ui[3] == False and ui[4] == False and ui[5] == False):
-            ui = (pair[0], pair[1], genRand(), genRand(), genRand(), genRand())
-        seen.add(pair)
-        User_Interactions.append(ui)
-        
-generateUserData()
-generateProductData()
-generateShoppingCartData()
-generateChatData()
-generateMessagesData()
-generateCategoryAssignedProductsData()
-generateCategoryTagsData()
-generateReportsData()
-generateReviewsData()
-generateUserInteractionsData()
-
-for name, arr in Tables.items():
-    print(f"\n{name}: {arr}")
-    
-for name, arr in Tables.items():
-    df_table = pd.DataFrame(arr[1:], columns=arr[0])
-    df_table.to_csv(f"./Table csv's/{name}.csv", index=False)
-    
+
+
+# Each generator below builds rows [start, stop) of its table as one DataFrame chunk.
+
+def generateUserData(keys, start, stop, rng):
+    ids = row_ids(keys, "User_Information", start, stop)
+    first = keys["offsets"]["User_Information"]
+    return pd.DataFrame({
+        'id': ids,
+        'supabase_id': keys["registry"].uuid_strings("User_Information", slice(first + start, first + stop)),
+        'first_name': numbered("FirstName", ids),
+        'last_name': numbered("LastName", ids),
+        'email': numbered("TestUser", ids, "@mtroyal.ca"),
+        'user_name': numbered("username", ids),
+        'deleted_on': None,
+        'is_deleted': False,
+        'is_flagged': False,
+        'flagged_type': None,
+        'created_at': timestamp_column(keys, stop - start),
+    })
+
+
+def generateProductData(keys, start, stop, rng):
+    ids = row_ids(keys, "Product_Information", start, stop)
+    registry = keys["registry"]
+    sellers = registry.sample("User_Information", rng, stop - start)
+    items = keys["product_items"][start:stop]
+    title, description, price = catalogue.product_text(items, rng)
+    sold = rng.random(stop - start) < SOLD_SHARE
+    stock = rng.integers(1, 11, size=stop - start)
+    # listed over the same history as the chats, so keyset pages on (created_at, id) walk a real range
+    listed = np.datetime64(keys["now"], "us") - rng.integers(
+        0, keys["history_days"] * 86_400_000_000, size=stop - start).astype("timedelta64[us]")
+    return pd.DataFrame({
+        'id': ids,
+        'user_id': registry.uuid_strings("User_Information", sellers),
+        'title': title,
+        'description': description,
+        'image': catalogue.IMAGES[items],
+        'price': price,
+        'stock_count': stock,
+        # mark_product_as_sold() unlists and deletes
+        'isListed': ~sold,
+        'isDeleted': sold,
+        'created_at': np.char.add(np.datetime_as_string(listed, unit="us"), "Z"),
+    })
+
+
+def generateShoppingCartData(keys, start, stop, rng):
+    ids = row_ids(keys, "Shopping_Cart", start, stop)
+    # one cart per user while there are as many carts as users
+    owners = ids % keys["registry"].count("User_Information")
+    return pd.DataFrame({
+        'id': ids,
+        'user_id': keys["registry"].uuid_strings("User_Information", owners),
+        'created_at': timestamp_column(keys, stop - start),
+    })
+
+
+def generateShoppingCartProductsData(keys, start, stop, rng):
+    cells = keys["cart_cells"][start:stop]
+    registry = keys["registry"]
+    product_count = registry.count("Product_Information")
+    return pd.DataFrame({
+        'shopping_cart_id': keys["offsets"]["Shopping_Cart"] + cells // product_count,
+        'product_id': registry.id_values("Product_Information", cells % product_count),
+        'created_at': timestamp_column(keys, stop - start),
+    })
+
+
+def generateChatData(keys, start, stop, rng):
+    first, second = keys["chats"]
+    ids = row_ids(keys, "Chats", start, stop)
+    return pd.DataFrame({
+        'id': ids,
+        'user_id_1': keys["registry"].uuid_strings("User_Information", first[start:stop]),
+        'user_id_2': keys["registry"].uuid_strings("User_Information", second[start:stop]),
+        'created_at': np.char.add(np.datetime_as_string(keys["conversation_starts"][ids], unit="us"), "Z"),
+    })
+
+
+def genMessage(message_type, hour, meridiem):
+    return [message.format(hour=hour, meridiem=meridiem) for message in message_map[message_type]]
+
+
+def generateMessagesData(keys, start, stop, rng):
+    """Builds messages as whole conversations.
+
+    Message i belongs to the chat whose cumulative length first exceeds i. The opening messages walk
+    through the staged pools (greeting, availability, negotiation, meetup), long chats fill the middle
+    with general chatter and the last two messages close the deal. user_id_1 sends the even positions,
+    user_id_2 answers on the odd ones, and created_at grows by about MESSAGE_GAP_US per position. A chat
+    of an earlier batch carries on at the position after its last message.
+    """
+    first, second = keys["chat_users"]
+    ends = keys["conversation_ends"]
+    hour, meridiem = rng.integers(1, 13), rng.choice(['am', 'pm'])
+    pools = [genMessage(stage, hour, meridiem) for stage in conversation_stages]
+    pools.append([message.format(hour=hour, meridiem=meridiem) for message in message_list])
+    phrases = np.array([phrase for pool in pools for phrase in pool])
+    pool_sizes = np.array([len(pool) for pool in pools])
+    pool_offsets = np.concatenate([[0], np.cumsum(pool_sizes)[:-1]])
+
+    index = np.arange(start, stop)
+    chat = np.searchsorted(ends, index, side="right")
+    earlier = keys["conversation_positions"][chat]
+    length = earlier + keys["conversation_lengths"][chat]
+    position = earlier + index - (ends[chat] - keys["conversation_lengths"][chat])
+    closing = len(conversation_stages) - 2
+    pool = np.where(position < closing, position,
+                    np.where(position >= np.maximum(closing, length - 2),
+                             closing + np.minimum(position - np.maximum(closing, length - 2), 1), len(pools) - 1))
+    picked = pool_offsets[pool] + (rng.random(stop - start) * pool_sizes[pool]).astype(np.int64)
+
+    # the jitter stays below one gap, so timestamps strictly increase within a chat
+    sent = (keys["conversation_starts"][chat] + (position * MESSAGE_GAP_US
+            + rng.integers(0, MESSAGE_GAP_US, size=stop - start)).astype("timedelta64[us]"))
+    return pd.DataFrame({
+        'chat_id': chat,
+        'sender_id': keys["registry"].uuid_strings("User_Information",
+                                                   np.where(position % 2 == 0, first[chat], second[chat])),
+        'logged_message': phrases[picked],
+        'created_at': np.char.add(np.datetime_as_string(sent, unit="us"), "Z"),
+        'visible': True,
+    })
+
+
+def generateCategoryAssignedProductsData(keys, start, stop, rng):
+    cells = keys["category_cells"][start:stop]
+    product_count = keys["scale"]["Product_Information"]
+    return pd.DataFrame({
+        'category_id': cells // product_count,
+        'product_id': keys["offsets"]["Product_Information"] + cells % product_count,
+        'created_at': timestamp_column(keys, stop - start),
+    })
+
+
+def generateCategoryTagsData(keys, start, stop, rng):
+    ids = row_ids(keys, "Category_Tags", start, stop)
+    names, descriptions = catalogue.category_names(ids)
+    return pd.DataFrame({
+        'id': ids,
+        'name': names,
+        'description': descriptions,
+        'created_at': timestamp_column(keys, stop - start),
+    })
+
+
+def generateReportsData(keys, start, stop, rng):
+    first, second = keys["reports"]
+    descriptions = np.array(report_desc)
+    return pd.DataFrame({
+        'created_by_id': keys["registry"].uuid_strings("User_Information", first[start:stop]),
+        'created_on_id': keys["registry"].uuid_strings("User_Information", second[start:stop]),
+        'description': descriptions[rng.integers(0, len(descriptions), size=stop - start)],
+    })
+
+
+def generateReviewsData(keys, start, stop, rng):
+    registry = keys["registry"]
+    users = registry.count("User_Information")
+    positive, medium, negative = np.array(positive_review), np.array(medium_review), np.array(negative_review)
+    created_on = registry.sample("User_Information", rng, stop - start)
+    # shift by 1..n-1 so a user never reviews themselves
+    created_by = (created_on + rng.integers(1, users, size=stop - start)) % users
+    rating = rng.integers(1, 11, size=stop - start) / 2
+    pick = rng.integers(0, 10, size=stop - start)
+    return pd.DataFrame({
+        'created_by_id': registry.uuid_strings("User_Information", created_by),
+        'created_on_id': registry.uuid_strings("User_Information", created_on),
+        'rating': rating,
+        'description': np.where(rating > 3.5, positive[pick], np.where(rating >= 1.5, medium[pick], negative[pick])),
+    })
+
+
+def generateUserInteractionsData(keys, start, stop, rng):
+    first, second = keys["interactions"]
+    flags = rng.random((stop - start, 4)) < 0.25
+    # an interaction row only exists if at least one user blocked or muted the other
+    empty = ~flags.any(axis=1)
+    while empty.any():
+        flags[empty] = rng.random((empty.sum(), 4)) < 0.25
+        empty = ~flags.any(axis=1)
+    return pd.DataFrame({
+        'user_id_1': keys["registry"].uuid_strings("User_Information", first[start:stop]),
+        'user_id_2': keys["registry"].uuid_strings("User_Information", second[start:stop]),
+        'user_1_is_blocked': flags[:, 0],
+        'user_2_is_blocked': flags[:, 1],
+        'user_1_is_muted': flags[:, 2],
+        'user_2_is_muted': flags[:, 3],
+    })
+
+
+Generators = {
+    "User_Information": generateUserData,
+    "Product_Information": generateProductData,
+    "Shopping_Cart": generateShoppingCartData,
+    "Chats": generateChatData,
+    "Messages": generateMessagesData,
+    "Category_Assigned_Products": generateCategoryAssignedProductsData,
+    "Category_Tags": generateCategoryTagsData,
+    "Reports": generateReportsData,
+    "Reviews": generateReviewsData,
+    "User_Interactions": generateUserInteractionsData,
+    "Shopping_Cart_Products": generateShoppingCartProductsData,
+}
+
+class ChunkBuilder:
+    """Builds the chunks of every table for one set of keys, in this process or in a pool worker."""
+
+    def __init__(self, keys, seed):
+        self.keys = keys
+        self.seed = seed
+
+    def build(self, name, shard, start, stop):
+        rng = table_rng(self.seed, name, shard, self.keys["batch"])
+        return Generators[name](self.keys, start, stop, rng)
+
+
+# the builder of a pool worker process, set once by the pool initializer so the keys are not sent per task
+worker_builder = None
+
+
+def init_worker(keys, seed):
+    global worker_builder
+    worker_builder = ChunkBuilder(keys, seed)
+
+
+def build_worker_chunk(name, shard, start, stop):
+    return worker_builder.build(name, shard, start, stop)
+
+
+def table_rows(name, keys):
+    if name == "Category_Assigned_Products":
+        return len(keys["category_cells"])
+    if name == "Shopping_Cart_Products":
+        return len(keys["cart_cells"])
+    return keys["scale"][name]
+
+
+def ordered_chunks(pool, tasks, window):
+    # keeps at most `window` chunks in flight so memory stays bounded while workers run ahead
+    tasks = iter(tasks)
+    pending = deque(pool.submit(build_worker_chunk, *task) for task in itertools.islice(tasks, window))
+    while pending:
+        chunk = pending.popleft().result()
+        for task in itertools.islice(tasks, 1):
+            pending.append(pool.submit(build_worker_chunk, *task))
+        yield chunk
+
+
+def create_pool(workers, keys, seed):
+    return ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(keys, seed))
+
+
+def generate_tables(keys, seed, chunk_size, order=TABLE_NAMES, pool=None, workers=1):
+    """{table: chunk iterator} of the tables in `order`, which must be consumed in that order."""
+    shards = {name: list(chunk_bounds(table_rows(name, keys), chunk_size)) for name in order}
+    if pool is None:
+        builder = ChunkBuilder(keys, seed)
+        return {name: itertools.starmap(builder.build, [(name, shard, start, stop)
+                                                        for shard, (start, stop) in enumerate(shards[name])])
+                for name in order}
+    # one ordered stream across all tables, so small tables are built alongside the shards of large ones
+    tasks = [(name, shard, start, stop) for name in order for shard, (start, stop) in enumerate(shards[name])]
+    stream = ordered_chunks(pool, tasks, window=workers * 2)
+    return {name: itertools.islice(stream, len(shards[name])) for name in order}
+
+
+def existing_rows(keys, chunk_size):
+    """Key columns of the rows of earlier batches as {table: chunk iterator}, for validate_tables()."""
+    def chunks(name):
+        for start, stop in chunk_bounds(keys["offsets"][name], chunk_size):
+            ids = np.arange(start, stop)
+            if name != "User_Information":
+                yield pd.DataFrame({'id': ids})
+                continue
+            yield pd.DataFrame({
+                'id': ids,
+                'supabase_id': keys["registry"].uuid_strings(name, slice(start, stop)),
+                'email': numbered("TestUser", ids, "@mtroyal.ca"),
+            })
+    return {name: chunks(name) for name in ("User_Information", "Category_Tags", "Product_Information", "Chats")}
+
+
+# tables of distinct unordered user pairs, at most users * (users - 1) / 2 rows each
+PAIR_TABLES = ["Chats", "Reports", "User_Interactions"]
+
+
+def parse_scale(rows, overrides, base=None):
+    """Rows per table of this run, ValueError when the tables cannot be generated with them.
+
+    With a `base` state (see dataset_state.py) the rows come after its rows, so the users,
+    products and pairs it records count towards what the new rows can reference.
+    """
+    if rows < 0:
+        raise ValueError(f"--rows must not be negative, got {rows}")
+    scale = {name: rows for name in TABLE_NAMES}
+    for override in overrides:
+        name, _, count = override.partition("=")
+        if name not in scale or not count.isdigit():
+            raise ValueError(f"invalid --scale {override!r}, expected <Table>=<rows>")
+        scale[name] = int(count)
+    existing = base["rows"] if base else {}
+    if base:
+        # the catalogue categories all exist after the first batch
+        scale["Category_Tags"] = 0
+
+    users = existing.get("User_Information", 0) + scale["User_Information"]
+    products = existing.get("Product_Information", 0) + scale["Product_Information"]
+    needs = {"Product_Information": ("user", users), "Shopping_Cart": ("user", users),
+             "Shopping_Cart_Products": ("product", products), "Messages": ("chat", existing.get("Chats", 0) + scale["Chats"])}
+    for name, (key, available) in needs.items():
+        if scale[name] and not available:
+            raise ValueError(f"{scale[name]} {name} rows need at least one {key}, there are none")
+    for name in PAIR_TABLES + ["Reviews"]:
+        if scale[name] and users < 2:
+            raise ValueError(f"{scale[name]} {name} rows need at least 2 users, there are {users}")
+    for name in PAIR_TABLES:
+        possible = users * (users - 1) // 2 - existing.get(name, 0)
+        if scale[name] > possible:
+            raise ValueError(f"{scale[name]} {name} rows need as many distinct user pairs, {users} users leave "
+                             f"{possible}; raise --rows or lower --scale {name}")
+    if scale["Shopping_Cart_Products"] > scale["Shopping_Cart"] * products:
+        raise ValueError(f"{scale['Shopping_Cart_Products']} Shopping_Cart_Products rows do not fit into "
+                         f"{scale['Shopping_Cart']} carts of {products} distinct products")
+    return scale
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate mru_dev seed data as CSV files.")
+    parser.add_argument("--rows", type=int, default=rowsToGenerate, help="rows per table (default: %(default)s)")
+    parser.add_argument("--scale", action="append", default=[], metavar="TABLE=ROWS",
+                        help="override the row count of a single table, may be repeated")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help="rows generated and written per chunk (default: %(default)s)")
+    parser.add_argument("--seed", type=int, help="seed for a reproducible run, output is identical for any --workers")
+    parser.add_argument("--message-distribution", choices=MESSAGE_DISTRIBUTIONS, default="zipf",
+                        help="how messages are spread over chats (default: %(default)s)")
+    parser.add_argument("--message-skew", type=float,
+                        help="zipf exponent or log-normal sigma, lower zipf / higher sigma means longer tails")
+    parser.add_argument("--popularity-skew", type=float, default=0.0,
+                        help="Zipf exponent of seller and product popularity for foreign keys, 0 is uniform "
+                             "(default: %(default)s)")
+    parser.add_argument("--history-days", type=int, default=HISTORY_DAYS,
+                        help="days of chat history, e.g. 730 for two years of semesters; messages land in the "
+                             "monthly Messages partitions of their created_at (default: %(default)s)")
+    parser.add_argument("--now", type=datetime.fromisoformat,
+                        help="ISO timestamp used for created_at, pin it together with --seed for byte-identical output")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes generating chunks in parallel (default: %(default)s)")
+    parser.add_argument("--out-dir", default=OUTPUT_DIR, help="directory for the table files (default: %(default)s)")
+    parser.add_argument("--format", choices=table_io.FORMATS, default="csv",
+                        help="csv, arrow (memory-mappable) or parquet, one file per table (default: %(default)s)")
+    parser.add_argument("--compression", default="zstd",
+                        help="parquet compression codec (default: %(default)s)")
+    parser.add_argument("--summary", action="store_true", help="print the row count and first rows of every table")
+    parser.add_argument("--validate", action="store_true",
+                        help="check the tables against the schema.sql constraints first, stop if any are violated")
+    parser.add_argument("--state", metavar="JSON",
+                        help="manifest of a dataset grown in batches: the first run creates it, later runs append "
+                             "--rows/--scale rows after the rows it records (see dataset_state.py)")
+    profiling = parser.add_argument_group("profiling", "time every generate and output stage (see generator_profile.py)")
+    profiling.add_argument("--profile", action="store_true",
+                           help="print wall and CPU time and rows/s of every stage")
+    profiling.add_argument("--profile-memory", action="store_true",
+                           help="also trace the peak memory of every stage with tracemalloc, implies --profile; "
+                                "slows the run down several times, so its timings are not comparable")
+    profiling.add_argument("--profile-out", default="generator_profile.json",
+                           help="JSON report of --profile (default: %(default)s)")
+    profiling.add_argument("--pstats", metavar="PATH",
+                           help="also write a cProfile dump of the run, implies --profile; skews its timings")
+    profiling.add_argument("--profile-compare", metavar="JSON", help="earlier report to compare rows/s against")
+    profiling.add_argument("--regression-threshold", type=float, default=0.2,
+                           help="rows/s drop flagged as a regression (default: %(default)s)")
+    loading = parser.add_argument_group("loading", "COPY the tables into Postgres instead of writing CSV files")
+    loading.add_argument("--load", metavar="DSN", help="connection string of the database to load into")
+    loading.add_argument("--from-dir", metavar="DIR",
+                         help="load the table files written to DIR by an earlier run instead of generating")
+    loading.add_argument("--init-schema", action="store_true",
+                         help="recreate mru_dev from local_schema.sql first (local databases only)")
+    loading.add_argument("--defer-indexes", action="store_true",
+                         help="drop non-constraint indexes during the load and rebuild them afterwards")
+    loading.add_argument("--disable-triggers", action="store_true",
+                         help="disable user triggers during the load, seller ratings are recounted once afterwards")
+    loading.add_argument("--skip-auth-users", action="store_true",
+                         help="do not insert auth.users rows, use when the accounts already exist")
+    args = parser.parse_args(argv)
+
+    state = dataset_state.read_state(args.state) if args.state else None
+    if args.state and args.from_dir:
+        parser.error("--state generates a batch, it cannot be used with --from-dir")
+    if state and args.init_schema:
+        parser.error(f"--init-schema would drop the rows {args.state} records, append without it")
+    if state and args.seed is not None and args.seed != state["seed"]:
+        parser.error(f"{args.state} was generated with --seed {state['seed']}, leave --seed out to append to it")
+    seed = state["seed"] if state else args.seed if args.seed is not None else np.random.SeedSequence().entropy
+    if args.summary:
+        print(f"seed: {seed}")
+    order = seed_loader.LOAD_ORDER if args.load else TABLE_NAMES
+    profiler = generator_profile.Profiler(args.profile or args.profile_memory or bool(args.pstats), args.pstats,
+                                          memory=args.profile_memory)
+    profiler.start()
+    pool = None
+    try:
+        if args.from_dir:
+            if not args.load:
+                parser.error("--from-dir needs --load")
+            try:
+                for name in order:
+                    table_io.find_table(args.from_dir, name)
+            except ValueError as error:
+                parser.error(str(error))
+            build = lambda tables: table_io.read_tables(args.from_dir, tables, args.chunk_size)
+        else:
+            try:
+                scale = parse_scale(args.rows, args.scale, state)
+            except ValueError as error:
+                parser.error(str(error))
+            with profiler.stage("keys"):
+                keys = generate_keys(seed, scale, args.now, (args.message_distribution, args.message_skew),
+                                     args.popularity_skew, args.history_days, state)
+            pool = create_pool(args.workers, keys, seed) if args.workers > 1 else None
+            build = lambda tables: generate_tables(keys, seed, args.chunk_size, tables, pool, args.workers)
+        if args.validate:
+            # a separate pass in foreign key order, the chunks are rebuilt (identically) for the output below
+            with profiler.stage("validate"):
+                violations = validate_tables.validate_tables(
+                    build(seed_loader.LOAD_ORDER), existing=existing_rows(keys, args.chunk_size) if state else None)
+            validate_tables.print_violations(violations)
+            if violations:
+                raise SystemExit(1)
+        Tables.update({name: profiler.chunks(name, chunks) for name, chunks in build(order).items()})
+        if args.load:
+            with seed_loader.connect(args.load) as conn:
+                if args.init_schema:
+                    seed_loader.init_schema(conn)
+                # one stage for the whole load, index rebuilds and recounts included
+                with profiler.stage("load") as stage:
+                    stats = seed_loader.load_tables(conn, Tables, defer_indexes=args.defer_indexes,
+                                                    disable_triggers=args.disable_triggers,
+                                                    with_auth_users=not args.skip_auth_users)
+                    stage["rows"] = sum(rows for rows, _ in stats.values())
+            seed_loader.print_stats(stats)
+            added = {name: stats[name][0] for name in order}
+        else:
+            os.makedirs(args.out_dir, exist_ok=True)
+            added = {}
+            for name in order:
+                with profiler.stage(f"write {args.format}", name) as stage:
+                    rows, head = table_io.write_table(args.out_dir, name, Tables[name], args.format,
+                                                      args.compression)
+                    stage["rows"] = added[name] = rows
+                if args.summary:
+                    print(f"\n{name}: {rows} rows")
+                    if head is not None:
+                        print(head.to_string(index=False))
+        if args.state:
+            grown = dataset_state.grown(state, seed, keys, added)
+            dataset_state.write_state(args.state, grown)
+            print(f"batch {keys['batch']} added to {args.state}, which now has "
+                  f"{grown['rows']['User_Information']:,} users and {grown['rows']['Messages']:,} messages")
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        profiler.stop()
+    if profiler.enabled:
+        report = profiler.report(argv=argv, seed=seed, rows=args.rows, scale=args.scale, chunk_size=args.chunk_size,
+                                 workers=args.workers, format=None if args.load else args.format)
+        generator_profile.print_report(report)
+        if args.pstats:
+            generator_profile.print_pstats(args.pstats)
+        generator_profile.write_report(args.profile_out, report)
+        print(f"wrote {args.profile_out}")
+        if args.profile_compare:
+            with open(args.profile_compare, encoding="utf-8") as f:
+                if generator_profile.compare(json.load(f), report, args.regression_threshold):
+                    raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+Stage timings of generate_temp_users.py runs: wall and CPU time, rows per second and peak memory.
+
+Tables are generated lazily, chunk by chunk, while the output stage consumes them, so one table's
+generation and writing interleave. Profiler.chunks() wraps a table's chunk iterator and books the time
+spent building chunks to the table's "generate" stage, and the stage around the writer gets the rest.
+With --workers the chunks are built in other processes: "generate" is then the time the writer waited
+for them, and their CPU time and memory are not seen.
+
+Peak memory (--profile-memory) is traced with tracemalloc, which sees NumPy and pandas buffers too, and
+is the growth over the memory in use when the stage started. tracemalloc hooks every allocation: a 1M
+message run takes about 9x as long with it on, so its timings say little about an untraced run.
+cProfile (--pstats) hooks every Python call, which costs less in this NumPy code but still skews the
+stages that loop in Python. --profile alone traces neither, and a report records what was traced.
+
+A report is JSON, and can be compared with the report of an earlier version to flag stages whose rows
+per second dropped. Compare reports taken with the same tracing only.
+
+Usage:
+    python generate_temp_users.py --rows 100000 --seed 1 --profile
+    python generate_temp_users.py --rows 100000 --seed 1 --profile --profile-out new.json --profile-compare old.json
+    python generate_temp_users.py --rows 100000 --seed 1 --profile-memory
+    python generate_temp_users.py --rows 100000 --seed 1 --pstats generator.pstats
+"""
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import cProfile
+import io
+import json
+import os
+import platform
+import pstats
+import subprocess
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+
+class Profiler:
+    """Collects one record per (stage, table). Does nothing when not `enabled`, traces memory with `memory`."""
+
+    def __init__(self, enabled=True, pstats_path=None, memory=False):
+        self.enabled = enabled
+        self.memory = enabled and memory
+        self.records = {}
+        self.open = []
+        self.peak = 0
+        self.started = None
+        self.cpu_started = None
+        self.python_profile = cProfile.Profile() if enabled and pstats_path else None
+        self.pstats_path = pstats_path
+
+    def start(self):
+        if not self.enabled:
+            return
+        if self.memory:
+            tracemalloc.start()
+        self.started, self.cpu_started = time.perf_counter(), time.process_time()
+        if self.python_profile:
+            self.python_profile.enable()
+
+    def stop(self):
+        if not self.enabled:
+            return
+        if self.python_profile:
+            self.python_profile.disable()
+            self.python_profile.dump_stats(self.pstats_path)
+        self.wall = time.perf_counter() - self.started
+        self.cpu = time.process_time() - self.cpu_started
+        if self.memory:
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+    def record(self, stage, table):
+        return self.records.setdefault((stage, table), {"stage": stage, "table": table, "wall_s": 0.0,
+                                                        "cpu_s": 0.0, "rows": 0, "peak_bytes": 0})
+
+    def reset_peak(self):
+        # tracemalloc keeps one peak, so it is handed to every open measurement before it is reset
+        if not self.memory:
+            return
+        peak = tracemalloc.get_traced_memory()[1]
+        self.peak = max(self.peak, peak)
+        for measurement in self.open:
+            measurement["peak"] = max(measurement["peak"], peak)
+        tracemalloc.reset_peak()
+
+    def begin(self):
+        measurement = {"wall": time.perf_counter(), "cpu": time.process_time(),
+                       "base": tracemalloc.get_traced_memory()[0] if self.memory else 0, "peak": 0, "inner_wall": 0.0, "inner_cpu": 0.0}
+        self.reset_peak()
+        self.open.append(measurement)
+        return measurement
+
+    def end(self, measurement, record, rows):
+        self.reset_peak()
+        self.open.pop()
+        wall = time.perf_counter() - measurement["wall"]
+        cpu = time.process_time() - measurement["cpu"]
+        # what nested measurements booked to their own stage is not this stage's time
+        record["wall_s"] += wall - measurement["inner_wall"]
+        record["cpu_s"] += cpu - measurement["inner_cpu"]
+        record["rows"] += rows
+        record["peak_bytes"] = max(record["peak_bytes"], measurement["peak"] - measurement["base"])
+        for outer in self.open:
+            outer["inner_wall"] += wall - measurement["inner_wall"]
+            outer["inner_cpu"] += cpu - measurement["inner_cpu"]
+
+    @contextmanager
+    def stage(self, stage, table=None):
+        """Measures the block, set `rows` on the yielded dict to count its rows."""
+        counted = {"rows": 0}
+        if not self.enabled:
+            yield counted
+            return
+        measurement = self.begin()
+        try:
+            yield counted
+        finally:
+            self.end(measurement, self.record(stage, table), counted["rows"])
+
+    def chunks(self, table, chunks, stage="generate"):
+        """`chunks` with the time and memory of building every chunk booked to (stage, table)."""
+        if not self.enabled:
+            return chunks
+        return self.measured_chunks(table, iter(chunks), stage)
+
+    def measured_chunks(self, table, chunks, stage):
+        record = self.record(stage, table)
+        while True:
+            measurement = self.begin()
+            chunk = next(chunks, None)
+            self.end(measurement, record, 0 if chunk is None else len(chunk))
+            if chunk is None:
+                return
+            yield chunk
+
+    def report(self, **run):
+        stages = []
+        for record in self.records.values():
+            stages.append(dict(record, rows_per_s=record["rows"] / record["wall_s"] if record["rows"] and
+                               record["wall_s"] > 0 else None,
+                               peak_bytes=record["peak_bytes"] if self.memory else None))
+        return {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "version": git_version(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            **run,
+            "wall_s": self.wall,
+            "cpu_s": self.cpu,
+            "peak_bytes": self.peak if self.memory else None,
+            "traced": {"memory": self.memory, "python": self.python_profile is not None},
+            "stages": stages,
+        }
+
+
+def git_version():
+    """Commit of the generator's checkout, with -dirty for uncommitted changes, or None outside git."""
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def mebibytes(peak_bytes):
+    return f"{peak_bytes / 2**20:>9.1f}" if peak_bytes is not None else f"{'':>9}"
+
+
+def print_report(report):
+    print(f"\n{'stage':<10} {'table':<28} {'rows':>12} {'wall s':>9} {'cpu s':>9} {'rows/s':>12} {'peak MiB':>9}")
+    for record in report["stages"]:
+        rate = f"{record['rows_per_s']:>12,.0f}" if record["rows_per_s"] else f"{'':>12}"
+        print(f"{record['stage']:<10} {record['table'] or '':<28} {record['rows']:>12,} {record['wall_s']:>9.2f} "
+              f"{record['cpu_s']:>9.2f} {rate} {mebibytes(record['peak_bytes'])}")
+    print(f"{'total':<10} {'':<28} {'':>12} {report['wall_s']:>9.2f} {report['cpu_s']:>9.2f} {'':>12} "
+          f"{mebibytes(report['peak_bytes'])}")
+
+
+def print_pstats(path, limit=15):
+    """The functions with the most own time in a cProfile dump."""
+    out = io.StringIO()
+    pstats.Stats(path, stream=out).sort_stats("tottime").print_stats(limit)
+    print(out.getvalue())
+
+
+def write_report(path, report):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, default=str)
+
+
+def compare(previous, current, threshold):
+    """Prints the rows/s change of every stage found in both reports and returns the number of regressions."""
+    earlier = {(record["stage"], record["table"]): record for record in previous["stages"]}
+    regressions = 0
+    print(f"\n== compared with {previous.get('version') or 'previous run'} ==")
+    if previous["traced"] != current["traced"]:
+        print(f"not compared: traced {previous['traced']} before and {current['traced']} now, "
+              "rows/s are not comparable")
+        return 0
+    for record in current["stages"]:
+        before = earlier.get((record["stage"], record["table"]))
+        if not before or not before.get("rows_per_s") or not record["rows_per_s"]:
+            continue
+        change = record["rows_per_s"] / before["rows_per_s"] - 1
+        flag = "REGRESSION" if change < -threshold else ""
+        regressions += bool(flag)
+        print(f"{record['stage']:<10} {record['table'] or '':<28} rows/s {change:>+7.1%} {flag}")
+    return regressions
@@ -5,8 +5,14 @@ CREATE INDEX chats_user_id_2_index ON mru_dev."Chats" USING btree (user_id_2);
 
 CREATE INDEX messages_chat_id_index ON mru_dev."Messages" USING btree (chat_id);
 CREATE INDEX messages_sender_id_index ON mru_dev."Messages" USING btree (sender_id);
+CREATE INDEX messages_chat_id_created_at_index ON mru_dev."Messages" USING btree (chat_id, created_at DESC, id DESC);
+
+CREATE INDEX chat_inbox_user_id_last_message_at_index ON mru_dev."Chat_Inbox" USING btree (user_id, last_message_at DESC NULLS LAST);
 
 CREATE INDEX product_information_user_id_index ON mru_dev."Product_Information" USING btree (user_id);
+CREATE INDEX product_information_listed_created_at_index ON mru_dev."Product_Information" USING btree (created_at DESC, id DESC) WHERE "isListed" AND NOT "isDeleted";
+CREATE INDEX product_search_search_vector_index ON mru_dev."Product_Search" USING gin (search_vector);
+-- product_information_title_trgm_index needs pg_trgm, see product_search.sql
 
 CREATE INDEX reports_created_by_id_index ON mru_dev."Reports" USING btree (created_by_id);
 CREATE INDEX reports_created_on_id_index ON mru_dev."Reports" USING btree (created_on_id);
@@ -0,0 +1,85 @@
+"""
+Compact store of the primary keys generated for each table, and the foreign key sampler built on it.
+
+UUID keys are kept as one (rows, 16) uint8 array and integer ids as int64 arrays, so ten million users
+cost 160 MB instead of ten million Python strings. Child tables draw row positions in vectorized batches
+and only turn the rows of the current chunk into strings. Draws are uniform by default. A table can be
+given Zipf-like popularity instead, so a few sellers or products receive most of the references.
+"""
+import uuid
+
+import numpy as np
+
+UUID_BYTES = 16
+# byte ranges of the five dash separated groups of a formatted UUID
+UUID_GROUPS = ((slice(0, 8), slice(0, 8)), (slice(9, 13), slice(8, 12)), (slice(14, 18), slice(12, 16)),
+               (slice(19, 23), slice(16, 20)), (slice(24, 36), slice(20, 32)))
+
+
+def pack_uuids(strings):
+    """Packs UUID strings into a (rows, 16) uint8 array."""
+    packed = b"".join(uuid.UUID(value).bytes for value in strings)
+    return np.frombuffer(packed, dtype=np.uint8).reshape(-1, UUID_BYTES).copy()
+
+
+def random_uuids(rng, rows):
+    """`rows` random version 4 UUIDs as a (rows, 16) uint8 array."""
+    # uuid4 layout: version nibble 4, variant bits 10
+    raw = rng.integers(0, 256, size=(rows, UUID_BYTES), dtype=np.uint8)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    return raw
+
+
+def format_uuids(packed):
+    """Formats a (rows, 16) uint8 array as an array of canonical UUID strings."""
+    rows = len(packed)
+    hex_chars = np.frombuffer(np.ascontiguousarray(packed).tobytes().hex().encode(), dtype="S1").reshape(rows, 32)
+    dashed = np.full((rows, 36), b"-", dtype="S1")
+    for dst, src in UUID_GROUPS:
+        dashed[:, dst] = hex_chars[:, src]
+    return dashed.view("S36").ravel().astype(str)
+
+
+class KeyRegistry:
+    """Primary keys of the generated tables, with uniform or popularity weighted foreign key draws."""
+
+    def __init__(self):
+        self.packed_uuids = {}
+        self.ids = {}
+        self.cumulative = {}
+
+    def add_uuids(self, table, packed):
+        self.packed_uuids[table] = packed
+
+    def add_ids(self, table, ids):
+        self.ids[table] = np.asarray(ids, dtype=np.int64)
+
+    def count(self, table):
+        keys = self.packed_uuids.get(table)
+        return len(keys) if keys is not None else len(self.ids[table])
+
+    def set_popularity(self, table, rng, skew):
+        """Weights row r of `table` by 1 / rank^skew, with ranks shuffled so popularity is not tied to position.
+
+        A skew of 0 (or less) goes back to uniform draws.
+        """
+        if skew <= 0:
+            self.cumulative.pop(table, None)
+            return
+        ranks = rng.permutation(self.count(table)) + 1
+        self.cumulative[table] = np.cumsum(ranks.astype(np.float64) ** -skew)
+
+    def sample(self, table, rng, size):
+        """Row positions of `size` random keys of `table`, a binary search per draw when it has popularity."""
+        cumulative = self.cumulative.get(table)
+        if cumulative is None:
+            return rng.integers(0, self.count(table), size=size)
+        return np.searchsorted(cumulative, rng.random(size) * cumulative[-1], side="right")
+
+    def uuid_strings(self, table, rows):
+        """UUID strings of the given row positions (a slice or an index array) of `table`."""
+        return format_uuids(self.packed_uuids[table][rows])
+
+    def id_values(self, table, rows):
+        return self.ids[table][rows]
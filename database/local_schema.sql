@@ -0,0 +1,788 @@
+-- Runnable stand-in for the Supabase database, used to test seed loads and benchmarks against a
+-- plain local Postgres container. The mru_dev tables mirror schema.sql and index's.sql, ordered so
+-- that every foreign key target exists before it is referenced.
+-- WARNING: drops and recreates the mru_dev schema and auth.users.
+
+------------------------------------------------------------------------------------------------------------------
+-- Supabase auth stand-in
+------------------------------------------------------------------------------------------------------------------
+DO $$
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'anon') THEN
+    CREATE ROLE anon NOLOGIN;
+  END IF;
+  IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'authenticated') THEN
+    CREATE ROLE authenticated NOLOGIN;
+  END IF;
+  IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'service_role') THEN
+    CREATE ROLE service_role NOLOGIN BYPASSRLS;
+  END IF;
+END $$;
+
+CREATE SCHEMA IF NOT EXISTS auth;
+
+DROP TABLE IF EXISTS auth.users CASCADE;
+CREATE TABLE auth.users (
+  id uuid NOT NULL,
+  aud character varying(255) null,
+  role character varying(255) null,
+  email character varying(255) null,
+  created_at timestamp with time zone null DEFAULT now(),
+  CONSTRAINT users_pkey PRIMARY KEY (id)
+);
+
+-- same claim lookup as Supabase: SET request.jwt.claim.sub or request.jwt.claims to act as a user
+CREATE OR REPLACE FUNCTION auth.uid()
+RETURNS uuid
+LANGUAGE sql STABLE
+AS $$
+SELECT coalesce(
+  nullif(current_setting('request.jwt.claim.sub', true), ''),
+  (nullif(current_setting('request.jwt.claims', true), '')::jsonb ->> 'sub')
+)::uuid
+$$;
+
+CREATE OR REPLACE FUNCTION auth.jwt()
+RETURNS jsonb
+LANGUAGE sql STABLE
+AS $$
+SELECT coalesce(nullif(current_setting('request.jwt.claims', true), ''), '{}')::jsonb
+$$;
+
+GRANT USAGE ON SCHEMA auth TO anon, authenticated, service_role;
+
+------------------------------------------------------------------------------------------------------------------
+-- mru_dev tables
+------------------------------------------------------------------------------------------------------------------
+DROP SCHEMA IF EXISTS mru_dev CASCADE;
+CREATE SCHEMA mru_dev;
+CREATE SCHEMA IF NOT EXISTS rls_policy_wrappers;
+
+CREATE TABLE mru_dev."User_Information" (
+  id bigint GENERATED BY DEFAULT AS IDENTITY NOT NULL,
+  first_name character varying null,
+  last_name character varying null,
+  email character varying null,
+  created_at timestamp with time zone NOT NULL DEFAULT now(),
+  deleted_on date null,
+  is_deleted boolean null DEFAULT false,
+  is_flagged boolean null DEFAULT false,
+  flagged_type character varying null,
+  user_name character varying null,
+  supabase_id uuid NOT NULL DEFAULT auth.uid (),
+  rating real null,
+  rating_sum double precision NOT NULL DEFAULT 0,
+  rating_count bigint NOT NULL DEFAULT 0,
+  profile_image json null,
+  CONSTRAINT User_Information_pkey PRIMARY KEY (id),
+  CONSTRAINT User_Information_supabase_id_key unique (supabase_id),
+  CONSTRAINT user_information_email_key unique (email),
+  CONSTRAINT User_Information_supabase_id_fkey FOREIGN KEY (supabase_id) REFERENCES auth.users (id) ON UPDATE CASCADE ON DELETE CASCADE
+);
+
+CREATE TABLE mru_dev."Category_Tags" (
+  id bigint GENERATED BY DEFAULT AS IDENTITY NOT NULL,
+  name character varying null,
+  description character varying null,
+  created_at timestamp with time zone NOT NULL DEFAULT now(),
+  CONSTRAINT Catagory_Tags_pkey PRIMARY KEY (id)
+);
+
+CREATE TABLE mru_dev."Product_Information" (
+  id bigint GENERATED BY DEFAULT AS IDENTITY NOT NULL,
+  created_at timestamp with time zone NOT NULL DEFAULT now(),
+  title character varying null,
+  description character varying null,
+  image jsonb null,
+  price double precision null,
+  stock_count bigint null,
+  user_id uuid null,
+  "isListed" boolean null DEFAULT false,
+  "isDeleted" boolean null DEFAULT false,
+  CONSTRAINT Product_Information_pkey PRIMARY KEY (id),
+  CONSTRAINT Product_Information_user_id_fkey FOREIGN KEY (user_id) REFERENCES mru_dev."User_Information" (supabase_id) ON UPDATE CASCADE ON DELETE SET NULL
+);
+
+-- full text search document of every listed product, maintained by the Product_Information trigger (see product_search.sql)
+CREATE TABLE mru_dev."Product_Search" (
+  product_id bigint NOT NULL,
+  search_vector tsvector NOT NULL,
+  CONSTRAINT Product_Search_pkey PRIMARY KEY (product_id),
+  CONSTRAINT Product_Search_product_id_fkey FOREIGN KEY (product_id) REFERENCES mru_dev."Product_Information" (id) ON UPDATE CASCADE ON DELETE CASCADE
+);
+
+-- read through search_products(), see the Product_Search policy in rls_policies.sql
+ALTER TABLE mru_dev."Product_Search" ENABLE ROW LEVEL SECURITY;
+
+CREATE TABLE mru_dev."Shopping_Cart" (
+  id bigint GENERATED BY DEFAULT AS IDENTITY NOT NULL,
+  created_at timestamp with time zone NOT NULL DEFAULT now(),
+  user_id uuid null,
+  CONSTRAINT Shopping_Cart_pkey PRIMARY KEY (id),
+  CONSTRAINT Shopping_Cart_user_id_fkey FOREIGN KEY (user_id) REFERENCES mru_dev."User_Information" (supabase_id) ON UPDATE CASCADE ON DELETE CASCADE
+);
+
+CREATE TABLE mru_dev."Shopping_Cart_Products" (
+  created_at timestamp with time zone NOT NULL DEFAULT now(),
+  shopping_cart_id bigint NOT NULL,
+  product_id bigint NOT NULL,
+  CONSTRAINT Shopping_Cart_Products_pkey PRIMARY KEY (shopping_cart_id, product_id),
+  CONSTRAINT Shopping_Cart_Products_shopping_cart_id_fkey FOREIGN KEY (shopping_cart_id) REFERENCES mru_dev."Shopping_Cart" (id) ON UPDATE CASCADE ON DELETE CASCADE,
+  CONSTRAINT Shopping_Cart_Products_product_id_fkey FOREIGN KEY (product_id) REFERENCES mru_dev."Product_Information" (id) ON UPDATE CASCADE ON DELETE CASCADE
+);
+
+CREATE TABLE mru_dev."Chats" (
+  id bigint GENERATED BY DEFAULT AS IDENTITY NOT NULL,
+  created_at timestamp with time zone NOT NULL DEFAULT now(),
+  user_id_1 uuid null DEFAULT auth.uid (),
+  user_id_2 uuid null,
+  visible boolean null DEFAULT true,
+  CONSTRAINT Chats_pkey PRIMARY KEY (id),
+  CONSTRAINT Chats_user_id_1_fkey FOREIGN KEY (user_id_1) REFERENCES mru_dev."User_Information" (supabase_id) ON UPDATE CASCADE ON DELETE SET NULL,
+  CONSTRAINT Chats_user_id_2_fkey FOREIGN KEY (user_id_2) REFERENCES mru_dev."User_Information" (supabase_id) ON UPDATE CASCADE ON DELETE SET NULL
+);
+
+CREATE TABLE mru_dev."Messages" (
+  id bigint GENERATED BY DEFAULT AS IDENTITY NOT NULL,
+  chat_id bigint null,
+  logged_message character varying null,
+  created_at timestamp with time zone NOT NULL DEFAULT now(),
+  sender_id uuid null,
+  visible boolean null,
+  CONSTRAINT Messages_pkey PRIMARY KEY (id, created_at),
+  CONSTRAINT Messages_chat_id_fkey FOREIGN KEY (chat_id) REFERENCES mru_dev."Chats" (id) ON UPDATE CASCADE ON DELETE SET NULL,
+  CONSTRAINT Messages_sender_id_fkey FOREIGN KEY (sender_id) REFERENCES mru_dev."User_Information" (supabase_id) ON DELETE SET NULL
+) PARTITION BY RANGE (created_at);
+
+-- monthly partitions are added by mru_dev.create_message_partitions(), anything outside them lands here
+CREATE TABLE mru_dev."Messages_default" PARTITION OF mru_dev."Messages" DEFAULT;
+
+-- one row per chat and participant, maintained by the Messages triggers (see updaters.sql)
+CREATE TABLE mru_dev."Chat_Inbox" (
+  chat_id bigint NOT NULL,
+  user_id uuid NOT NULL,
+  other_user_id uuid null,
+  last_message_id bigint null,
+  last_message character varying null,
+  last_message_at timestamp with time zone null,
+  unread_count bigint NOT NULL DEFAULT 0,
+  last_read_at timestamp with time zone NOT NULL DEFAULT '-infinity',
+  CONSTRAINT Chat_Inbox_pkey PRIMARY KEY (user_id, chat_id),
+  CONSTRAINT Chat_Inbox_chat_id_fkey FOREIGN KEY (chat_id) REFERENCES mru_dev."Chats" (id) ON UPDATE CASCADE ON DELETE CASCADE,
+  CONSTRAINT Chat_Inbox_user_id_fkey FOREIGN KEY (user_id) REFERENCES mru_dev."User_Information" (supabase_id) ON UPDATE CASCADE ON DELETE CASCADE,
+  CONSTRAINT Chat_Inbox_other_user_id_fkey FOREIGN KEY (other_user_id) REFERENCES mru_dev."User_Information" (supabase_id) ON UPDATE CASCADE ON DELETE SET NULL
+);
+
+-- only read through the "users can read their inbox" policy (see rls_policies.sql)
+ALTER TABLE mru_dev."Chat_Inbox" ENABLE ROW LEVEL SECURITY;
+
+CREATE TABLE mru_dev."Category_Assigned_Products" (
+  category_id bigint GENERATED BY DEFAULT AS IDENTITY NOT NULL,
+  product_id bigint NOT NULL,
+  created_at timestamp with time zone NOT NULL DEFAULT now(),
+  CONSTRAINT Catagory_Assigned_Products_pkey PRIMARY KEY (category_id, product_id),
+  CONSTRAINT Catagory_Assigned_Products_category_id_fkey FOREIGN KEY (category_id) REFERENCES mru_dev."Category_Tags" (id) ON UPDATE CASCADE ON DELETE SET NULL,
+  CONSTRAINT Catagory_Assigned_Products_product_id_fkey FOREIGN KEY (product_id) REFERENCES mru_dev."Product_Information" (id) ON UPDATE CASCADE ON DELETE SET NULL
+);
+
+CREATE TABLE mru_dev."Reports" (
+  id bigint GENERATED BY DEFAULT AS IDENTITY NOT NULL,
+  created_at timestamp with time zone NOT NULL DEFAULT now(),
+  closed_date date null,
+  is_closed boolean null DEFAULT false,
+  linked_information character varying null,
+  created_by_id uuid null DEFAULT auth.uid (),
+  created_on_id uuid null,
+  description character varying null,
+  CONSTRAINT Reports_pkey PRIMARY KEY (id),
+  CONSTRAINT Reports_created_by_id_fkey FOREIGN KEY (created_by_id) REFERENCES mru_dev."User_Information" (supabase_id) ON UPDATE CASCADE ON DELETE SET NULL,
+  CONSTRAINT Reports_created_on_id_fkey FOREIGN KEY (created_on_id) REFERENCES mru_dev."User_Information" (supabase_id) ON UPDATE CASCADE ON DELETE SET NULL
+);
+
+CREATE TABLE mru_dev."Reviews" (
+  id bigint GENERATED BY DEFAULT AS IDENTITY NOT NULL,
+  created_at timestamp with time zone NOT NULL DEFAULT now(),
+  product_id bigint null,
+  rating real null,
+  description character varying null,
+  created_by_id uuid null DEFAULT auth.uid (),
+  created_on_id uuid null,
+  CONSTRAINT Reviews_pkey PRIMARY KEY (id),
+  CONSTRAINT Reviews_created_by_id_fkey FOREIGN KEY (created_by_id) REFERENCES mru_dev."User_Information" (supabase_id) ON UPDATE CASCADE ON DELETE SET NULL,
+  CONSTRAINT Reviews_created_on_id_fkey FOREIGN KEY (created_on_id) REFERENCES mru_dev."User_Information" (supabase_id) ON UPDATE CASCADE ON DELETE SET NULL,
+  CONSTRAINT Reviews_product_id_fkey FOREIGN KEY (product_id) REFERENCES mru_dev."Product_Information" (id) ON UPDATE CASCADE ON DELETE SET NULL
+);
+
+CREATE TABLE mru_dev."User_Interactions" (
+  id bigint GENERATED BY DEFAULT AS IDENTITY NOT NULL,
+  created_at timestamp with time zone NOT NULL DEFAULT now(),
+  user_id_1 uuid null DEFAULT auth.uid (),
+  user_id_2 uuid null,
+  user_1_is_blocked boolean null DEFAULT false,
+  user_1_is_muted boolean null DEFAULT false,
+  user_2_is_blocked boolean null DEFAULT false,
+  user_2_is_muted boolean null DEFAULT false,
+  CONSTRAINT Blocked_Users_pkey PRIMARY KEY (id),
+  CONSTRAINT unique_user_pair unique (user_id_1, user_id_2),
+  CONSTRAINT User_Interactions_user_id_1_fkey FOREIGN KEY (user_id_1) REFERENCES mru_dev."User_Information" (supabase_id) ON UPDATE CASCADE ON DELETE SET NULL,
+  CONSTRAINT User_Interactions_user_id_2_fkey FOREIGN KEY (user_id_2) REFERENCES mru_dev."User_Information" (supabase_id) ON UPDATE CASCADE ON DELETE SET NULL
+);
+
+------------------------------------------------------------------------------------------------------------------
+-- Indexes (see index's.sql)
+------------------------------------------------------------------------------------------------------------------
+CREATE INDEX category_assigned_products_product_id_index ON mru_dev."Category_Assigned_Products" USING btree (product_id);
+
+CREATE INDEX chats_user_id_1_index ON mru_dev."Chats" USING btree (user_id_1);
+CREATE INDEX chats_user_id_2_index ON mru_dev."Chats" USING btree (user_id_2);
+
+CREATE INDEX messages_chat_id_index ON mru_dev."Messages" USING btree (chat_id);
+CREATE INDEX messages_sender_id_index ON mru_dev."Messages" USING btree (sender_id);
+CREATE INDEX messages_chat_id_created_at_index ON mru_dev."Messages" USING btree (chat_id, created_at DESC, id DESC);
+
+CREATE INDEX chat_inbox_user_id_last_message_at_index ON mru_dev."Chat_Inbox" USING btree (user_id, last_message_at DESC NULLS LAST);
+
+CREATE INDEX product_information_user_id_index ON mru_dev."Product_Information" USING btree (user_id);
+CREATE INDEX product_information_listed_created_at_index ON mru_dev."Product_Information" USING btree (created_at DESC, id DESC) WHERE "isListed" AND NOT "isDeleted";
+CREATE INDEX product_search_search_vector_index ON mru_dev."Product_Search" USING gin (search_vector);
+
+CREATE INDEX shopping_cart_user_id_index ON mru_dev."Shopping_Cart" USING btree (user_id);
+CREATE INDEX shopping_cart_products_product_id_index ON mru_dev."Shopping_Cart_Products" USING btree (product_id);
+
+CREATE INDEX reports_created_by_id_index ON mru_dev."Reports" USING btree (created_by_id);
+CREATE INDEX reports_created_on_id_index ON mru_dev."Reports" USING btree (created_on_id);
+
+CREATE INDEX reviews_created_by_id_index ON mru_dev."Reviews" USING btree (created_by_id);
+CREATE INDEX reviews_created_on_id_index ON mru_dev."Reviews" USING btree (created_on_id);
+CREATE INDEX reviews_product_id_index ON mru_dev."Reviews" USING btree (product_id);
+
+CREATE INDEX user_interactions_user_id_2_index ON mru_dev."User_Interactions" USING btree (user_id_2);
+
+------------------------------------------------------------------------------------------------------------------
+-- Partitions (see partition_messages.sql)
+------------------------------------------------------------------------------------------------------------------
+-- monthly partitions of Messages (UTC months) covering [from_date, to_date). Rows that already landed in
+-- the default partition for a new month are moved into it, so this can run at any time: daily ahead of
+-- the calendar (pg_cron below), or before a bulk load with the range of the loaded rows. At most
+-- 120 months per call. Not callable by clients, see the REVOKE below.
+CREATE OR REPLACE FUNCTION mru_dev.create_message_partitions(
+  from_date timestamp with time zone DEFAULT now(),
+  to_date timestamp with time zone DEFAULT now() + interval '3 months')
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = mru_dev
+AS $$
+DECLARE
+  month_start timestamp := date_trunc('month', from_date AT TIME ZONE 'UTC');
+  lower_bound timestamp with time zone;
+  upper_bound timestamp with time zone;
+  partition_name text;
+  moved_chats bigint[];
+  created integer := 0;
+BEGIN
+  IF to_date > from_date + interval '120 months' THEN
+    RAISE EXCEPTION 'create_message_partitions covers at most 120 months per call, got % to %', from_date, to_date;
+  END IF;
+  WHILE (month_start AT TIME ZONE 'UTC') < to_date LOOP
+    lower_bound := month_start AT TIME ZONE 'UTC';
+    upper_bound := (month_start + interval '1 month') AT TIME ZONE 'UTC';
+    partition_name := 'Messages_' || to_char(month_start, 'YYYY_MM');
+    IF to_regclass(format('mru_dev.%I', partition_name)) IS NULL THEN
+      EXECUTE format('CREATE TABLE mru_dev.%I (LIKE mru_dev."Messages" INCLUDING DEFAULTS)', partition_name);
+      -- the Messages policies do not apply to a partition read by name, clients go through Messages
+      EXECUTE format('REVOKE ALL ON mru_dev.%I FROM PUBLIC, anon, authenticated', partition_name);
+      EXECUTE format('WITH moved AS (DELETE FROM mru_dev."Messages_default" WHERE created_at >= %L AND created_at < %L '
+                     'RETURNING *), copied AS (INSERT INTO mru_dev.%I SELECT * FROM moved RETURNING chat_id) '
+                     'SELECT array_agg(DISTINCT chat_id) FILTER (WHERE chat_id IS NOT NULL) FROM copied',
+                     lower_bound, upper_bound, partition_name) INTO moved_chats;
+      EXECUTE format('ALTER TABLE mru_dev."Messages" ATTACH PARTITION mru_dev.%I FOR VALUES FROM (%L) TO (%L)',
+                     partition_name, lower_bound, upper_bound);
+      -- the DELETE fired on_message_change on the default partition, the INSERT into the detached table did
+      -- not, so the inbox rows of the moved chats are rebuilt
+      IF moved_chats IS NOT NULL AND to_regproc('mru_dev.recompute_chat_inbox') IS NOT NULL THEN
+        PERFORM mru_dev.recompute_chat_inbox(moved_chats);
+      END IF;
+      created := created + 1;
+    END IF;
+    month_start := month_start + interval '1 month';
+  END LOOP;
+  RETURN created;
+END;
+$$;
+
+-- SECURITY DEFINER and DDL: only the owner (seed_loader.py, pg_cron) creates partitions
+REVOKE EXECUTE ON FUNCTION mru_dev.create_message_partitions(timestamp with time zone, timestamp with time zone)
+FROM PUBLIC, anon, authenticated;
+
+SELECT mru_dev.create_message_partitions();
+
+------------------------------------------------------------------------------------------------------------------
+-- Search (see product_search.sql)
+------------------------------------------------------------------------------------------------------------------
+-- title words weigh more than description words in the ranking
+CREATE OR REPLACE FUNCTION mru_dev.product_search_vector(title text, description text)
+RETURNS tsvector
+LANGUAGE sql
+IMMUTABLE
+AS $$
+  SELECT setweight(to_tsvector('english', coalesce(title, '')), 'A')
+      || setweight(to_tsvector('english', coalesce(description, '')), 'B')
+$$;
+
+-- every word of the search as a prefix, so a half typed word already matches: "organic chem" finds
+-- "Organic Chemistry Textbook". NULL when the search has no words.
+CREATE OR REPLACE FUNCTION mru_dev.product_search_query(search text)
+RETURNS tsquery
+LANGUAGE sql
+IMMUTABLE
+AS $$
+  SELECT to_tsquery('english', string_agg(word || ':*', ' & '))
+  FROM regexp_split_to_table(lower(coalesce(search, '')), '[^[:alnum:]]+') word
+  WHERE word <> ''
+$$;
+
+-- full rebuild, run once after creating the table and after loads that bypass the triggers
+CREATE OR REPLACE FUNCTION mru_dev.recompute_product_search()
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = mru_dev
+AS $$
+BEGIN
+  delete from mru_dev."Product_Search";
+  insert into mru_dev."Product_Search" (product_id, search_vector)
+  SELECT id, mru_dev.product_search_vector(title, description)
+  FROM mru_dev."Product_Information"
+  WHERE "isListed" AND NOT "isDeleted";
+END;
+$$;
+
+-- a full rebuild: only the owner runs it (seed_loader.py), not clients through the RPC endpoint
+REVOKE EXECUTE ON FUNCTION mru_dev.recompute_product_search() FROM PUBLIC, anon, authenticated;
+
+CREATE OR REPLACE FUNCTION mru_dev.update_product_search()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = mru_dev
+AS $$
+BEGIN
+  IF new."isListed" AND NOT new."isDeleted" THEN
+    insert into mru_dev."Product_Search" (product_id, search_vector)
+    VALUES (new.id, mru_dev.product_search_vector(new.title, new.description))
+    ON CONFLICT (product_id) DO UPDATE SET search_vector = excluded.search_vector;
+  ELSE
+    delete from mru_dev."Product_Search" WHERE product_id = new.id;
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+-- called by the ProductSearchPage. Listed products matching every word of `search`, best ranked first
+-- and newest first among equals, optionally only those tagged with one of `category_ids`. When no
+-- product matches the words and pg_trgm is installed, titles similar to the search are returned
+-- instead, which catches typos. Runs as the caller, so the Product_Search and Product_Information
+-- policies apply: anon callers see nothing, as with a direct read of Product_Information.
+CREATE OR REPLACE FUNCTION mru_dev.search_products(
+  search text,
+  category_ids bigint[] DEFAULT NULL,
+  result_limit integer DEFAULT 50,
+  result_offset integer DEFAULT 0)
+RETURNS SETOF mru_dev."Product_Information"
+LANGUAGE plpgsql
+STABLE
+SECURITY INVOKER
+SET search_path = mru_dev, extensions, public
+AS $$
+DECLARE
+  terms tsquery := mru_dev.product_search_query(search);
+BEGIN
+  IF numnode(terms) > 0 THEN
+    -- ranked on Product_Search alone, only the page of results reads Product_Information
+    RETURN QUERY
+    WITH ranked AS (
+      SELECT s.product_id, ts_rank_cd(s.search_vector, terms) AS rank
+      FROM mru_dev."Product_Search" s
+      WHERE s.search_vector @@ terms
+        AND (category_ids IS NULL OR EXISTS (
+          SELECT 1 FROM mru_dev."Category_Assigned_Products" cap
+          WHERE cap.product_id = s.product_id AND cap.category_id = ANY(category_ids)))
+      ORDER BY rank DESC, s.product_id DESC
+      LIMIT result_limit OFFSET result_offset
+    )
+    SELECT p.*
+    FROM ranked r
+    JOIN mru_dev."Product_Information" p ON p.id = r.product_id
+    ORDER BY r.rank DESC, r.product_id DESC;
+  END IF;
+
+  IF NOT FOUND AND result_offset = 0 AND to_regproc('similarity') IS NOT NULL THEN
+    RETURN QUERY
+    SELECT p.*
+    FROM mru_dev."Product_Information" p
+    WHERE p.title % search
+      AND p."isListed" AND NOT p."isDeleted"
+      AND (category_ids IS NULL OR EXISTS (
+        SELECT 1 FROM mru_dev."Category_Assigned_Products" cap
+        WHERE cap.product_id = p.id AND cap.category_id = ANY(category_ids)))
+    ORDER BY similarity(p.title, search) DESC, p.id DESC
+    LIMIT result_limit;
+  END IF;
+END;
+$$;
+
+create or replace trigger on_product_text_change
+after insert or update of title, description, "isListed", "isDeleted" on mru_dev."Product_Information" for each row
+execute function mru_dev.update_product_search();
+
+-- trigram index for the typo fallback of search_products(), where pg_trgm is available (it is on Supabase)
+DO $$
+DECLARE
+  trgm_schema text;
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+    EXECUTE format('CREATE EXTENSION IF NOT EXISTS pg_trgm SCHEMA %I',
+                   CASE WHEN to_regnamespace('extensions') IS NULL THEN 'public' ELSE 'extensions' END);
+    SELECT extnamespace::regnamespace::text INTO trgm_schema FROM pg_extension WHERE extname = 'pg_trgm';
+    EXECUTE format('CREATE INDEX IF NOT EXISTS product_information_title_trgm_index '
+                   'ON mru_dev."Product_Information" USING gin (title %s.gin_trgm_ops)', trgm_schema);
+  END IF;
+END $$;
+
+------------------------------------------------------------------------------------------------------------------
+-- Pagination (see pagination.sql)
+------------------------------------------------------------------------------------------------------------------
+-- the catalogue page after the product (after_created_at, after_id), the first page without them.
+-- Runs as the caller, so the Product_Information policies apply as to any other read, and has no SET
+-- clause, so the planner can inline it into the caller's query like a view.
+CREATE OR REPLACE FUNCTION mru_dev.get_products_page(
+  after_created_at timestamptz DEFAULT NULL,
+  after_id bigint DEFAULT NULL,
+  page_size integer DEFAULT 24)
+RETURNS SETOF mru_dev."Product_Information"
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT *
+  FROM mru_dev."Product_Information" p
+  WHERE p."isListed" AND NOT p."isDeleted"
+    -- one row comparison the index can start from, 'infinity' on the first page
+    AND (p.created_at, p.id) < (coalesce(after_created_at, 'infinity'), coalesce(after_id, 0))
+  ORDER BY p.created_at DESC, p.id DESC
+  LIMIT page_size
+$$;
+
+-- the visible messages of `chat` older than the message (before_created_at, before_id), newest
+-- first; the latest messages without them. Runs as the caller like get_products_page().
+CREATE OR REPLACE FUNCTION mru_dev.get_chat_messages_page(
+  chat bigint,
+  before_created_at timestamptz DEFAULT NULL,
+  before_id bigint DEFAULT NULL,
+  page_size integer DEFAULT 50)
+RETURNS SETOF mru_dev."Messages"
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT *
+  FROM mru_dev."Messages" m
+  WHERE m.chat_id = chat AND m.visible
+    AND (m.created_at, m.id) < (coalesce(before_created_at, 'infinity'), coalesce(before_id, 0))
+    -- implied by the row comparison, but only a plain bound prunes the newer monthly partitions
+    AND m.created_at <= coalesce(before_created_at, 'infinity')
+  ORDER BY m.created_at DESC, m.id DESC
+  LIMIT page_size
+$$;
+
+------------------------------------------------------------------------------------------------------------------
+-- Triggers (see updaters.sql)
+------------------------------------------------------------------------------------------------------------------
+-- full recount, run once after adding the columns and after loads that bypass the triggers
+CREATE OR REPLACE FUNCTION mru_dev.recompute_user_ratings()
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = mru_dev
+AS $$
+BEGIN
+  update mru_dev."User_Information" u
+  SET rating_sum = r.rating_sum,
+      rating_count = r.rating_count,
+      rating = r.rating_sum / nullif(r.rating_count, 0)
+  FROM (
+    SELECT ui.supabase_id, coalesce(sum(rv.rating::float8), 0) rating_sum, count(rv.rating) rating_count
+    FROM mru_dev."User_Information" ui
+    LEFT JOIN mru_dev."Reviews" rv ON rv.created_on_id = ui.supabase_id
+    GROUP BY ui.supabase_id
+  ) r
+  WHERE u.supabase_id = r.supabase_id;
+END;
+$$;
+
+-- a full rebuild: only the owner runs it (seed_loader.py), not clients through the RPC endpoint
+REVOKE EXECUTE ON FUNCTION mru_dev.recompute_user_ratings() FROM PUBLIC, anon, authenticated;
+
+-- row mode: O(1) per review, for the app's one-at-a-time inserts
+CREATE OR REPLACE FUNCTION mru_dev.update_user_rating()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = mru_dev
+AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') AND old.rating IS NOT NULL THEN
+    update mru_dev."User_Information"
+    SET rating_sum = rating_sum - old.rating,
+        rating_count = rating_count - 1,
+        rating = (rating_sum - old.rating) / nullif(rating_count - 1, 0)
+    WHERE supabase_id = old.created_on_id;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') AND new.rating IS NOT NULL THEN
+    update mru_dev."User_Information"
+    SET rating_sum = rating_sum + new.rating,
+        rating_count = rating_count + 1,
+        rating = (rating_sum + new.rating) / (rating_count + 1)
+    WHERE supabase_id = new.created_on_id;
+  END IF;
+
+  RETURN NULL;
+END;
+$$;
+
+-- statement mode: one update per seller per statement, for bulk inserts such as the generated Reviews.
+-- Transition tables need one trigger per event, each one only sees the tables it declares.
+CREATE OR REPLACE FUNCTION mru_dev.update_user_ratings()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = mru_dev
+AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    update mru_dev."User_Information" u
+    SET rating_sum = u.rating_sum + d.rating_sum,
+        rating_count = u.rating_count + d.rating_count,
+        rating = (u.rating_sum + d.rating_sum) / nullif(u.rating_count + d.rating_count, 0)
+    FROM (
+      SELECT created_on_id, sum(rating::float8) rating_sum, count(rating) rating_count
+      FROM new_reviews GROUP BY created_on_id
+    ) d
+    WHERE u.supabase_id = d.created_on_id AND d.rating_count > 0;
+  ELSIF TG_OP = 'DELETE' THEN
+    update mru_dev."User_Information" u
+    SET rating_sum = u.rating_sum - d.rating_sum,
+        rating_count = u.rating_count - d.rating_count,
+        rating = (u.rating_sum - d.rating_sum) / nullif(u.rating_count - d.rating_count, 0)
+    FROM (
+      SELECT created_on_id, sum(rating::float8) rating_sum, count(rating) rating_count
+      FROM old_reviews GROUP BY created_on_id
+    ) d
+    WHERE u.supabase_id = d.created_on_id AND d.rating_count > 0;
+  ELSE
+    update mru_dev."User_Information" u
+    SET rating_sum = u.rating_sum + d.rating_sum,
+        rating_count = u.rating_count + d.rating_count,
+        rating = (u.rating_sum + d.rating_sum) / nullif(u.rating_count + d.rating_count, 0)
+    FROM (
+      SELECT created_on_id, sum(rating_sum) rating_sum, sum(rating_count) rating_count
+      FROM (
+        SELECT created_on_id, rating::float8 rating_sum, 1 rating_count FROM new_reviews WHERE rating IS NOT NULL
+        UNION ALL
+        SELECT created_on_id, -rating::float8, -1 FROM old_reviews WHERE rating IS NOT NULL
+      ) changes
+      GROUP BY created_on_id
+    ) d
+    WHERE u.supabase_id = d.created_on_id AND (d.rating_sum <> 0 OR d.rating_count <> 0);
+  END IF;
+
+  RETURN NULL;
+END;
+$$;
+
+-- mode is 'row', 'statement' or 'none', installing one drops the others so a review is never counted twice
+CREATE OR REPLACE FUNCTION mru_dev.set_rating_trigger_mode(mode text)
+RETURNS void
+LANGUAGE plpgsql
+SET search_path = mru_dev
+AS $$
+BEGIN
+  DROP TRIGGER IF EXISTS on_rating_update ON mru_dev."Reviews";
+  DROP TRIGGER IF EXISTS on_rating_insert ON mru_dev."Reviews";
+  DROP TRIGGER IF EXISTS on_rating_change ON mru_dev."Reviews";
+  DROP TRIGGER IF EXISTS on_rating_delete ON mru_dev."Reviews";
+
+  IF mode = 'row' THEN
+    create trigger on_rating_update
+    after insert or update of rating, created_on_id or delete on mru_dev."Reviews" for each row
+    execute function mru_dev.update_user_rating();
+  ELSIF mode = 'statement' THEN
+    create trigger on_rating_insert
+    after insert on mru_dev."Reviews" referencing new table as new_reviews for each statement
+    execute function mru_dev.update_user_ratings();
+    create trigger on_rating_change
+    after update on mru_dev."Reviews" referencing old table as old_reviews new table as new_reviews for each statement
+    execute function mru_dev.update_user_ratings();
+    create trigger on_rating_delete
+    after delete on mru_dev."Reviews" referencing old table as old_reviews for each statement
+    execute function mru_dev.update_user_ratings();
+  ELSIF mode <> 'none' THEN
+    RAISE EXCEPTION 'unknown rating trigger mode %, expected row, statement or none', mode;
+  END IF;
+END;
+$$;
+
+SELECT mru_dev.set_rating_trigger_mode('row');
+
+-- full rebuild of the inbox rows of `chat_ids` (every chat when NULL), run once after creating the table
+-- and after loads that bypass the triggers. Read positions (last_read_at) are kept.
+CREATE OR REPLACE FUNCTION mru_dev.recompute_chat_inbox(chat_ids bigint[] DEFAULT NULL)
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = mru_dev
+AS $$
+BEGIN
+  delete from mru_dev."Chat_Inbox" i
+  WHERE (chat_ids IS NULL OR i.chat_id = ANY(chat_ids))
+    AND NOT EXISTS (
+      SELECT 1 FROM mru_dev."Chats" c WHERE c.id = i.chat_id AND i.user_id IN (c.user_id_1, c.user_id_2)
+    );
+
+  insert into mru_dev."Chat_Inbox" AS i
+    (chat_id, user_id, other_user_id, last_message_id, last_message, last_message_at, unread_count)
+  WITH participants AS (
+    SELECT DISTINCT c.id chat_id, p.user_id, p.other_user_id, coalesce(ci.last_read_at, '-infinity') last_read_at
+    FROM mru_dev."Chats" c
+    CROSS JOIN LATERAL (VALUES (c.user_id_1, c.user_id_2), (c.user_id_2, c.user_id_1)) p(user_id, other_user_id)
+    LEFT JOIN mru_dev."Chat_Inbox" ci ON ci.chat_id = c.id AND ci.user_id = p.user_id
+    WHERE p.user_id IS NOT NULL AND (chat_ids IS NULL OR c.id = ANY(chat_ids))
+  ), last_messages AS (
+    SELECT DISTINCT ON (m.chat_id) m.chat_id, m.id, m.logged_message, m.created_at
+    FROM mru_dev."Messages" m
+    WHERE m.chat_id IS NOT NULL AND m.visible AND (chat_ids IS NULL OR m.chat_id = ANY(chat_ids))
+    ORDER BY m.chat_id, m.created_at DESC, m.id DESC
+  ), unread AS (
+    SELECT p.chat_id, p.user_id, count(*) unread_count
+    FROM participants p
+    JOIN mru_dev."Messages" m ON m.chat_id = p.chat_id
+    WHERE m.visible AND m.sender_id IS DISTINCT FROM p.user_id AND m.created_at > p.last_read_at
+    GROUP BY p.chat_id, p.user_id
+  )
+  SELECT p.chat_id, p.user_id, p.other_user_id, lm.id, lm.logged_message, lm.created_at, coalesce(u.unread_count, 0)
+  FROM participants p
+  LEFT JOIN last_messages lm ON lm.chat_id = p.chat_id
+  LEFT JOIN unread u ON u.chat_id = p.chat_id AND u.user_id = p.user_id
+  ON CONFLICT (user_id, chat_id) DO UPDATE
+  SET other_user_id = excluded.other_user_id,
+      last_message_id = excluded.last_message_id,
+      last_message = excluded.last_message,
+      last_message_at = excluded.last_message_at,
+      unread_count = excluded.unread_count;
+END;
+$$;
+
+-- a full rebuild: only the owner (seed_loader.py, archive_messages.py) and the SECURITY DEFINER triggers and
+-- functions of this file run it, not clients through the RPC endpoint
+REVOKE EXECUTE ON FUNCTION mru_dev.recompute_chat_inbox(bigint[]) FROM PUBLIC, anon, authenticated;
+
+-- O(1) per message: an insert bumps both participants' rows, an edit or delete takes the old message out
+-- first and only looks up the chat's new last message (on messages_chat_id_created_at_index) when the
+-- old one was it. Hidden messages (visible is not true) are left out, as in get_chat_messages_page()
+CREATE OR REPLACE FUNCTION mru_dev.update_chat_inbox()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = mru_dev
+AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') AND old.chat_id IS NOT NULL AND old.visible THEN
+    update mru_dev."Chat_Inbox"
+    SET unread_count = unread_count - 1
+    WHERE chat_id = old.chat_id AND user_id IS DISTINCT FROM old.sender_id AND old.created_at > last_read_at;
+
+    update mru_dev."Chat_Inbox" i
+    SET last_message_id = lm.id,
+        last_message = lm.logged_message,
+        last_message_at = lm.created_at
+    FROM (SELECT old.chat_id) c(chat_id)
+    LEFT JOIN LATERAL (
+      SELECT m.id, m.logged_message, m.created_at
+      FROM mru_dev."Messages" m
+      WHERE m.chat_id = c.chat_id AND m.visible
+      ORDER BY m.created_at DESC, m.id DESC
+      LIMIT 1
+    ) lm ON TRUE
+    WHERE i.chat_id = old.chat_id AND i.last_message_id = old.id;
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE') AND new.chat_id IS NOT NULL AND new.visible THEN
+    insert into mru_dev."Chat_Inbox" AS i
+      (chat_id, user_id, other_user_id, last_message_id, last_message, last_message_at, unread_count)
+    SELECT DISTINCT c.id, p.user_id, p.other_user_id, new.id, new.logged_message, new.created_at,
+           (p.user_id IS DISTINCT FROM new.sender_id)::int
+    FROM mru_dev."Chats" c
+    CROSS JOIN LATERAL (VALUES (c.user_id_1, c.user_id_2), (c.user_id_2, c.user_id_1)) p(user_id, other_user_id)
+    WHERE c.id = new.chat_id AND p.user_id IS NOT NULL
+    ON CONFLICT (user_id, chat_id) DO UPDATE
+    SET unread_count = i.unread_count + CASE WHEN new.created_at > i.last_read_at THEN excluded.unread_count ELSE 0 END,
+        last_message_id = CASE WHEN i.last_message_at IS NULL OR new.created_at >= i.last_message_at
+                               THEN new.id ELSE i.last_message_id END,
+        last_message = CASE WHEN i.last_message_at IS NULL OR new.created_at >= i.last_message_at
+                            THEN new.logged_message ELSE i.last_message END,
+        last_message_at = greatest(i.last_message_at, new.created_at);
+  END IF;
+
+  RETURN NULL;
+END;
+$$;
+
+-- a chat that changes hands gets its inbox rows rebuilt
+CREATE OR REPLACE FUNCTION mru_dev.update_chat_inbox_participants()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = mru_dev
+AS $$
+BEGIN
+  PERFORM mru_dev.recompute_chat_inbox(ARRAY[new.id]);
+  RETURN NULL;
+END;
+$$;
+
+-- called by the MessagingPage when a chat is opened
+CREATE OR REPLACE FUNCTION mru_dev.mark_chat_read(chat bigint)
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = mru_dev
+AS $$
+BEGIN
+  update mru_dev."Chat_Inbox"
+  SET unread_count = 0,
+      last_read_at = now()
+  WHERE chat_id = chat AND user_id = auth.uid();
+END;
+$$;
+
+create or replace trigger on_message_change
+after insert or update of chat_id, sender_id, logged_message, created_at, visible or delete on mru_dev."Messages" for each row
+execute function mru_dev.update_chat_inbox();
+
+create or replace trigger on_chat_participants_change
+after update of user_id_1, user_id_2 on mru_dev."Chats" for each row
+when (old.user_id_1 IS DISTINCT FROM new.user_id_1 OR old.user_id_2 IS DISTINCT FROM new.user_id_2)
+execute function mru_dev.update_chat_inbox_participants();
+
+GRANT USAGE ON SCHEMA mru_dev, rls_policy_wrappers TO anon, authenticated, service_role;
+GRANT ALL ON ALL TABLES IN SCHEMA mru_dev TO authenticated, service_role;
+
+-- the Messages partitions are read through Messages only, its policies do not apply to a partition read
+-- by name. create_message_partitions() revokes the same on the partitions it adds later.
+DO $$
+DECLARE
+  message_partition regclass;
+BEGIN
+  FOR message_partition IN SELECT inhrelid::regclass FROM pg_inherits WHERE inhparent = 'mru_dev."Messages"'::regclass LOOP
+    EXECUTE format('REVOKE ALL ON %s FROM PUBLIC, anon, authenticated', message_partition);
+  END LOOP;
+END $$;
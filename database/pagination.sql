@@ -0,0 +1,50 @@
+-- Keyset (cursor) pagination of the product catalogue and of chat history. A page starts after the
+-- (created_at, id) of the last row of the previous one, so every page is an index range scan of
+-- page_size rows, where OFFSET reads and throws away every row before the page. Safe to re-run.
+
+-- newest listed products first, the order of the catalogue pages
+CREATE INDEX IF NOT EXISTS product_information_listed_created_at_index ON mru_dev."Product_Information" USING btree (created_at DESC, id DESC) WHERE "isListed" AND NOT "isDeleted";
+
+-- chat history pages read messages_chat_id_created_at_index (chat_id, created_at DESC, id DESC),
+-- which the inbox already added
+
+-- the catalogue page after the product (after_created_at, after_id), the first page without them.
+-- Runs as the caller, so the Product_Information policies apply as to any other read, and has no SET
+-- clause, so the planner can inline it into the caller's query like a view.
+CREATE OR REPLACE FUNCTION mru_dev.get_products_page(
+  after_created_at timestamptz DEFAULT NULL,
+  after_id bigint DEFAULT NULL,
+  page_size integer DEFAULT 24)
+RETURNS SETOF mru_dev."Product_Information"
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT *
+  FROM mru_dev."Product_Information" p
+  WHERE p."isListed" AND NOT p."isDeleted"
+    -- one row comparison the index can start from, 'infinity' on the first page
+    AND (p.created_at, p.id) < (coalesce(after_created_at, 'infinity'), coalesce(after_id, 0))
+  ORDER BY p.created_at DESC, p.id DESC
+  LIMIT page_size
+$$;
+
+-- the visible messages of `chat` older than the message (before_created_at, before_id), newest
+-- first; the latest messages without them. Runs as the caller like get_products_page().
+CREATE OR REPLACE FUNCTION mru_dev.get_chat_messages_page(
+  chat bigint,
+  before_created_at timestamptz DEFAULT NULL,
+  before_id bigint DEFAULT NULL,
+  page_size integer DEFAULT 50)
+RETURNS SETOF mru_dev."Messages"
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT *
+  FROM mru_dev."Messages" m
+  WHERE m.chat_id = chat AND m.visible
+    AND (m.created_at, m.id) < (coalesce(before_created_at, 'infinity'), coalesce(before_id, 0))
+    -- implied by the row comparison, but only a plain bound prunes the newer monthly partitions
+    AND m.created_at <= coalesce(before_created_at, 'infinity')
+  ORDER BY m.created_at DESC, m.id DESC
+  LIMIT page_size
+$$;
@@ -0,0 +1,120 @@
+-- Moves mru_dev."Messages" to a table range partitioned by month on created_at, so the chats of old
+-- semesters sit in partitions (and indexes) of their own that recent reads never touch, and can be
+-- detached and archived with archive_messages.py. Run once in a maintenance window: the rows are copied
+-- into the partitions in one transaction. Re-run rls_policies.sql afterwards, the policies of the old
+-- table are dropped with it.
+BEGIN;
+
+ALTER TABLE mru_dev."Messages" RENAME TO "Messages_unpartitioned";
+ALTER TABLE mru_dev."Messages_unpartitioned" RENAME CONSTRAINT Messages_pkey TO Messages_unpartitioned_pkey;
+ALTER TABLE mru_dev."Messages_unpartitioned" RENAME CONSTRAINT Messages_chat_id_fkey TO Messages_unpartitioned_chat_id_fkey;
+ALTER TABLE mru_dev."Messages_unpartitioned" RENAME CONSTRAINT Messages_sender_id_fkey TO Messages_unpartitioned_sender_id_fkey;
+ALTER INDEX IF EXISTS mru_dev.messages_chat_id_index RENAME TO messages_unpartitioned_chat_id_index;
+ALTER INDEX IF EXISTS mru_dev.messages_sender_id_index RENAME TO messages_unpartitioned_sender_id_index;
+ALTER INDEX IF EXISTS mru_dev.messages_chat_id_created_at_index RENAME TO messages_unpartitioned_chat_id_created_at_index;
+
+-- the partition key has to be part of the primary key
+CREATE TABLE mru_dev."Messages" (
+  id bigint GENERATED BY DEFAULT AS IDENTITY NOT NULL,
+  chat_id bigint null,
+  logged_message character varying null,
+  created_at timestamp with time zone NOT NULL DEFAULT now(),
+  sender_id uuid null,
+  visible boolean null,
+  CONSTRAINT Messages_pkey PRIMARY KEY (id, created_at),
+  CONSTRAINT Messages_chat_id_fkey FOREIGN KEY (chat_id) REFERENCES mru_dev."Chats" (id) ON UPDATE CASCADE ON DELETE SET NULL,
+  CONSTRAINT Messages_sender_id_fkey FOREIGN KEY (sender_id) REFERENCES mru_dev."User_Information" (supabase_id) ON DELETE SET NULL
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE mru_dev."Messages_default" PARTITION OF mru_dev."Messages" DEFAULT;
+-- read through Messages only, its policies do not apply to a partition read by name
+REVOKE ALL ON mru_dev."Messages_default" FROM PUBLIC, anon, authenticated;
+
+CREATE INDEX messages_chat_id_index ON mru_dev."Messages" USING btree (chat_id);
+CREATE INDEX messages_sender_id_index ON mru_dev."Messages" USING btree (sender_id);
+CREATE INDEX messages_chat_id_created_at_index ON mru_dev."Messages" USING btree (chat_id, created_at DESC, id DESC);
+
+-- monthly partitions of Messages (UTC months) covering [from_date, to_date). Rows that already landed in
+-- the default partition for a new month are moved into it, so this can run at any time: daily ahead of
+-- the calendar (pg_cron below), or before a bulk load with the range of the loaded rows. At most
+-- 120 months per call. Not callable by clients, see the REVOKE below.
+CREATE OR REPLACE FUNCTION mru_dev.create_message_partitions(
+  from_date timestamp with time zone DEFAULT now(),
+  to_date timestamp with time zone DEFAULT now() + interval '3 months')
+RETURNS integer
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = mru_dev
+AS $$
+DECLARE
+  month_start timestamp := date_trunc('month', from_date AT TIME ZONE 'UTC');
+  lower_bound timestamp with time zone;
+  upper_bound timestamp with time zone;
+  partition_name text;
+  moved_chats bigint[];
+  created integer := 0;
+BEGIN
+  IF to_date > from_date + interval '120 months' THEN
+    RAISE EXCEPTION 'create_message_partitions covers at most 120 months per call, got % to %', from_date, to_date;
+  END IF;
+  WHILE (month_start AT TIME ZONE 'UTC') < to_date LOOP
+    lower_bound := month_start AT TIME ZONE 'UTC';
+    upper_bound := (month_start + interval '1 month') AT TIME ZONE 'UTC';
+    partition_name := 'Messages_' || to_char(month_start, 'YYYY_MM');
+    IF to_regclass(format('mru_dev.%I', partition_name)) IS NULL THEN
+      EXECUTE format('CREATE TABLE mru_dev.%I (LIKE mru_dev."Messages" INCLUDING DEFAULTS)', partition_name);
+      -- the Messages policies do not apply to a partition read by name, clients go through Messages
+      EXECUTE format('REVOKE ALL ON mru_dev.%I FROM PUBLIC, anon, authenticated', partition_name);
+      EXECUTE format('WITH moved AS (DELETE FROM mru_dev."Messages_default" WHERE created_at >= %L AND created_at < %L '
+                     'RETURNING *), copied AS (INSERT INTO mru_dev.%I SELECT * FROM moved RETURNING chat_id) '
+                     'SELECT array_agg(DISTINCT chat_id) FILTER (WHERE chat_id IS NOT NULL) FROM copied',
+                     lower_bound, upper_bound, partition_name) INTO moved_chats;
+      EXECUTE format('ALTER TABLE mru_dev."Messages" ATTACH PARTITION mru_dev.%I FOR VALUES FROM (%L) TO (%L)',
+                     partition_name, lower_bound, upper_bound);
+      -- the DELETE fired on_message_change on the default partition, the INSERT into the detached table did
+      -- not, so the inbox rows of the moved chats are rebuilt
+      IF moved_chats IS NOT NULL AND to_regproc('mru_dev.recompute_chat_inbox') IS NOT NULL THEN
+        PERFORM mru_dev.recompute_chat_inbox(moved_chats);
+      END IF;
+      created := created + 1;
+    END IF;
+    month_start := month_start + interval '1 month';
+  END LOOP;
+  RETURN created;
+END;
+$$;
+
+-- SECURITY DEFINER and DDL: only the owner (seed_loader.py, pg_cron) creates partitions
+REVOKE EXECUTE ON FUNCTION mru_dev.create_message_partitions(timestamp with time zone, timestamp with time zone)
+FROM PUBLIC, anon, authenticated;
+
+SELECT mru_dev.create_message_partitions(
+  coalesce((SELECT min(created_at) FROM mru_dev."Messages_unpartitioned"), now()), now() + interval '3 months');
+
+INSERT INTO mru_dev."Messages" (id, chat_id, logged_message, created_at, sender_id, visible)
+SELECT id, chat_id, logged_message, created_at, sender_id, visible FROM mru_dev."Messages_unpartitioned";
+
+SELECT setval(pg_get_serial_sequence('mru_dev."Messages"', 'id'), coalesce(max(id), 0) + 1, false)
+FROM mru_dev."Messages";
+
+-- after the copy, the inbox already reflects these rows
+create or replace trigger on_message_change
+after insert or update of chat_id, sender_id, logged_message, created_at, visible or delete on mru_dev."Messages" for each row
+execute function mru_dev.update_chat_inbox();
+
+ALTER TABLE mru_dev."Messages" ENABLE ROW LEVEL SECURITY;
+GRANT ALL ON mru_dev."Messages" TO authenticated, service_role;
+
+DROP TABLE mru_dev."Messages_unpartitioned";
+
+COMMIT;
+
+ANALYZE mru_dev."Messages";
+
+-- keep three months of partitions ahead where pg_cron is available (Supabase: Database > Extensions)
+DO $$
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_cron') THEN
+    PERFORM cron.schedule('create-message-partitions', '0 3 * * *', 'SELECT mru_dev.create_message_partitions()');
+  END IF;
+END $$;
@@ -0,0 +1,148 @@
+-- Full text search of the product catalogue for the ProductSearchPage, replacing its ILIKE scans of
+-- Product_Information.title and description. Every listed product has a weighted tsvector in Product_Search,
+-- kept up to date by a trigger on Product_Information and indexed with GIN, and
+-- mru_dev.search_products() ranks the matches and filters them by category. Safe to re-run.
+
+CREATE TABLE IF NOT EXISTS mru_dev."Product_Search" (
+  product_id bigint NOT NULL,
+  search_vector tsvector NOT NULL,
+  CONSTRAINT Product_Search_pkey PRIMARY KEY (product_id),
+  CONSTRAINT Product_Search_product_id_fkey FOREIGN KEY (product_id) REFERENCES mru_dev."Product_Information" (id) ON UPDATE CASCADE ON DELETE CASCADE
+);
+
+-- read through search_products(), see the Product_Search policy in rls_policies.sql
+ALTER TABLE mru_dev."Product_Search" ENABLE ROW LEVEL SECURITY;
+
+-- title words weigh more than description words in the ranking
+CREATE OR REPLACE FUNCTION mru_dev.product_search_vector(title text, description text)
+RETURNS tsvector
+LANGUAGE sql
+IMMUTABLE
+AS $$
+  SELECT setweight(to_tsvector('english', coalesce(title, '')), 'A')
+      || setweight(to_tsvector('english', coalesce(description, '')), 'B')
+$$;
+
+-- every word of the search as a prefix, so a half typed word already matches: "organic chem" finds
+-- "Organic Chemistry Textbook". NULL when the search has no words.
+CREATE OR REPLACE FUNCTION mru_dev.product_search_query(search text)
+RETURNS tsquery
+LANGUAGE sql
+IMMUTABLE
+AS $$
+  SELECT to_tsquery('english', string_agg(word || ':*', ' & '))
+  FROM regexp_split_to_table(lower(coalesce(search, '')), '[^[:alnum:]]+') word
+  WHERE word <> ''
+$$;
+
+-- full rebuild, run once after creating the table and after loads that bypass the triggers
+CREATE OR REPLACE FUNCTION mru_dev.recompute_product_search()
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = mru_dev
+AS $$
+BEGIN
+  delete from mru_dev."Product_Search";
+  insert into mru_dev."Product_Search" (product_id, search_vector)
+  SELECT id, mru_dev.product_search_vector(title, description)
+  FROM mru_dev."Product_Information"
+  WHERE "isListed" AND NOT "isDeleted";
+END;
+$$;
+
+-- a full rebuild: only the owner runs it (seed_loader.py), not clients through the RPC endpoint
+REVOKE EXECUTE ON FUNCTION mru_dev.recompute_product_search() FROM PUBLIC, anon, authenticated;
+
+CREATE OR REPLACE FUNCTION mru_dev.update_product_search()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = mru_dev
+AS $$
+BEGIN
+  IF new."isListed" AND NOT new."isDeleted" THEN
+    insert into mru_dev."Product_Search" (product_id, search_vector)
+    VALUES (new.id, mru_dev.product_search_vector(new.title, new.description))
+    ON CONFLICT (product_id) DO UPDATE SET search_vector = excluded.search_vector;
+  ELSE
+    delete from mru_dev."Product_Search" WHERE product_id = new.id;
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+-- called by the ProductSearchPage. Listed products matching every word of `search`, best ranked first
+-- and newest first among equals, optionally only those tagged with one of `category_ids`. When no
+-- product matches the words and pg_trgm is installed, titles similar to the search are returned
+-- instead, which catches typos. Runs as the caller, so the Product_Search and Product_Information
+-- policies apply: anon callers see nothing, as with a direct read of Product_Information.
+CREATE OR REPLACE FUNCTION mru_dev.search_products(
+  search text,
+  category_ids bigint[] DEFAULT NULL,
+  result_limit integer DEFAULT 50,
+  result_offset integer DEFAULT 0)
+RETURNS SETOF mru_dev."Product_Information"
+LANGUAGE plpgsql
+STABLE
+SECURITY INVOKER
+SET search_path = mru_dev, extensions, public
+AS $$
+DECLARE
+  terms tsquery := mru_dev.product_search_query(search);
+BEGIN
+  IF numnode(terms) > 0 THEN
+    -- ranked on Product_Search alone, only the page of results reads Product_Information
+    RETURN QUERY
+    WITH ranked AS (
+      SELECT s.product_id, ts_rank_cd(s.search_vector, terms) AS rank
+      FROM mru_dev."Product_Search" s
+      WHERE s.search_vector @@ terms
+        AND (category_ids IS NULL OR EXISTS (
+          SELECT 1 FROM mru_dev."Category_Assigned_Products" cap
+          WHERE cap.product_id = s.product_id AND cap.category_id = ANY(category_ids)))
+      ORDER BY rank DESC, s.product_id DESC
+      LIMIT result_limit OFFSET result_offset
+    )
+    SELECT p.*
+    FROM ranked r
+    JOIN mru_dev."Product_Information" p ON p.id = r.product_id
+    ORDER BY r.rank DESC, r.product_id DESC;
+  END IF;
+
+  IF NOT FOUND AND result_offset = 0 AND to_regproc('similarity') IS NOT NULL THEN
+    RETURN QUERY
+    SELECT p.*
+    FROM mru_dev."Product_Information" p
+    WHERE p.title % search
+      AND p."isListed" AND NOT p."isDeleted"
+      AND (category_ids IS NULL OR EXISTS (
+        SELECT 1 FROM mru_dev."Category_Assigned_Products" cap
+        WHERE cap.product_id = p.id AND cap.category_id = ANY(category_ids)))
+    ORDER BY similarity(p.title, search) DESC, p.id DESC
+    LIMIT result_limit;
+  END IF;
+END;
+$$;
+
+SELECT mru_dev.recompute_product_search();
+
+CREATE INDEX IF NOT EXISTS product_search_search_vector_index ON mru_dev."Product_Search" USING gin (search_vector);
+
+create or replace trigger on_product_text_change
+after insert or update of title, description, "isListed", "isDeleted" on mru_dev."Product_Information" for each row
+execute function mru_dev.update_product_search();
+
+-- trigram index for the typo fallback of search_products(), where pg_trgm is available (it is on Supabase)
+DO $$
+DECLARE
+  trgm_schema text;
+BEGIN
+  IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+    EXECUTE format('CREATE EXTENSION IF NOT EXISTS pg_trgm SCHEMA %I',
+                   CASE WHEN to_regnamespace('extensions') IS NULL THEN 'public' ELSE 'extensions' END);
+    SELECT extnamespace::regnamespace::text INTO trgm_schema FROM pg_extension WHERE extname = 'pg_trgm';
+    EXECUTE format('CREATE INDEX IF NOT EXISTS product_information_title_trgm_index '
+                   'ON mru_dev."Product_Information" USING gin (title %s.gin_trgm_ops)', trgm_schema);
+  END IF;
+END $$;
@@ -39,7 +39,7 @@ language plpgsql
 AS $$
 BEGIN RETURN 
   (product_row.user_id = (SELECT auth.uid()))
-  OR product_row.isListed;
+  OR product_row."isListed";
 END;
 $$;
 
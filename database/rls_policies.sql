@@ -234,6 +234,43 @@ USING ((SELECT auth.uid() = user_id));
 ------------------------------------------------------------------------------------------------------------------
 
 
+------------------------------------------------------------------------------------------------------------------
+-- Security Policy functions for the Shopping_Cart_Products table
+------------------------------------------------------------------------------------------------------------------
+DROP POLICY IF EXISTS "users can read the products in their shopping cart"
+ON mru_dev."Shopping_Cart_Products";
+DROP POLICY IF EXISTS "users can add products to their shopping cart"
+ON mru_dev."Shopping_Cart_Products";
+DROP POLICY IF EXISTS "users can remove products from their shopping cart"
+ON mru_dev."Shopping_Cart_Products";
+
+CREATE POLICY "users can read the products in their shopping cart"
+ON mru_dev."Shopping_Cart_Products"
+FOR SELECT
+TO authenticated
+USING (EXISTS (
+  SELECT 1 FROM mru_dev."Shopping_Cart" sc
+  WHERE sc.id = shopping_cart_id AND sc.user_id = (SELECT auth.uid())));
+
+CREATE POLICY "users can add products to their shopping cart"
+ON mru_dev."Shopping_Cart_Products"
+FOR INSERT
+TO authenticated
+WITH CHECK (EXISTS (
+  SELECT 1 FROM mru_dev."Shopping_Cart" sc
+  WHERE sc.id = shopping_cart_id AND sc.user_id = (SELECT auth.uid())));
+
+CREATE POLICY "users can remove products from their shopping cart"
+ON mru_dev."Shopping_Cart_Products"
+FOR DELETE
+TO authenticated
+USING (EXISTS (
+  SELECT 1 FROM mru_dev."Shopping_Cart" sc
+  WHERE sc.id = shopping_cart_id AND sc.user_id = (SELECT auth.uid())));
+
+------------------------------------------------------------------------------------------------------------------
+
+
 ------------------------------------------------------------------------------------------------------------------
 -- Security Policy functions for the User_Interactions table
 ------------------------------------------------------------------------------------------------------------------
@@ -343,4 +380,35 @@ FOR DELETE
 TO authenticated
 USING ((SELECT rls_policy_wrappers.change_category_assigned_products("Catagory_Assigned_Products")));
 
-------------------------------------------------------------------------------------------------------------------
\ No newline at end of file
+------------------------------------------------------------------------------------------------------------------
+
+
+------------------------------------------------------------------------------------------------------------------
+-- Security Policy functions for the Chat_Inbox table
+------------------------------------------------------------------------------------------------------------------
+DROP POLICY IF EXISTS "users can read their inbox"
+ON mru_dev."Chat_Inbox";
+
+-- rows are only written by the Messages triggers and mru_dev.mark_chat_read
+CREATE POLICY "users can read their inbox"
+ON mru_dev."Chat_Inbox"
+FOR SELECT
+TO authenticated
+USING ((SELECT auth.uid()) = user_id);
+------------------------------------------------------------------------------------------------------------------
+
+
+------------------------------------------------------------------------------------------------------------------
+-- Security Policy functions for the Product_Search table
+------------------------------------------------------------------------------------------------------------------
+DROP POLICY IF EXISTS "users can search listed products"
+ON mru_dev."Product_Search";
+
+-- only listed products have a row, which select_product_information() shows to every signed in user.
+-- Rows are only written by the Product_Information trigger.
+CREATE POLICY "users can search listed products"
+ON mru_dev."Product_Search"
+FOR SELECT
+TO authenticated
+USING (true);
+------------------------------------------------------------------------------------------------------------------
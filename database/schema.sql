@@ -53,15 +53,39 @@ CREATE TABLE mru_dev."Messages" (
   created_at timestamp with time zone NOT NULL DEFAULT now(),
   sender_id uuid null,
   visible boolean null,
-  CONSTRAINT Messages_pkey PRIMARY KEY (id),
+  CONSTRAINT Messages_pkey PRIMARY KEY (id, created_at),
   CONSTRAINT Messages_chat_id_fkey FOREIGN KEY (chat_id) REFERENCES mru_dev."Chats" (id) ON UPDATE CASCADE ON DELETE SET NULL,
   CONSTRAINT Messages_sender_id_fkey FOREIGN KEY (sender_id) REFERENCES mru_dev."User_Information" (supabase_id) ON DELETE SET NULL
-) TABLESPACE pg_default;
+) PARTITION BY RANGE (created_at);
+
+CREATE TABLE mru_dev."Messages_default" PARTITION OF mru_dev."Messages" DEFAULT;
 
 CREATE INDEX IF NOT EXISTS messages_chat_id_index ON mru_dev."Messages" USING btree (chat_id) TABLESPACE pg_default;
 
 CREATE INDEX IF NOT EXISTS messages_sender_id_index ON mru_dev."Messages" USING btree (sender_id) TABLESPACE pg_default;
 
+CREATE INDEX IF NOT EXISTS messages_chat_id_created_at_index ON mru_dev."Messages" USING btree (chat_id, created_at DESC, id DESC) TABLESPACE pg_default;
+
+CREATE TABLE mru_dev."Chat_Inbox" (
+  chat_id bigint NOT NULL,
+  user_id uuid NOT NULL,
+  other_user_id uuid null,
+  last_message_id bigint null,
+  last_message character varying null,
+  last_message_at timestamp with time zone null,
+  unread_count bigint NOT NULL DEFAULT 0,
+  last_read_at timestamp with time zone NOT NULL DEFAULT '-infinity',
+  CONSTRAINT Chat_Inbox_pkey PRIMARY KEY (user_id, chat_id),
+  CONSTRAINT Chat_Inbox_chat_id_fkey FOREIGN KEY (chat_id) REFERENCES mru_dev."Chats" (id) ON UPDATE CASCADE ON DELETE CASCADE,
+  CONSTRAINT Chat_Inbox_user_id_fkey FOREIGN KEY (user_id) REFERENCES mru_dev."User_Information" (supabase_id) ON UPDATE CASCADE ON DELETE CASCADE,
+  CONSTRAINT Chat_Inbox_other_user_id_fkey FOREIGN KEY (other_user_id) REFERENCES mru_dev."User_Information" (supabase_id) ON UPDATE CASCADE ON DELETE SET NULL
+) TABLESPACE pg_default;
+
+-- only read through the "users can read their inbox" policy (see rls_policies.sql)
+ALTER TABLE mru_dev."Chat_Inbox" ENABLE ROW LEVEL SECURITY;
+
+CREATE INDEX IF NOT EXISTS chat_inbox_user_id_last_message_at_index ON mru_dev."Chat_Inbox" USING btree (user_id, last_message_at DESC NULLS LAST) TABLESPACE pg_default;
+
 CREATE TABLE mru_dev."Product_Information" (
   id bigint GENERATED BY DEFAULT AS IDENTITY NOT NULL,
   created_at timestamp with time zone NOT NULL DEFAULT now(),
@@ -81,6 +105,20 @@ CREATE INDEX IF NOT EXISTS product_information_user_id_index ON mru_dev."Product
 
 CREATE INDEX IF NOT EXISTS product_information_user_id_index ON mru_dev."Product_Information" USING btree (user_id) TABLESPACE pg_default;
 
+CREATE INDEX IF NOT EXISTS product_information_listed_created_at_index ON mru_dev."Product_Information" USING btree (created_at DESC, id DESC) TABLESPACE pg_default WHERE "isListed" AND NOT "isDeleted";
+
+CREATE TABLE mru_dev."Product_Search" (
+  product_id bigint NOT NULL,
+  search_vector tsvector NOT NULL,
+  CONSTRAINT Product_Search_pkey PRIMARY KEY (product_id),
+  CONSTRAINT Product_Search_product_id_fkey FOREIGN KEY (product_id) REFERENCES mru_dev."Product_Information" (id) ON UPDATE CASCADE ON DELETE CASCADE
+) TABLESPACE pg_default;
+
+-- read through search_products(), see the Product_Search policy in rls_policies.sql
+ALTER TABLE mru_dev."Product_Search" ENABLE ROW LEVEL SECURITY;
+
+CREATE INDEX IF NOT EXISTS product_search_search_vector_index ON mru_dev."Product_Search" USING gin (search_vector) TABLESPACE pg_default;
+
 CREATE TABLE mru_dev."Reports" (
   id bigint GENERATED BY DEFAULT AS IDENTITY NOT NULL,
   created_at timestamp with time zone NOT NULL DEFAULT now(),
@@ -119,6 +157,27 @@ CREATE INDEX IF NOT EXISTS reviews_created_on_id_index ON mru_dev."Reviews" USIN
 
 CREATE INDEX IF NOT EXISTS reviews_product_id_index ON mru_dev."Reviews" USING btree (product_id) TABLESPACE pg_default;
 
+CREATE TABLE mru_dev."Shopping_Cart" (
+  id bigint GENERATED BY DEFAULT AS IDENTITY NOT NULL,
+  created_at timestamp with time zone NOT NULL DEFAULT now(),
+  user_id uuid null,
+  CONSTRAINT Shopping_Cart_pkey PRIMARY KEY (id),
+  CONSTRAINT Shopping_Cart_user_id_fkey FOREIGN KEY (user_id) REFERENCES mru_dev."User_Information" (supabase_id) ON UPDATE CASCADE ON DELETE CASCADE
+) TABLESPACE pg_default;
+
+CREATE INDEX IF NOT EXISTS shopping_cart_user_id_index ON mru_dev."Shopping_Cart" USING btree (user_id) TABLESPACE pg_default;
+
+CREATE TABLE mru_dev."Shopping_Cart_Products" (
+  created_at timestamp with time zone NOT NULL DEFAULT now(),
+  shopping_cart_id bigint NOT NULL,
+  product_id bigint NOT NULL,
+  CONSTRAINT Shopping_Cart_Products_pkey PRIMARY KEY (shopping_cart_id, product_id),
+  CONSTRAINT Shopping_Cart_Products_shopping_cart_id_fkey FOREIGN KEY (shopping_cart_id) REFERENCES mru_dev."Shopping_Cart" (id) ON UPDATE CASCADE ON DELETE CASCADE,
+  CONSTRAINT Shopping_Cart_Products_product_id_fkey FOREIGN KEY (product_id) REFERENCES mru_dev."Product_Information" (id) ON UPDATE CASCADE ON DELETE CASCADE
+) TABLESPACE pg_default;
+
+CREATE INDEX IF NOT EXISTS shopping_cart_products_product_id_index ON mru_dev."Shopping_Cart_Products" USING btree (product_id) TABLESPACE pg_default;
+
 CREATE TABLE mru_dev."User_Information" (
   id bigint GENERATED BY DEFAULT AS IDENTITY NOT NULL,
   first_name character varying null,
@@ -132,6 +191,8 @@ CREATE TABLE mru_dev."User_Information" (
   user_name character varying null,
   supabase_id uuid NOT NULL DEFAULT auth.uid (),
   rating real null,
+  rating_sum double precision NOT NULL DEFAULT 0,
+  rating_count bigint NOT NULL DEFAULT 0,
   profile_image json null,
   CONSTRAINT User_Information_pkey PRIMARY KEY (id),
   CONSTRAINT User_Information_supabase_id_key unique (supabase_id),
@@ -0,0 +1,139 @@
+"""
+Writes generated tables as CSV, Arrow IPC or Parquet, and reads them back.
+
+Writers take the chunk iterators from generate_temp_users.py and append chunk by chunk: CSV rows, one
+Arrow record batch or one Parquet row group per chunk, so only one chunk is ever in memory. Arrow files
+are written uncompressed so the reader can memory-map them: every process that opens the same file
+shares the pages the OS already has cached instead of parsing its own copy. Parquet is compressed and
+smaller on disk, for keeping datasets around.
+
+Arrow and Parquet need pyarrow (pip install pyarrow), CSV only needs pandas.
+"""
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+EXTENSIONS = {"csv": ".csv", "arrow": ".arrow", "parquet": ".parquet"}
+FORMATS = list(EXTENSIONS)
+
+
+def require_pyarrow(output_format):
+    if pa is None:
+        raise RuntimeError(f"{output_format} files need pyarrow, install it with pip install pyarrow")
+
+
+def table_path(directory, table, output_format):
+    return os.path.join(directory, table + EXTENSIONS[output_format])
+
+
+def write_csv(path, chunks):
+    # appends chunk by chunk so only one chunk of the table is ever in memory
+    rows, head = 0, None
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        for chunk in chunks:
+            chunk.to_csv(f, header=rows == 0, index=False)
+            if head is None:
+                head = chunk.head()
+            rows += len(chunk)
+    return rows, head
+
+
+def arrow_batches(chunks):
+    # the first chunk fixes the schema, later chunks are converted to it so all-null columns keep one type
+    schema = None
+    for chunk in chunks:
+        batch = pa.RecordBatch.from_pandas(chunk, schema=schema, preserve_index=False)
+        schema = batch.schema
+        yield chunk, batch
+
+
+def write_arrow(path, chunks):
+    rows, head, writer = 0, None, None
+    try:
+        for chunk, batch in arrow_batches(chunks):
+            if writer is None:
+                writer = pa.ipc.new_file(path, batch.schema)
+                head = chunk.head()
+            writer.write_batch(batch)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows, head
+
+
+def write_parquet(path, chunks, compression="zstd"):
+    rows, head, writer = 0, None, None
+    try:
+        for chunk, batch in arrow_batches(chunks):
+            if writer is None:
+                writer = pq.ParquetWriter(path, batch.schema, compression=compression)
+                head = chunk.head()
+            writer.write_batch(batch, row_group_size=len(chunk))
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows, head
+
+
+def write_table(directory, table, chunks, output_format="csv", compression="zstd"):
+    """Writes one table and returns (rows, first rows). Empty Arrow and Parquet tables leave no file."""
+    path = table_path(directory, table, output_format)
+    if output_format == "csv":
+        return write_csv(path, chunks)
+    require_pyarrow(output_format)
+    if os.path.exists(path):
+        os.remove(path)
+    if output_format == "arrow":
+        return write_arrow(path, chunks)
+    return write_parquet(path, chunks, compression)
+
+
+def find_table(directory, table):
+    """(path, format) of the table's file in `directory`, (None, None) when there is none.
+
+    Runs with different --format into the same directory leave a file per format, and either may
+    be stale, so more than one is a ValueError rather than a guess.
+    """
+    found = [(table_path(directory, table, output_format), output_format) for output_format in FORMATS
+             if os.path.exists(table_path(directory, table, output_format))]
+    if len(found) > 1:
+        raise ValueError(f"{directory} has {table} as {' and '.join(name for _, name in found)}, "
+                         "remove all but the one to read")
+    return found[0] if found else (None, None)
+
+
+def open_table(path):
+    """The file as a pyarrow Table. Arrow files are memory-mapped and not copied."""
+    require_pyarrow(os.path.splitext(path)[1].lstrip("."))
+    if path.endswith(EXTENSIONS["arrow"]):
+        return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    if path.endswith(EXTENSIONS["parquet"]):
+        return pq.read_table(path, memory_map=True)
+    return pa.Table.from_pandas(pd.read_csv(path), preserve_index=False)
+
+
+def read_chunks(path, chunk_size):
+    """Yields the file as pandas DataFrames of at most `chunk_size` rows."""
+    if path.endswith(EXTENSIONS["csv"]):
+        yield from pd.read_csv(path, chunksize=chunk_size)
+        return
+    for batch in open_table(path).to_batches(max_chunksize=chunk_size):
+        yield batch.to_pandas()
+
+
+def read_tables(directory, tables, chunk_size):
+    """{table: chunk iterator} for the files in `directory`, in the shape generate_tables() returns."""
+    found = {}
+    for table in tables:
+        path, _ = find_table(directory, table)
+        found[table] = read_chunks(path, chunk_size) if path else iter(())
+    return found
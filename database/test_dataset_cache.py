@@ -0,0 +1,63 @@
+"""
+Checks of dataset_cache.py that need no database: cache keys, the cached files and eviction.
+
+Usage:
+    python -m pytest -q database
+"""
+import json
+import os
+
+import pytest
+
+import dataset_cache
+import generate_temp_users
+import table_io
+
+
+class Admin:
+    """Stands in for the autocommit connection, with no template databases."""
+
+    def execute(self, *args):
+        return self
+
+    def fetchone(self):
+        return None
+
+
+def key(seed=1, scale=None, files=dataset_cache.KEY_FILES):
+    return dataset_cache.cache_key(seed, scale or {"Chats": 10}, ("zipf", None), 0.0, 120, files)
+
+
+def test_cache_key_covers_the_options_and_the_key_files(tmp_path):
+    assert key() == key()
+    assert len({key(), key(seed=2), key(scale={"Chats": 11})}) == 3
+    schema = tmp_path / "schema.sql"
+    schema.write_text("CREATE TABLE a ();")
+    before = key(files=[str(schema)])
+    schema.write_text("CREATE TABLE b ();")
+    assert key(files=[str(schema)]) != before
+
+
+def test_generated_files_hold_every_table(tmp_path):
+    pytest.importorskip("pyarrow")
+    scale = generate_temp_users.parse_scale(30, [])
+    dataset_cache.generate_files(str(tmp_path), 1, scale, ("zipf", None), 0.0, 120, 16)
+    tables = table_io.read_tables(str(tmp_path), generate_temp_users.TABLE_NAMES, 1000)
+    assert {name: sum(len(chunk) for chunk in chunks) for name, chunks in tables.items()}["Chats"] == 30
+    assert sorted(os.listdir(tmp_path)) == sorted(name + ".arrow" for name in generate_temp_users.TABLE_NAMES)
+
+
+def test_restore_without_a_dump_falls_back(tmp_path):
+    assert dataset_cache.restore("postgresql://localhost/none", str(tmp_path / dataset_cache.DUMP_FILE)) is False
+
+
+def test_eviction_removes_the_least_recently_used_entries_first(tmp_path):
+    for name, last_used in (("old", "2026-01-01"), ("kept", "2026-01-02"), ("new", "2026-01-03")):
+        entry = tmp_path / name
+        entry.mkdir()
+        (entry / "Chats.arrow").write_bytes(b"x" * 1000)
+        (entry / dataset_cache.MANIFEST_FILE).write_text(json.dumps({"key": name, "last_used": last_used}))
+    sizes = {manifest["key"]: manifest["bytes"] for _, manifest in dataset_cache.entries(str(tmp_path))}
+    # room for one entry: the oldest goes, the one in use stays even though a newer one has to go then
+    dataset_cache.evict(Admin(), str(tmp_path), sizes["new"], keep="kept")
+    assert sorted(os.listdir(tmp_path)) == ["kept"]
@@ -0,0 +1,63 @@
+"""
+Checks of dataset_state.py and --state: batches appended after the existing rows, with keys, pairs
+and chats that continue those of the earlier batches.
+
+Usage:
+    python -m pytest -q database
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import dataset_state
+import generate_temp_users
+
+
+def read_csvs(directory):
+    # a table without rows is written as an empty file
+    paths = {name: os.path.join(directory, name + ".csv") for name in generate_temp_users.TABLE_NAMES}
+    return {name: pd.read_csv(path) if os.path.getsize(path) else pd.DataFrame() for name, path in paths.items()}
+
+
+def test_state_appends_batches_after_the_existing_rows(tmp_path):
+    state = str(tmp_path / "dataset.json")
+    common = ["--rows", "100", "--scale", "Messages=500", "--state", state, "--validate"]
+    generate_temp_users.main(common + ["--seed", "11", "--out-dir", str(tmp_path / "0")])
+    generate_temp_users.main(common + ["--out-dir", str(tmp_path / "1")])
+    first, second = read_csvs(tmp_path / "0"), read_csvs(tmp_path / "1")
+
+    for name in ("User_Information", "Product_Information", "Chats"):
+        assert second[name]["id"].min() == first[name]["id"].max() + 1, name
+    assert len(second["Category_Tags"]) == 0
+    users = pd.concat([first["User_Information"], second["User_Information"]])
+    assert users["supabase_id"].is_unique and users["email"].is_unique
+    chats = pd.concat([first["Chats"], second["Chats"]])
+    assert not pd.DataFrame(np.sort(chats[["user_id_1", "user_id_2"]].to_numpy(), axis=1)).duplicated().any()
+    assert set(second["Messages"]["chat_id"]) <= set(chats["id"])
+
+    # some messages continue the chats of the first batch, after their last message
+    last = first["Messages"].groupby("chat_id")["created_at"].max()
+    continued = second["Messages"][second["Messages"]["chat_id"].isin(first["Chats"]["id"])]
+    assert 0 < len(continued) < len(second["Messages"])
+    earlier = last.reindex(continued["chat_id"]).fillna("")
+    assert (continued["created_at"].to_numpy() > earlier.to_numpy()).all()
+
+    manifest = dataset_state.read_state(state)
+    assert manifest["seed"] == 11 and manifest["next_batch"] == 2
+    assert manifest["rows"]["User_Information"] == 200 and manifest["rows"]["Messages"] == 1000
+    assert len(manifest["users"]) == 200
+    assert len(manifest["pairs"]["chats"]) == len(chats)
+    assert len(manifest["chats"]["messages"]) == len(chats) and manifest["chats"]["messages"].sum() == 1000
+    assert not os.path.exists(dataset_state.keys_path(state, 1))
+    with open(state, encoding="utf-8") as f:
+        assert [batch["batch"] for batch in json.load(f)["batches"]] == [0, 1]
+
+
+def test_state_refuses_another_seed(tmp_path):
+    state = str(tmp_path / "dataset.json")
+    generate_temp_users.main(["--rows", "20", "--seed", "1", "--state", state, "--out-dir", str(tmp_path)])
+    with pytest.raises(SystemExit):
+        generate_temp_users.main(["--rows", "20", "--seed", "2", "--state", state, "--out-dir", str(tmp_path)])
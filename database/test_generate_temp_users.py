@@ -0,0 +1,113 @@
+"""
+Checks of generate_temp_users.py: the scale plan, the pair and conversation samplers, and output that
+does not depend on --workers.
+
+Usage:
+    python -m pytest -q database
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import dataset_state
+import generate_temp_users
+
+
+def file_bytes(directory):
+    return {name: open(os.path.join(directory, name), "rb").read() for name in sorted(os.listdir(directory))}
+
+
+def unordered(first, second):
+    return set(zip(np.minimum(first, second).tolist(), np.maximum(first, second).tolist()))
+
+
+@pytest.mark.parametrize("argv", [
+    ["--rows", "2"],
+    ["--rows", "1", "--scale", "Chats=0", "--scale", "Reports=0", "--scale", "User_Interactions=0"],
+    ["--scale", "Product_Information=0"],
+    ["--scale", "User_Information=0"],
+    ["--scale", "Chats=0"],
+    ["--scale", "Shopping_Cart=1", "--scale", "Product_Information=10"],
+    ["--scale", "Reviews=x"],
+])
+def test_impossible_scale_plans_are_rejected(tmp_path, argv):
+    with pytest.raises(SystemExit):
+        generate_temp_users.main(argv + ["--out-dir", str(tmp_path)])
+    assert not os.listdir(tmp_path)
+
+
+def test_scale_plan_counts_the_rows_of_the_state():
+    base = {"rows": {"User_Information": 4, "Chats": 5}}
+    scale = generate_temp_users.parse_scale(0, ["Chats=1", "Messages=0"], base)
+    assert scale["Chats"] == 1 and scale["Category_Tags"] == 0
+    with pytest.raises(ValueError, match="Chats"):
+        generate_temp_users.parse_scale(0, ["Chats=2", "Messages=0"], base)
+
+
+def test_table_streams_only_depend_on_seed_table_shard_and_batch():
+    draw = lambda *args: generate_temp_users.table_rng(*args).integers(0, 2**62, 4).tolist()
+    assert draw(7, "Chats", 3) == draw(7, "Chats", 3)
+    streams = [draw(7, "Chats", 3), draw(8, "Chats", 3), draw(7, "Reports", 3), draw(7, "Chats", 4),
+               draw(7, "Chats", 3, 1), draw(7, "Chats")]
+    assert len({tuple(stream) for stream in streams}) == len(streams)
+
+
+def test_output_is_identical_for_any_workers(tmp_path):
+    for workers in (1, 3):
+        generate_temp_users.main(["--rows", "300", "--scale", "Messages=3000", "--seed", "7", "--chunk-size", "64",
+                                  "--workers", str(workers), "--out-dir", str(tmp_path / str(workers))])
+    assert file_bytes(tmp_path / "1") == file_bytes(tmp_path / "3")
+
+
+def test_unrank_pairs_enumerates_every_pair_once():
+    low, high = generate_temp_users.unrank_pairs(np.arange(45))
+    assert (low < high).all() and high.max() == 9
+    assert len(unordered(low, high)) == 45
+    assert (dataset_state.pair_ranks(low, high) == np.arange(45)).all()
+
+
+def test_distinct_pairs_are_distinct_and_skip_taken_ranks():
+    rng = np.random.default_rng(1)
+    first, second = generate_temp_users.distinct_pairs(rng, 50, 1000)
+    assert (first != second).all()
+    assert len(unordered(first, second)) == 1000
+
+    taken = np.sort(dataset_state.pair_ranks(first, second))
+    more = generate_temp_users.distinct_pairs(rng, 50, 50 * 49 // 2 - 1000, taken)
+    ranks = dataset_state.pair_ranks(*more)
+    assert len(np.unique(ranks)) == len(ranks)
+    assert not np.isin(ranks, taken).any()
+    with pytest.raises(ValueError):
+        generate_temp_users.distinct_pairs(rng, 50, 1, np.arange(50 * 49 // 2))
+
+
+@pytest.mark.parametrize("distribution", generate_temp_users.MESSAGE_DISTRIBUTIONS)
+def test_conversation_lengths_add_up(distribution):
+    skew = generate_temp_users.MESSAGE_SKEW[distribution]
+    lengths = generate_temp_users.conversation_lengths(np.random.default_rng(2), 100, 5000, distribution, skew)
+    assert lengths.sum() == 5000 and lengths.min() >= 1
+    few = generate_temp_users.conversation_lengths(np.random.default_rng(2), 100, 30, distribution, skew)
+    assert few.sum() == 30 and few.min() >= 0
+    with pytest.raises(ValueError):
+        generate_temp_users.conversation_lengths(np.random.default_rng(2), 0, 1, distribution, skew)
+
+
+def test_conversations_alternate_senders_in_time_order(tmp_path):
+    generate_temp_users.main(["--rows", "50", "--scale", "Messages=2000", "--seed", "5", "--out-dir", str(tmp_path)])
+    chats = pd.read_csv(tmp_path / "Chats.csv").set_index("id")
+    messages = pd.read_csv(tmp_path / "Messages.csv")
+    assert messages.groupby("chat_id")["created_at"].apply(lambda sent: sent.is_monotonic_increasing).all()
+    assert (messages["created_at"].to_numpy() >= chats.loc[messages["chat_id"], "created_at"].to_numpy()).all()
+    first = messages.groupby("chat_id").cumcount() % 2 == 0
+    expected = np.where(first, chats.loc[messages["chat_id"], "user_id_1"], chats.loc[messages["chat_id"], "user_id_2"])
+    assert (messages["sender_id"].to_numpy() == expected).all()
+
+
+def test_products_are_listed_over_the_history(tmp_path):
+    generate_temp_users.main(["--rows", "500", "--seed", "4", "--now", "2026-03-01T12:00:00", "--history-days", "30",
+                              "--out-dir", str(tmp_path)])
+    listed = pd.to_datetime(pd.read_csv(tmp_path / "Product_Information.csv")["created_at"])
+    assert listed.nunique() > 400
+    assert listed.min() >= pd.Timestamp("2026-01-30T12:00:00Z") and listed.max() <= pd.Timestamp("2026-03-01T12:00:00Z")
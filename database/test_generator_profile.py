@@ -0,0 +1,58 @@
+"""
+Checks of generator_profile.py: stage records, nested stages, memory tracing and report comparison.
+
+Usage:
+    python -m pytest -q database
+"""
+import numpy as np
+import pandas as pd
+
+import generator_profile
+
+
+def profiled(memory=False):
+    profiler = generator_profile.Profiler(memory=memory)
+    profiler.start()
+    with profiler.stage("write csv", "Chats") as stage:
+        chunks = profiler.chunks("Chats", (pd.DataFrame({"id": np.arange(1000)}) for _ in range(3)))
+        stage["rows"] = sum(len(chunk) for chunk in chunks)
+    profiler.stop()
+    return profiler.report(rows=1000)
+
+
+def stage(report, name):
+    return next(record for record in report["stages"] if record["stage"] == name)
+
+
+def test_generated_chunks_are_booked_to_their_own_stage():
+    report = profiled()
+    assert stage(report, "generate")["rows"] == stage(report, "write csv")["rows"] == 3000
+    assert sum(record["wall_s"] for record in report["stages"]) <= report["wall_s"]
+    assert report["peak_bytes"] is None and stage(report, "generate")["peak_bytes"] is None
+    assert report["traced"] == {"memory": False, "python": False}
+
+
+def test_memory_is_traced_only_when_asked():
+    report = profiled(memory=True)
+    assert report["traced"]["memory"] and report["peak_bytes"] > 0
+    assert stage(report, "generate")["peak_bytes"] >= 8000
+
+
+def test_a_disabled_profiler_passes_chunks_through():
+    profiler = generator_profile.Profiler(enabled=False)
+    chunks = iter([1, 2])
+    assert profiler.chunks("Chats", chunks) is chunks
+    with profiler.stage("keys") as counted:
+        counted["rows"] = 5
+    assert profiler.records == {}
+
+
+def test_compare_flags_slower_stages_of_the_same_tracing(capsys):
+    def report(rate, memory=False):
+        return {"traced": {"memory": memory, "python": False},
+                "stages": [{"stage": "generate", "table": "Chats", "rows_per_s": rate}]}
+
+    assert generator_profile.compare(report(1000), report(700), threshold=0.2) == 1
+    assert generator_profile.compare(report(1000), report(900), threshold=0.2) == 0
+    assert generator_profile.compare(report(1000, memory=True), report(100), threshold=0.2) == 0
+    assert "not compared" in capsys.readouterr().out
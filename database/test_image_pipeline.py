@@ -0,0 +1,53 @@
+"""
+Checks of image_pipeline.py: variant names and sizes, and photos skipped by the content hash cache.
+
+Usage:
+    python -m pytest -q database
+"""
+import os
+
+import pytest
+
+import image_pipeline
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def photo(path, size, color="red"):
+    Image.new("RGB", size, color).save(path)
+
+
+def test_variant_names_are_flat_object_names():
+    assert image_pipeline.variant_name("hoodie_mru.jpg", "thumb", "webp") == "hoodie_mru-thumb.webp"
+
+
+def test_variants_are_scaled_down_but_never_up(tmp_path):
+    source = tmp_path / "wide.png"
+    photo(source, (2000, 1000))
+    written = image_pipeline.render(str(source), str(tmp_path), ["webp"])
+    assert set(written) == {f"wide-{variant}.webp" for variant in image_pipeline.VARIANTS}
+    with Image.open(tmp_path / "wide-thumb.webp") as thumb, Image.open(tmp_path / "wide-full.webp") as full:
+        assert thumb.size == (320, 160) and full.size == (1600, 800)
+
+    small = tmp_path / "small.png"
+    photo(small, (200, 100))
+    image_pipeline.render(str(small), str(tmp_path), ["webp"])
+    with Image.open(tmp_path / "small-full.webp") as full:
+        assert full.size == (200, 100)
+
+
+def test_unchanged_photos_are_skipped(tmp_path):
+    source_dir, out_dir = tmp_path / "images", tmp_path / "out"
+    source_dir.mkdir()
+    for name in ("a.jpg", "b.png"):
+        photo(source_dir / name, (700, 500))
+    first = image_pipeline.run(str(source_dir), str(out_dir), ["webp"], workers=1)
+    assert (first["processed"], first["skipped"]) == (2, 0)
+    assert first["variant_bytes"]["thumb.webp"] < first["original_bytes"]
+
+    photo(source_dir / "b.png", (700, 500), "blue")
+    os.remove(out_dir / "a-card.webp")
+    assert image_pipeline.run(str(source_dir), str(out_dir), ["webp"], workers=1)["processed"] == 2
+    again = image_pipeline.run(str(source_dir), str(out_dir), ["webp"], workers=1)
+    assert (again["processed"], again["skipped"]) == (0, 2)
+    assert image_pipeline.run(str(source_dir), str(out_dir), ["webp"], workers=1, force=True)["processed"] == 2
@@ -0,0 +1,41 @@
+"""
+Checks of index_advisor.py that need no database: candidates parsed from the SQL files and index names.
+
+Usage:
+    python -m pytest -q database
+"""
+import index_advisor
+
+
+def test_predicates_become_keyed_and_partial_candidates():
+    statement = 'SELECT m.id FROM mru_dev."Messages" m WHERE m.chat_id = chat AND m.visible ' \
+                'ORDER BY m.created_at DESC, m.id DESC'
+    candidates = index_advisor.predicate_candidates(statement, "pagination.sql")
+    assert {(c["table"], tuple(c["key"]), tuple(c["where"])) for c in candidates} == {
+        ("Messages", ("chat_id", "created_at DESC", "id DESC"), ()),
+        ("Messages", ("chat_id", "created_at DESC", "id DESC"), (("visible", True),)),
+    }
+
+
+def test_static_candidates_are_on_schema_tables_only():
+    candidates, unknown = index_advisor.static_candidates()
+    tables = index_advisor.schema_tables()
+    assert candidates and {index["table"] for index in candidates} <= tables
+    assert not set(unknown) & tables
+
+
+def test_long_index_names_are_cut_to_distinct_identifiers():
+    long = index_advisor.candidate("User_Interactions", ["user_id_1", "user_id_2"],
+                                   where=[("user_1_is_blocked", True), ("user_2_is_muted", False)])
+    other = dict(long, where=[("user_1_is_blocked", True), ("user_2_is_muted", True)])
+    names = {index_advisor.index_name(index) for index in (long, other)}
+    assert len(names) == 2 and all(len(name) <= 63 for name in names)
+    short = index_advisor.candidate("Chats", ["user_id_1"])
+    assert index_advisor.index_name(short) == "chats_user_id_1_index"
+
+
+def test_an_index_with_the_same_leading_columns_covers_a_candidate():
+    existing = [{"name": "messages_chat_id_created_at_index", "table": "Messages",
+                 "key": ["chat_id", "created_at DESC", "id DESC"], "include": [], "where": []}]
+    assert index_advisor.covered_by(index_advisor.candidate("Messages", ["chat_id"]), existing) == existing[0]["name"]
+    assert index_advisor.covered_by(index_advisor.candidate("Messages", ["sender_id"]), existing) is None
@@ -0,0 +1,46 @@
+"""
+Checks of key_registry.py: packed UUIDs and the uniform and popularity weighted foreign key draws.
+
+Usage:
+    python -m pytest -q database
+"""
+import uuid
+
+import numpy as np
+
+from key_registry import KeyRegistry, format_uuids, pack_uuids, random_uuids
+
+
+def test_packed_uuids_format_back_to_the_same_strings():
+    strings = [str(uuid.uuid4()) for _ in range(50)]
+    assert list(format_uuids(pack_uuids(strings))) == strings
+
+
+def test_random_uuids_are_version_4():
+    for value in format_uuids(random_uuids(np.random.default_rng(1), 200)):
+        parsed = uuid.UUID(value)
+        assert parsed.version == 4 and parsed.variant == uuid.RFC_4122
+
+
+def test_draws_stay_in_range_and_follow_popularity():
+    registry = KeyRegistry()
+    registry.add_uuids("User_Information", random_uuids(np.random.default_rng(2), 1000))
+    registry.add_ids("Chats", np.arange(10))
+    rng = np.random.default_rng(3)
+    uniform = registry.sample("User_Information", rng, 100_000)
+    assert uniform.min() >= 0 and uniform.max() < 1000
+    assert registry.sample("Chats", rng, 1000).max() < registry.count("Chats") == 10
+
+    registry.set_popularity("User_Information", np.random.default_rng(4), 1.2)
+    skewed = np.bincount(registry.sample("User_Information", rng, 100_000), minlength=1000)
+    # the ten most popular users get far more than the 1% of a uniform draw
+    assert np.sort(skewed)[-10:].sum() > 30_000
+    registry.set_popularity("User_Information", np.random.default_rng(4), 0)
+    assert np.sort(np.bincount(registry.sample("User_Information", rng, 100_000)))[-10:].sum() < 2_000
+
+
+def test_strings_of_slices_and_index_arrays_match():
+    registry = KeyRegistry()
+    registry.add_uuids("User_Information", random_uuids(np.random.default_rng(5), 20))
+    assert list(registry.uuid_strings("User_Information", slice(3, 6))) == \
+        list(registry.uuid_strings("User_Information", np.array([3, 4, 5])))
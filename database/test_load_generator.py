@@ -0,0 +1,51 @@
+"""
+Checks of load_generator.py that need no database: the --mix and --stages arguments and the summary.
+
+Usage:
+    python -m pytest -q database
+"""
+import argparse
+import asyncio
+import time
+
+import pytest
+
+import load_generator
+import seed_loader
+
+
+def test_default_mix_runs_every_operation():
+    assert set(load_generator.DEFAULT_MIX) == set(load_generator.OPERATIONS)
+
+
+def test_mix_and_stages_are_parsed():
+    assert load_generator.parse_mix("search=50,cart_add=2.5") == {"search": 50.0, "cart_add": 2.5}
+    assert load_generator.parse_stages("60:20,120:200") == [(60.0, 20.0), (120.0, 200.0)]
+    for parse, text in ((load_generator.parse_mix, "checkout=5"), (load_generator.parse_mix, "search=-1"),
+                        (load_generator.parse_stages, "60")):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse(text)
+
+
+def test_summary_counts_errors_and_drops_against_all_requests():
+    async def ok():
+        pass
+
+    async def failing():
+        raise seed_loader.psycopg.errors.QueryCanceled("canceling statement due to statement timeout")
+
+    recorder = load_generator.Recorder(["search", "chat_send"])
+
+    async def run():
+        for coroutine in (ok(), ok(), failing()):
+            await recorder.track(coroutine, "search", time.perf_counter())
+
+    asyncio.run(run())
+    recorder.dropped["search"] = 1
+    summary = recorder.summary(seconds=2.0)
+    assert list(summary) == ["search"]
+    search = summary["search"]
+    assert (search["requests"], search["ok"], search["errors"], search["dropped"]) == (4, 2, 1, 1)
+    assert search["error_rate"] == 0.5 and search["throughput_per_second"] == 1.0
+    assert search["error_messages"] == {"canceling statement due to statement timeout": 1}
+    assert search["p50_ms"] <= search["max_ms"]
@@ -0,0 +1,40 @@
+"""
+Checks of seed_loader.py that need no database: SQL file splitting and the COPY text of JSON columns.
+
+Usage:
+    python -m pytest -q database
+"""
+import json
+
+import pandas as pd
+
+import generate_temp_users
+import seed_loader
+
+
+def test_split_sql_ignores_semicolons_in_comments_strings_and_bodies():
+    text = """
+    -- a comment; with a semicolon
+    SELECT 'a;b', 'it''s; fine';
+    CREATE FUNCTION f() RETURNS void LANGUAGE plpgsql AS $$
+    BEGIN
+      PERFORM 1;
+    END;
+    $$;
+    DO $body$ BEGIN PERFORM 2; END $body$
+    """
+    statements = seed_loader.split_sql(text)
+    assert len(statements) == 3
+    assert statements[0] == "SELECT 'a;b', 'it''s; fine'"
+    assert statements[1].endswith("$$") and "PERFORM 1;" in statements[1]
+    assert statements[2].startswith("DO $body$")
+
+
+def test_json_columns_are_copied_as_json_text():
+    text = seed_loader.as_json_text(pd.Series(['["a.jpg"]', None, ["b.jpg"]], dtype=object))
+    assert text[0] == '["a.jpg"]' and pd.isna(text[1]) and text[2] == json.dumps(["b.jpg"])
+    assert list(seed_loader.as_json_text(pd.Series([True, False]))) == ["true", "false"]
+
+
+def test_load_order_covers_every_generated_table():
+    assert sorted(seed_loader.LOAD_ORDER) == sorted(generate_temp_users.TABLE_NAMES)
@@ -0,0 +1,33 @@
+"""
+Checks of table_io.py: chunked writes and reads of every format, and finding a table's file.
+
+Usage:
+    python -m pytest -q database
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import table_io
+
+
+@pytest.mark.parametrize("output_format", table_io.FORMATS)
+def test_table_files_round_trip(tmp_path, output_format):
+    if output_format != "csv":
+        pytest.importorskip("pyarrow")
+    chunks = [pd.DataFrame({"id": np.arange(start, start + 5), "title": [f"t{i}" for i in range(5)]})
+              for start in (0, 5, 10)]
+    rows, _ = table_io.write_table(str(tmp_path), "Reviews", iter(chunks), output_format)
+    assert rows == 15
+    read = table_io.read_tables(str(tmp_path), ["Reviews", "Chats"], chunk_size=4)
+    result = pd.concat(list(read["Reviews"]), ignore_index=True)
+    pd.testing.assert_frame_equal(result, pd.concat(chunks, ignore_index=True), check_dtype=False)
+    assert list(read["Chats"]) == []
+
+
+def test_find_table_refuses_a_table_in_two_formats(tmp_path):
+    for output_format in ("csv", "arrow"):
+        (tmp_path / f"Reviews.{output_format}").write_text("")
+    assert table_io.find_table(str(tmp_path), "Chats") == (None, None)
+    with pytest.raises(ValueError, match="Reviews"):
+        table_io.find_table(str(tmp_path), "Reviews")
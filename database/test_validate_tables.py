@@ -0,0 +1,44 @@
+"""
+Checks of validate_tables.py: the constraints parsed from schema.sql and the violations it reports.
+
+Usage:
+    python -m pytest -q database
+"""
+import pandas as pd
+
+import generate_temp_users
+import validate_tables
+
+
+def checks(violations):
+    return {(violation["table"], violation["check"]) for violation in violations}
+
+
+def test_generated_tables_pass_validation(tmp_path):
+    generate_temp_users.main(["--rows", "200", "--seed", "3", "--validate", "--out-dir", str(tmp_path)])
+
+
+def test_validation_finds_duplicate_keys_and_dangling_references():
+    users = pd.DataFrame({"id": [0, 1], "supabase_id": ["a", "a"], "email": ["x", "y"], "created_at": ["t", "t"]})
+    chats = pd.DataFrame({"id": [0], "user_id_1": ["a"], "user_id_2": ["b"], "created_at": ["t"]})
+    violations = validate_tables.validate_tables({"User_Information": iter([users]), "Chats": iter([chats])},
+                                                 order=["User_Information", "Chats"])
+    assert ("User_Information", "UNIQUE") in checks(violations)
+    assert ("Chats", "FOREIGN KEY to User_Information.supabase_id") in checks(violations)
+
+
+def test_constraints_are_parsed_from_the_schema():
+    constraints = validate_tables.parse_constraints()
+    cart = constraints["Shopping_Cart_Products"]
+    assert ("shopping_cart_id", "product_id") in cart["unique"]
+    assert ("product_id", "Product_Information", "id") in cart["foreign_keys"]
+    assert ("shopping_cart_id", False) in cart["required"]
+
+
+def test_existing_rows_are_referenced_and_not_duplicated():
+    existing = {"User_Information": iter([pd.DataFrame({"id": [0], "supabase_id": ["a"], "email": ["x"]})])}
+    users = pd.DataFrame({"id": [1], "supabase_id": ["a"], "email": ["y"], "created_at": ["t"]})
+    reviews = pd.DataFrame({"created_by_id": ["a"], "created_on_id": ["a"], "rating": [7.5]})
+    violations = validate_tables.validate_tables({"User_Information": iter([users]), "Reviews": iter([reviews])},
+                                                 order=["User_Information", "Reviews"], existing=existing)
+    assert checks(violations) == {("User_Information", "UNIQUE"), ("Reviews", "outside 0..5")}
@@ -1,24 +1,311 @@
+-- Ratings are kept as a running sum and count so a review only touches its seller's row, and
+-- rating is their quotient (the same value as AVG over the seller's reviews, NULL ratings ignored).
+ALTER TABLE mru_dev."User_Information"
+  ADD COLUMN IF NOT EXISTS rating_sum double precision NOT NULL DEFAULT 0,
+  ADD COLUMN IF NOT EXISTS rating_count bigint NOT NULL DEFAULT 0;
+
+-- full recount, run once after adding the columns and after loads that bypass the triggers
+CREATE OR REPLACE FUNCTION mru_dev.recompute_user_ratings()
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = mru_dev
+AS $$
+BEGIN
+  update mru_dev."User_Information" u
+  SET rating_sum = r.rating_sum,
+      rating_count = r.rating_count,
+      rating = r.rating_sum / nullif(r.rating_count, 0)
+  FROM (
+    SELECT ui.supabase_id, coalesce(sum(rv.rating::float8), 0) rating_sum, count(rv.rating) rating_count
+    FROM mru_dev."User_Information" ui
+    LEFT JOIN mru_dev."Reviews" rv ON rv.created_on_id = ui.supabase_id
+    GROUP BY ui.supabase_id
+  ) r
+  WHERE u.supabase_id = r.supabase_id;
+END;
+$$;
+
+-- a full rebuild: only the owner runs it (seed_loader.py), not clients through the RPC endpoint
+REVOKE EXECUTE ON FUNCTION mru_dev.recompute_user_ratings() FROM PUBLIC, anon, authenticated;
+
+SELECT mru_dev.recompute_user_ratings();
+
+-- row mode: O(1) per review, for the app's one-at-a-time inserts
 CREATE OR REPLACE FUNCTION mru_dev.update_user_rating()
 RETURNS trigger
 LANGUAGE plpgsql
 SECURITY DEFINER
 SET search_path = mru_dev
 AS $$
-DECLARE 
-  average_rating float4;
 BEGIN
-  SELECT AVG(rating) INTO average_rating FROM mru_dev."Reviews" WHERE created_on_id=new.created_on_id;
-  update mru_dev."User_Information"
-  SET rating = average_rating
-  WHERE supabase_id = new.created_on_id;
+  IF TG_OP IN ('UPDATE', 'DELETE') AND old.rating IS NOT NULL THEN
+    update mru_dev."User_Information"
+    SET rating_sum = rating_sum - old.rating,
+        rating_count = rating_count - 1,
+        rating = (rating_sum - old.rating) / nullif(rating_count - 1, 0)
+    WHERE supabase_id = old.created_on_id;
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') AND new.rating IS NOT NULL THEN
+    update mru_dev."User_Information"
+    SET rating_sum = rating_sum + new.rating,
+        rating_count = rating_count + 1,
+        rating = (rating_sum + new.rating) / (rating_count + 1)
+    WHERE supabase_id = new.created_on_id;
+  END IF;
+
+  RETURN NULL;
+END;
+$$;
+
+-- statement mode: one update per seller per statement, for bulk inserts such as the generated Reviews.
+-- Transition tables need one trigger per event, each one only sees the tables it declares.
+CREATE OR REPLACE FUNCTION mru_dev.update_user_ratings()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = mru_dev
+AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    update mru_dev."User_Information" u
+    SET rating_sum = u.rating_sum + d.rating_sum,
+        rating_count = u.rating_count + d.rating_count,
+        rating = (u.rating_sum + d.rating_sum) / nullif(u.rating_count + d.rating_count, 0)
+    FROM (
+      SELECT created_on_id, sum(rating::float8) rating_sum, count(rating) rating_count
+      FROM new_reviews GROUP BY created_on_id
+    ) d
+    WHERE u.supabase_id = d.created_on_id AND d.rating_count > 0;
+  ELSIF TG_OP = 'DELETE' THEN
+    update mru_dev."User_Information" u
+    SET rating_sum = u.rating_sum - d.rating_sum,
+        rating_count = u.rating_count - d.rating_count,
+        rating = (u.rating_sum - d.rating_sum) / nullif(u.rating_count - d.rating_count, 0)
+    FROM (
+      SELECT created_on_id, sum(rating::float8) rating_sum, count(rating) rating_count
+      FROM old_reviews GROUP BY created_on_id
+    ) d
+    WHERE u.supabase_id = d.created_on_id AND d.rating_count > 0;
+  ELSE
+    update mru_dev."User_Information" u
+    SET rating_sum = u.rating_sum + d.rating_sum,
+        rating_count = u.rating_count + d.rating_count,
+        rating = (u.rating_sum + d.rating_sum) / nullif(u.rating_count + d.rating_count, 0)
+    FROM (
+      SELECT created_on_id, sum(rating_sum) rating_sum, sum(rating_count) rating_count
+      FROM (
+        SELECT created_on_id, rating::float8 rating_sum, 1 rating_count FROM new_reviews WHERE rating IS NOT NULL
+        UNION ALL
+        SELECT created_on_id, -rating::float8, -1 FROM old_reviews WHERE rating IS NOT NULL
+      ) changes
+      GROUP BY created_on_id
+    ) d
+    WHERE u.supabase_id = d.created_on_id AND (d.rating_sum <> 0 OR d.rating_count <> 0);
+  END IF;
+
+  RETURN NULL;
+END;
+$$;
+
+-- mode is 'row', 'statement' or 'none', installing one drops the others so a review is never counted twice
+CREATE OR REPLACE FUNCTION mru_dev.set_rating_trigger_mode(mode text)
+RETURNS void
+LANGUAGE plpgsql
+SET search_path = mru_dev
+AS $$
+BEGIN
+  DROP TRIGGER IF EXISTS on_rating_update ON mru_dev."Reviews";
+  DROP TRIGGER IF EXISTS on_rating_insert ON mru_dev."Reviews";
+  DROP TRIGGER IF EXISTS on_rating_change ON mru_dev."Reviews";
+  DROP TRIGGER IF EXISTS on_rating_delete ON mru_dev."Reviews";
+
+  IF mode = 'row' THEN
+    create trigger on_rating_update
+    after insert or update of rating, created_on_id or delete on mru_dev."Reviews" for each row
+    execute function mru_dev.update_user_rating();
+  ELSIF mode = 'statement' THEN
+    create trigger on_rating_insert
+    after insert on mru_dev."Reviews" referencing new table as new_reviews for each statement
+    execute function mru_dev.update_user_ratings();
+    create trigger on_rating_change
+    after update on mru_dev."Reviews" referencing old table as old_reviews new table as new_reviews for each statement
+    execute function mru_dev.update_user_ratings();
+    create trigger on_rating_delete
+    after delete on mru_dev."Reviews" referencing old table as old_reviews for each statement
+    execute function mru_dev.update_user_ratings();
+  ELSIF mode <> 'none' THEN
+    RAISE EXCEPTION 'unknown rating trigger mode %, expected row, statement or none', mode;
+  END IF;
+END;
+$$;
+
+SELECT mru_dev.set_rating_trigger_mode('row');
+
+-- The MessagingPage inbox reads one row per chat and participant with the chat's last message and the
+-- participant's unread count, instead of scanning every message of every chat for the last one.
+CREATE TABLE IF NOT EXISTS mru_dev."Chat_Inbox" (
+  chat_id bigint NOT NULL,
+  user_id uuid NOT NULL,
+  other_user_id uuid null,
+  last_message_id bigint null,
+  last_message character varying null,
+  last_message_at timestamp with time zone null,
+  unread_count bigint NOT NULL DEFAULT 0,
+  last_read_at timestamp with time zone NOT NULL DEFAULT '-infinity',
+  CONSTRAINT Chat_Inbox_pkey PRIMARY KEY (user_id, chat_id),
+  CONSTRAINT Chat_Inbox_chat_id_fkey FOREIGN KEY (chat_id) REFERENCES mru_dev."Chats" (id) ON UPDATE CASCADE ON DELETE CASCADE,
+  CONSTRAINT Chat_Inbox_user_id_fkey FOREIGN KEY (user_id) REFERENCES mru_dev."User_Information" (supabase_id) ON UPDATE CASCADE ON DELETE CASCADE,
+  CONSTRAINT Chat_Inbox_other_user_id_fkey FOREIGN KEY (other_user_id) REFERENCES mru_dev."User_Information" (supabase_id) ON UPDATE CASCADE ON DELETE SET NULL
+);
+
+CREATE INDEX IF NOT EXISTS chat_inbox_user_id_last_message_at_index ON mru_dev."Chat_Inbox" USING btree (user_id, last_message_at DESC NULLS LAST);
+
+-- only read through the "users can read their inbox" policy (see rls_policies.sql)
+ALTER TABLE mru_dev."Chat_Inbox" ENABLE ROW LEVEL SECURITY;
+CREATE INDEX IF NOT EXISTS messages_chat_id_created_at_index ON mru_dev."Messages" USING btree (chat_id, created_at DESC, id DESC);
+
+-- full rebuild of the inbox rows of `chat_ids` (every chat when NULL), run once after creating the table
+-- and after loads that bypass the triggers. Read positions (last_read_at) are kept.
+CREATE OR REPLACE FUNCTION mru_dev.recompute_chat_inbox(chat_ids bigint[] DEFAULT NULL)
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = mru_dev
+AS $$
+BEGIN
+  delete from mru_dev."Chat_Inbox" i
+  WHERE (chat_ids IS NULL OR i.chat_id = ANY(chat_ids))
+    AND NOT EXISTS (
+      SELECT 1 FROM mru_dev."Chats" c WHERE c.id = i.chat_id AND i.user_id IN (c.user_id_1, c.user_id_2)
+    );
+
+  insert into mru_dev."Chat_Inbox" AS i
+    (chat_id, user_id, other_user_id, last_message_id, last_message, last_message_at, unread_count)
+  WITH participants AS (
+    SELECT DISTINCT c.id chat_id, p.user_id, p.other_user_id, coalesce(ci.last_read_at, '-infinity') last_read_at
+    FROM mru_dev."Chats" c
+    CROSS JOIN LATERAL (VALUES (c.user_id_1, c.user_id_2), (c.user_id_2, c.user_id_1)) p(user_id, other_user_id)
+    LEFT JOIN mru_dev."Chat_Inbox" ci ON ci.chat_id = c.id AND ci.user_id = p.user_id
+    WHERE p.user_id IS NOT NULL AND (chat_ids IS NULL OR c.id = ANY(chat_ids))
+  ), last_messages AS (
+    SELECT DISTINCT ON (m.chat_id) m.chat_id, m.id, m.logged_message, m.created_at
+    FROM mru_dev."Messages" m
+    WHERE m.chat_id IS NOT NULL AND m.visible AND (chat_ids IS NULL OR m.chat_id = ANY(chat_ids))
+    ORDER BY m.chat_id, m.created_at DESC, m.id DESC
+  ), unread AS (
+    SELECT p.chat_id, p.user_id, count(*) unread_count
+    FROM participants p
+    JOIN mru_dev."Messages" m ON m.chat_id = p.chat_id
+    WHERE m.visible AND m.sender_id IS DISTINCT FROM p.user_id AND m.created_at > p.last_read_at
+    GROUP BY p.chat_id, p.user_id
+  )
+  SELECT p.chat_id, p.user_id, p.other_user_id, lm.id, lm.logged_message, lm.created_at, coalesce(u.unread_count, 0)
+  FROM participants p
+  LEFT JOIN last_messages lm ON lm.chat_id = p.chat_id
+  LEFT JOIN unread u ON u.chat_id = p.chat_id AND u.user_id = p.user_id
+  ON CONFLICT (user_id, chat_id) DO UPDATE
+  SET other_user_id = excluded.other_user_id,
+      last_message_id = excluded.last_message_id,
+      last_message = excluded.last_message,
+      last_message_at = excluded.last_message_at,
+      unread_count = excluded.unread_count;
+END;
+$$;
+
+-- a full rebuild: only the owner (seed_loader.py, archive_messages.py) and the SECURITY DEFINER triggers and
+-- functions of this file run it, not clients through the RPC endpoint
+REVOKE EXECUTE ON FUNCTION mru_dev.recompute_chat_inbox(bigint[]) FROM PUBLIC, anon, authenticated;
+
+-- O(1) per message: an insert bumps both participants' rows, an edit or delete takes the old message out
+-- first and only looks up the chat's new last message (on messages_chat_id_created_at_index) when the
+-- old one was it. Hidden messages (visible is not true) are left out, as in get_chat_messages_page()
+CREATE OR REPLACE FUNCTION mru_dev.update_chat_inbox()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = mru_dev
+AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') AND old.chat_id IS NOT NULL AND old.visible THEN
+    update mru_dev."Chat_Inbox"
+    SET unread_count = unread_count - 1
+    WHERE chat_id = old.chat_id AND user_id IS DISTINCT FROM old.sender_id AND old.created_at > last_read_at;
+
+    update mru_dev."Chat_Inbox" i
+    SET last_message_id = lm.id,
+        last_message = lm.logged_message,
+        last_message_at = lm.created_at
+    FROM (SELECT old.chat_id) c(chat_id)
+    LEFT JOIN LATERAL (
+      SELECT m.id, m.logged_message, m.created_at
+      FROM mru_dev."Messages" m
+      WHERE m.chat_id = c.chat_id AND m.visible
+      ORDER BY m.created_at DESC, m.id DESC
+      LIMIT 1
+    ) lm ON TRUE
+    WHERE i.chat_id = old.chat_id AND i.last_message_id = old.id;
+  END IF;
 
-  RETURN new;
+  IF TG_OP IN ('INSERT', 'UPDATE') AND new.chat_id IS NOT NULL AND new.visible THEN
+    insert into mru_dev."Chat_Inbox" AS i
+      (chat_id, user_id, other_user_id, last_message_id, last_message, last_message_at, unread_count)
+    SELECT DISTINCT c.id, p.user_id, p.other_user_id, new.id, new.logged_message, new.created_at,
+           (p.user_id IS DISTINCT FROM new.sender_id)::int
+    FROM mru_dev."Chats" c
+    CROSS JOIN LATERAL (VALUES (c.user_id_1, c.user_id_2), (c.user_id_2, c.user_id_1)) p(user_id, other_user_id)
+    WHERE c.id = new.chat_id AND p.user_id IS NOT NULL
+    ON CONFLICT (user_id, chat_id) DO UPDATE
+    SET unread_count = i.unread_count + CASE WHEN new.created_at > i.last_read_at THEN excluded.unread_count ELSE 0 END,
+        last_message_id = CASE WHEN i.last_message_at IS NULL OR new.created_at >= i.last_message_at
+                               THEN new.id ELSE i.last_message_id END,
+        last_message = CASE WHEN i.last_message_at IS NULL OR new.created_at >= i.last_message_at
+                            THEN new.logged_message ELSE i.last_message END,
+        last_message_at = greatest(i.last_message_at, new.created_at);
+  END IF;
+
+  RETURN NULL;
 END;
 $$;
 
-create or replace trigger on_rating_update
-after insert on mru_dev."Reviews" for each row
-execute function mru_dev.update_user_rating();
+-- a chat that changes hands gets its inbox rows rebuilt
+CREATE OR REPLACE FUNCTION mru_dev.update_chat_inbox_participants()
+RETURNS trigger
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = mru_dev
+AS $$
+BEGIN
+  PERFORM mru_dev.recompute_chat_inbox(ARRAY[new.id]);
+  RETURN NULL;
+END;
+$$;
+
+-- called by the MessagingPage when a chat is opened
+CREATE OR REPLACE FUNCTION mru_dev.mark_chat_read(chat bigint)
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = mru_dev
+AS $$
+BEGIN
+  update mru_dev."Chat_Inbox"
+  SET unread_count = 0,
+      last_read_at = now()
+  WHERE chat_id = chat AND user_id = auth.uid();
+END;
+$$;
+
+SELECT mru_dev.recompute_chat_inbox();
+
+create or replace trigger on_message_change
+after insert or update of chat_id, sender_id, logged_message, created_at, visible or delete on mru_dev."Messages" for each row
+execute function mru_dev.update_chat_inbox();
+
+create or replace trigger on_chat_participants_change
+after update of user_id_1, user_id_2 on mru_dev."Chats" for each row
+when (old.user_id_1 IS DISTINCT FROM new.user_id_1 OR old.user_id_2 IS DISTINCT FROM new.user_id_2)
+execute function mru_dev.update_chat_inbox_participants();
 
 CREATE OR REPLACE FUNCTION mru_dev.create_shopping_cart()
 RETURNS trigger
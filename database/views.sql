@@ -1,24 +1,20 @@
 --get_chats_for_user
+-- one row per chat from mru_dev."Chat_Inbox", which the Messages triggers keep up to date, so the cost
+-- follows the user's number of chats instead of the number of messages in them
 CREATE OR REPLACE VIEW public.get_chats_for_user 
   WITH (security_invoker = true) AS
 SELECT 
   ui2.first_name first_name, 
   ui2.last_name last_name, 
-  lm.logged_message last_message, 
-  lm.created_at created_at
-FROM mru_dev."Messages" m
-JOIN mru_dev."Chats" c ON m.chat_id = c.id
-JOIN mru_dev."User_Information" ui1 ON c.user_id_1 = ui1.supabase_id
-JOIN mru_dev."User_Information" ui2 ON c.user_id_2 = ui2.supabase_id
-LEFT JOIN LATERAL (
-  SELECT m.logged_message, m.created_at
-  FROM mru_dev."Messages" m
-  WHERE m.chat_id = c.id
-  ORDER BY m.created_at DESC
-  LIMIT 1
-) lm ON TRUE
-WHERE ui1.supabase_id = auth.uid()
-ORDER BY m.created_at DESC NULLS LAST;
+  ci.last_message last_message, 
+  ci.last_message_at created_at,
+  ci.unread_count unread_count,
+  ci.chat_id chat_id
+FROM mru_dev."Chat_Inbox" ci
+JOIN mru_dev."Chats" c ON ci.chat_id = c.id
+JOIN mru_dev."User_Information" ui2 ON ci.other_user_id = ui2.supabase_id
+WHERE ci.user_id = auth.uid() AND ci.last_message_at IS NOT NULL
+ORDER BY ci.last_message_at DESC NULLS LAST;
 
 
 --get_chat_messages_for_user
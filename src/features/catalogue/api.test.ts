@@ -1,6 +1,7 @@
 import { describe, it, vi, expect } from 'vitest';
-import { mockQuery } from '@shared/tests';
+import { mockQuery, mockRpc } from '@shared/tests';
 import { CategoryCatalogue, ProductCatalogue } from '@features/catalogue';
+import { supabase } from '@shared/api';
 
 describe('Category Tag Catalogue', () => {
   it('returns all category tags', async () => {
@@ -100,14 +101,18 @@ describe('Product Catalogue', () => {
     expect(result.ok, 'getBySeller() failed').toBe(true);
   });
 
+  it('returns a page of products', async () => {
+    mockRpc(Promise.resolve({ data: new Array<object>(), error: null }));
+
+    const after = { id: 0, created_at: '2025-01-01T00:00:00Z' };
+    const query = ProductCatalogue.getPage(after);
+    const result = await query;
+
+    expect(result.ok, 'getPage() failed').toBe(true);
+  });
+
   it('returns products by search query', async () => {
-    mockQuery({
-      select: vi.fn().mockReturnValue({
-        or: vi
-          .fn()
-          .mockResolvedValue({ data: new Array<object>(), error: null }),
-      }),
-    });
+    mockRpc(Promise.resolve({ data: new Array<object>(), error: null }));
 
     const text = 'abc textbook';
     const query = ProductCatalogue.getBySearch(text);
@@ -116,6 +121,19 @@ describe('Product Catalogue', () => {
     expect(result.ok, 'getBySearch() failed').toBe(true);
   });
 
+  it('returns a later page of products by search query', async () => {
+    mockRpc(Promise.resolve({ data: new Array<object>(), error: null }));
+
+    const query = ProductCatalogue.getBySearch('abc textbook', [1], 2, 20);
+    const result = await query;
+
+    expect(result.ok, 'getBySearch() failed').toBe(true);
+    expect(supabase.rpc).toHaveBeenCalledWith(
+      'search_products',
+      expect.objectContaining({ result_limit: 20, result_offset: 40 }),
+    );
+  });
+
   it('returns products by filter', () => {
     const filter = ProductCatalogue.getByFilter();
     const form = new FormData();
@@ -148,13 +148,35 @@ interface ProductCatalogue {
   ) => DatabaseQuery<Product[], '*'>;
 
   /**
-   * Retrieves products by the given search query.
+   * Retrieves a page of listed products, newest first.
+   * Pages by cursor instead of offset, so later pages cost the same as the first.
+   *
+   * @param after the last product of the previous page, if any
+   * @param size the number of products per page
+   * @returns the {@link Promise} that resolves to the corresponding products
+   */
+  getPage: (
+    after?: RequireProperty<Product, 'id' | 'created_at'>,
+    size?: number,
+  ) => DatabaseQuery<Product[], '*'>;
+
+  /**
+   * Retrieves listed products by the given search query, best matches first.
+   * Every word of the query matches as a prefix of a title or description word.
    * Selects all columns.
    *
    * @param text the given search query
+   * @param categories the category tag identifiers to search within, if any
+   * @param page the zero-based page of results, the first by default
+   * @param size the number of products per page, 50 by default
    * @returns the {@link Promise} that resolves the corresponding products
    */
-  getBySearch: (text: string) => DatabaseQuery<Product[], '*'>;
+  getBySearch: (
+    text: string,
+    categories?: number[],
+    page?: number,
+    size?: number,
+  ) => DatabaseQuery<Product[], '*'>;
 
   /**
    * Retrieves products by filters.
@@ -212,13 +234,33 @@ export const ProductCatalogue: ProductCatalogue = {
         .eq('user_id', seller.supabase_id),
     );
   },
-  async getBySearch(text: string): DatabaseQuery<Product[], '*'> {
-    const search = text.replace(/[%_\\]/g, '\\$&'); // prevents sql injection
+  async getPage(
+    after?: RequireProperty<Product, 'id' | 'created_at'>,
+    size = 24,
+  ): DatabaseQuery<Product[], '*'> {
+    // keyset pagination, see database/pagination.sql
     return query(
-      await supabase
-        .from('Product_Information')
-        .select('*')
-        .or(`title.ilike.%${search}%,content.ilike.%${search}%`),
+      await supabase.rpc('get_products_page', {
+        after_created_at: after?.created_at,
+        after_id: after?.id,
+        page_size: size,
+      }),
+    );
+  },
+  async getBySearch(
+    text: string,
+    categories?: number[],
+    page = 0,
+    size = 50,
+  ): DatabaseQuery<Product[], '*'> {
+    // ranked full text search, see database/product_search.sql
+    return query(
+      await supabase.rpc('search_products', {
+        search: text,
+        category_ids: categories?.length ? categories : undefined,
+        result_limit: size,
+        result_offset: page * size,
+      }),
     );
   },
   getByFilter(): ProductFilterBuilder {
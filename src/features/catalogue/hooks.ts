@@ -268,7 +268,7 @@ type UseProductSearchResult = DatabaseQueryResult<Product[], '*'>;
  * @author Ramos Jacosalem (cjaco906)
  * @see {@link ProductCatalogue.getBySearch()} for more information
  */
-export function useProductSearch(text: string): UseProductSearch {
+export function useProductSearch(text: string, page = 0): UseProductSearch {
   const [loading, setLoading] = useState<boolean>(true);
   const [result, setResult] = useState<UseProductSearchResult>(() =>
     err('No products found'),
@@ -276,13 +276,14 @@ export function useProductSearch(text: string): UseProductSearch {
 
   /**
    * Loads the products that matches the search query once per invocation.
-   * Updates the hook state when its dependencies (i.e., text) changes state.
+   * Updates the hook state when its dependencies (i.e., text, page) changes state.
    */
   useEffect(() => {
-    void HookUtils.load(setLoading, ProductCatalogue.getBySearch(text)).then(
-      setResult,
-    );
-  }, [text]);
+    void HookUtils.load(
+      setLoading,
+      ProductCatalogue.getBySearch(text, undefined, page),
+    ).then(setResult);
+  }, [text, page]);
 
   return {
     loading,
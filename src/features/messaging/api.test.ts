@@ -1,5 +1,5 @@
 import { describe, expect, it, vi } from 'vitest';
-import { mockChannel, mockQuery } from '@shared/tests';
+import { mockChannel, mockQuery, mockRpc } from '@shared/tests';
 import { UserChatting, UserMessaging } from '@features/messaging';
 
 describe('User Chat', () => {
@@ -141,6 +141,17 @@ describe('User Messaging', () => {
     expect(result.ok, 'getByChat() failed').toBe(true);
   });
 
+  it('returns a page of user messages from a user chat', async () => {
+    mockRpc(Promise.resolve({ data: new Array<object>(), error: null }));
+
+    const chat = { id: 0 };
+    const before = { id: 0, created_at: '2025-01-01T00:00:00Z' };
+    const query = UserMessaging.getPageByChat(chat, before);
+    const result = await query;
+
+    expect(result.ok, 'getPageByChat() failed').toBe(true);
+  });
+
   it('sends a user message', async () => {
     mockQuery({
       insert: vi.fn().mockReturnValue({
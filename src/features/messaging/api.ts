@@ -212,6 +212,21 @@ interface UserMessaging {
     chat: RequireProperty<UserChat, 'id'>,
   ) => DatabaseQuery<UserMessage[], '*'>;
 
+  /**
+   * Retrieves a page of user messages from the given chat, newest first.
+   * Pages by cursor instead of offset, so older pages cost the same as the latest.
+   *
+   * @param chat the given chat identifier
+   * @param before the oldest user message of the previous page, if any
+   * @param size the number of user messages per page
+   * @returns the {@link Promise} that resolves to the corresponding user messages
+   */
+  getPageByChat: (
+    chat: RequireProperty<UserChat, 'id'>,
+    before?: RequireProperty<UserMessage, 'id' | 'created_at'>,
+    size?: number,
+  ) => DatabaseQuery<UserMessage[], '*'>;
+
   /**
    * Sends the given user message from the given chat.
    *
@@ -302,6 +317,21 @@ export const UserMessaging: UserMessaging = {
         .order('created_at', { ascending: true }),
     );
   },
+  async getPageByChat(
+    chat: RequireProperty<UserChat, 'id'>,
+    before?: RequireProperty<UserMessage, 'id' | 'created_at'>,
+    size = 50,
+  ): DatabaseQuery<UserMessage[], '*'> {
+    // keyset pagination, see database/pagination.sql
+    return query(
+      await supabase.rpc('get_chat_messages_page', {
+        chat: chat.id,
+        before_created_at: before?.created_at,
+        before_id: before?.id,
+        page_size: size,
+      }),
+    );
+  },
   async send(
     chat: RequireProperty<UserChat, 'id'>,
     user: RequireProperty<UserProfile, 'supabase_id'>,
@@ -80,15 +80,18 @@ export default function HomePage() {
    *  image: string[] The array containing image paths.
    * @returns An array of the image urls.
    */
-  function getImageUrls(imageData: { images: string[] }): string[] | null {
+  function getImageUrls(imageData: {
+    images: string[];
+    thumbnails?: string[];
+  }): string[] | null {
 
     try {
 
       // Create an array.
       const imagesArray = [];
 
-      // For every image,
-      for (const imagePath of imageData.images) {
+      // For every image, the small thumbnails where a product has them,
+      for (const imagePath of imageData.thumbnails ?? imageData.images) {
 
         if (!imagePath) return null;
 
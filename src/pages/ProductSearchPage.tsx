@@ -20,6 +20,9 @@ interface Category {
   description: string | null;
 }
 
+// search results per page, search_products() is asked for one more to know whether a next page exists
+const SEARCH_PAGE_SIZE = 50;
+
 export default function ProductSearchPage() {
   const navigate = useNavigate();
   const [products, setProducts] = useState<Product[]>(() => {
@@ -34,6 +37,8 @@ export default function ProductSearchPage() {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [searchQuery, setSearchQuery] = useState('');
+  const [searchPage, setSearchPage] = useState(0);
+  const [hasNextPage, setHasNextPage] = useState(false);
 
   useEffect(() => {
     if (categories.length === 0) fetchCategories();
@@ -75,6 +80,8 @@ export default function ProductSearchPage() {
     try {
       setLoading(true);
       setError(null);
+      setSearchPage(0);
+      setHasNextPage(false);
 
       let query = supabase
         .from('Product_Information')
@@ -126,45 +133,34 @@ export default function ProductSearchPage() {
       return;
     }
 
+    searchProducts(0);
+  };
+
+  const searchProducts = async (page: number) => {
     try {
       setLoading(true);
       setError(null);
 
-      let query = supabase
-        .from('Product_Information')
-        .select('*')
-        .eq('"isListed"', true)
-        .eq('"isDeleted"', false)
-        .or(`title.ilike.%${searchQuery}%,description.ilike.%${searchQuery}%`);
-
-      if (selectedCategories.length > 0) {
-        const { data: categoryProducts, error: categoryError } = await supabase
-          .from('Category_Assigned_Products')
-          .select('product_id')
-          .in('category_id', selectedCategories);
-
-        if (categoryError) throw categoryError;
-
-        const productIds = categoryProducts?.map((cp) => cp.product_id) || [];
-
-        if (productIds.length > 0) {
-          query = query.in('id', productIds);
-        } else {
-          setProducts([]);
-          setLoading(false);
-          return;
-        }
-      }
-
-      const { data, error: searchError } = await query.order('created_at', {
-        ascending: false,
-      });
+      // ranked full text search, see database/product_search.sql
+      const { data, error: searchError } = await supabase.rpc(
+        'search_products',
+        {
+          search: searchQuery,
+          category_ids:
+            selectedCategories.length > 0 ? selectedCategories : undefined,
+          result_limit: SEARCH_PAGE_SIZE + 1,
+          result_offset: page * SEARCH_PAGE_SIZE,
+        },
+      );
 
       if (searchError) {
         throw searchError;
       }
 
-      setProducts(data || []);
+      const rows = data || [];
+      setProducts(rows.slice(0, SEARCH_PAGE_SIZE));
+      setHasNextPage(rows.length > SEARCH_PAGE_SIZE);
+      setSearchPage(page);
     } catch (err: any) {
       console.error('Error searching products:', err);
       setError(err?.message || 'Failed to search products');
@@ -183,15 +179,18 @@ export default function ProductSearchPage() {
     });
   };
 
-  function getImageUrls(imageData: { images: string[] }): string[] | null {
+  function getImageUrls(imageData: {
+    images: string[];
+    thumbnails?: string[];
+  }): string[] | null {
 
     try {
 
       // Create an array.
       const imagesArray = [];
 
-      // For every image,
-      for (const imagePath of imageData.images) {
+      // For every image, the small thumbnails where a product has them,
+      for (const imagePath of imageData.thumbnails ?? imageData.images) {
 
         if (!imagePath) return null;
 
@@ -560,6 +559,48 @@ export default function ProductSearchPage() {
                 </button>
               );
             })}
+
+          {!loading && !error && (searchPage > 0 || hasNextPage) && (
+            <div
+              style={{
+                gridColumn: '1 / -1',
+                display: 'flex',
+                justifyContent: 'center',
+                alignItems: 'center',
+                gap: '1rem',
+              }}
+            >
+              <button
+                onClick={() => searchProducts(searchPage - 1)}
+                disabled={searchPage === 0}
+                style={{
+                  padding: '0.5rem 1rem',
+                  backgroundColor: searchPage === 0 ? '#9CA3AF' : '#007FB5',
+                  color: 'white',
+                  border: 'none',
+                  borderRadius: '6px',
+                  cursor: searchPage === 0 ? 'default' : 'pointer',
+                }}
+              >
+                Previous
+              </button>
+              <span style={{ color: '#6B7280' }}>Page {searchPage + 1}</span>
+              <button
+                onClick={() => searchProducts(searchPage + 1)}
+                disabled={!hasNextPage}
+                style={{
+                  padding: '0.5rem 1rem',
+                  backgroundColor: hasNextPage ? '#007FB5' : '#9CA3AF',
+                  color: 'white',
+                  border: 'none',
+                  borderRadius: '6px',
+                  cursor: hasNextPage ? 'pointer' : 'default',
+                }}
+              >
+                Next
+              </button>
+            </div>
+          )}
         </main>
       </div>
     </div>
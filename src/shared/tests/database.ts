@@ -7,6 +7,10 @@ export function mockQuery(value: unknown) {
   vi.spyOn(supabase, 'from').mockReturnValue(value as never);
 }
 
+export function mockRpc(value: unknown) {
+  vi.spyOn(supabase, 'rpc').mockReturnValue(value as never);
+}
+
 export function mockChannel(value: unknown) {
   vi.spyOn(supabase, 'channel').mockReturnValue(value as never);
 }
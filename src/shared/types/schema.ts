@@ -75,6 +75,75 @@ export interface Database {
         };
         Relationships: [];
       };
+      Chat_Inbox: {
+        Row: {
+          chat_id: number;
+          last_message: string | null;
+          last_message_at: string | null;
+          last_message_id: number | null;
+          last_read_at: string;
+          other_user_id: string | null;
+          unread_count: number;
+          user_id: string;
+        };
+        Insert: {
+          chat_id: number;
+          last_message?: string | null;
+          last_message_at?: string | null;
+          last_message_id?: number | null;
+          last_read_at?: string;
+          other_user_id?: string | null;
+          unread_count?: number;
+          user_id: string;
+        };
+        Update: {
+          chat_id?: number;
+          last_message?: string | null;
+          last_message_at?: string | null;
+          last_message_id?: number | null;
+          last_read_at?: string;
+          other_user_id?: string | null;
+          unread_count?: number;
+          user_id?: string;
+        };
+        Relationships: [
+          {
+            foreignKeyName: 'Chat_Inbox_chat_id_fkey';
+            columns: ['chat_id'];
+            isOneToOne: false;
+            referencedRelation: 'Chats';
+            referencedColumns: ['id'];
+          },
+          {
+            foreignKeyName: 'Chat_Inbox_other_user_id_fkey';
+            columns: ['other_user_id'];
+            isOneToOne: false;
+            referencedRelation: 'get_shopping_cart_information_for_user';
+            referencedColumns: ['seller_id'];
+          },
+          {
+            foreignKeyName: 'Chat_Inbox_other_user_id_fkey';
+            columns: ['other_user_id'];
+            isOneToOne: false;
+            referencedRelation: 'User_Information';
+            referencedColumns: ['supabase_id'];
+          },
+          {
+            foreignKeyName: 'Chat_Inbox_user_id_fkey';
+            columns: ['user_id'];
+            isOneToOne: false;
+            referencedRelation: 'get_shopping_cart_information_for_user';
+            referencedColumns: ['seller_id'];
+          },
+          {
+            foreignKeyName: 'Chat_Inbox_user_id_fkey';
+            columns: ['user_id'];
+            isOneToOne: false;
+            referencedRelation: 'User_Information';
+            referencedColumns: ['supabase_id'];
+          },
+        ];
+      };
       Chats: {
         Row: {
           created_at: string;
@@ -502,6 +571,8 @@ export interface Database {
           last_name: string | null;
           profile_image: Json | null;
           rating: number | null;
+          rating_count: number;
+          rating_sum: number;
           supabase_id: string;
           user_name: string | null;
         };
@@ -517,6 +588,8 @@ export interface Database {
           last_name?: string | null;
           profile_image?: Json | null;
           rating?: number | null;
+          rating_count?: number;
+          rating_sum?: number;
           supabase_id?: string;
           user_name?: string | null;
         };
@@ -532,6 +605,8 @@ export interface Database {
           last_name?: string | null;
           profile_image?: Json | null;
           rating?: number | null;
+          rating_count?: number;
+          rating_sum?: number;
           supabase_id?: string;
           user_name?: string | null;
         };
@@ -634,10 +709,12 @@ export interface Database {
       };
       get_chats_for_user: {
         Row: {
+          chat_id: number | null;
           created_at: string | null;
           first_name: string | null;
           last_message: string | null;
           last_name: string | null;
+          unread_count: number | null;
         };
         Relationships: [];
       };
@@ -756,6 +833,23 @@ export interface Database {
         Args: { user1: string; user2: string };
         Returns: boolean;
       };
+      get_chat_messages_page: {
+        Args: {
+          chat: number;
+          before_created_at?: string;
+          before_id?: number;
+          page_size?: number;
+        };
+        Returns: Database['mru_dev']['Tables']['Messages']['Row'][];
+      };
+      get_products_page: {
+        Args: {
+          after_created_at?: string;
+          after_id?: number;
+          page_size?: number;
+        };
+        Returns: Database['mru_dev']['Tables']['Product_Information']['Row'][];
+      };
       is_chat_visible_to_user: {
         Args: { chat_row: Database['mru_dev']['Tables']['Chats']['Row'] };
         Returns: boolean;
@@ -764,10 +858,23 @@ export interface Database {
         Args: { user1: string; user2: string };
         Returns: boolean;
       };
+      mark_chat_read: {
+        Args: { chat: number };
+        Returns: undefined;
+      };
       mark_product_as_sold: {
         Args: { product_id_param: number };
         Returns: undefined;
       };
+      search_products: {
+        Args: {
+          search: string;
+          category_ids?: number[];
+          result_limit?: number;
+          result_offset?: number;
+        };
+        Returns: Database['mru_dev']['Tables']['Product_Information']['Row'][];
+      };
     };
     Enums: Record<never, never>;
     CompositeTypes: Record<never, never>;